@@ -1,73 +1,332 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from typing import Optional
+import asyncio
+import json
+import os
 import time
 
-from retrieval.retriever import load_retriever, retrieve
-from reranking.reranker import rerank
+from retrieval.retriever import (
+    STORE_RELOAD_CHECK_S, aencode_query, aretrieve, get_query_batcher, ingest_stamp, load_retriever
+)
+from retrieval.hybrid import ahybrid_retrieve
+from reranking.reranker import arerank, get_rerank_batcher, rerank_stats
 from generation.prompts import build_prompt, build_metrics_insight_prompt
-from generation.llm import generate, generate_insight
+from generation.llm import agenerate, agenerate_insight, agenerate_stream, aclose
 from evaluation.faithfulness import faithfulness
 from utils.context import build_context, format_sources
+from utils.executor import run_inference, shutdown as shutdown_executor
+from utils.model_registry import warmup
+from utils.semantic_cache import CACHE_ENABLED, SemanticCache
+from vectorstore.metadata_index import validate_filters
 
 app = FastAPI(title="Policy RAG API")
 
-# Load vector store ONCE at startup
-store = load_retriever("vectorstore_data")
+# Load vector store ONCE at startup; reloaded when an ingest rewrites it on disk
+STORE_PATH = "vectorstore_data"
+store = load_retriever(STORE_PATH)
+store_stamp = ingest_stamp(STORE_PATH)
+# Bumped on every reload: part of the semantic cache key, since a reloaded
+# store can report the same version as the one it replaces
+store_generation = 0
+semantic_cache = SemanticCache(dim=store.dim)
+
+_next_reload_check = 0.0
+_reload_lock = asyncio.Lock()
+
+# "hybrid" = BM25 + dense fused with RRF (opt-in: the store then also keeps a
+# BM25 index). With hybrid, fewer candidates (e.g. RAG_RERANK_CANDIDATES=10)
+# usually suffice for the cross-encoder
+RETRIEVAL_MODE = os.getenv("RAG_RETRIEVAL_MODE", "dense")
+RERANK_CANDIDATES = int(os.getenv("RAG_RERANK_CANDIDATES", "15"))
+
+@app.on_event("startup")
+async def warmup_models():
+    # Models are shared process-wide; load them before the first request
+    if os.getenv("RAG_WARMUP_MODELS", "1") == "1":
+        await run_inference(warmup)
+
+@app.on_event("shutdown")
+async def close_clients():
+    await aclose()
+    shutdown_executor()
 
 class QueryRequest(BaseModel):
     question: str
+    # Metadata filter expression, e.g. {"department": "hr", "page_number": {"$lte": 20}}
+    filters: Optional[dict] = None
 
 class QueryResponse(BaseModel):
     answer: str
     sources: str
     metrics: dict
     insight: str
+    # Set when the answer was reused from a similar earlier question (semantic cache)
+    cached: bool = False
+    cache_similarity: Optional[float] = None
+    cached_question: Optional[str] = None
 
-@app.post("/ask", response_model=QueryResponse)
-def ask_question(req: QueryRequest):
 
-    # 1️⃣ RETRIEVAL
+async def reload_store(force: bool = False) -> bool:
+    """
+    Ingestion runs in another process and only rewrites the files on disk:
+    swap in the newly ingested store and drop the semantic cache built against
+    the old one. The manifest is checked at most every STORE_RELOAD_CHECK_S.
+    """
+    global store, store_stamp, store_generation, _next_reload_check
+
+    now = time.monotonic()
+    if not force and now < _next_reload_check:
+        return False
+    _next_reload_check = now + STORE_RELOAD_CHECK_S
+    if not force and ingest_stamp(STORE_PATH) == store_stamp:
+        return False
+
+    async with _reload_lock:
+        stamp = ingest_stamp(STORE_PATH)
+        if not force and stamp == store_stamp:
+            return False
+        # In-flight requests keep using the store they started with
+        store = await run_inference(load_retriever, STORE_PATH)
+        store_stamp = stamp
+        store_generation += 1
+        semantic_cache.invalidate()
+    return True
+
+
+def store_key(current) -> tuple:
+    return (store_generation, current.version)
+
+
+async def retrieve_and_rerank(question: str, store, query_vector=None, filters: dict = None):
+    # Encodes and rerank pairs are micro-batched across concurrent requests
     t0 = time.time()
-    retrieved_chunks = retrieve(req.question, store, top_k=15)
+    if RETRIEVAL_MODE == "hybrid":
+        retrieved_chunks = await ahybrid_retrieve(
+            question, store, top_k=RERANK_CANDIDATES, query_vector=query_vector, filters=filters
+        )
+    else:
+        retrieved_chunks = await aretrieve(
+            question, store, top_k=RERANK_CANDIDATES, query_vector=query_vector, filters=filters
+        )
     retrieval_time = round((time.time() - t0) * 1000, 2)
 
-    # 2️⃣ RE-RANKING
     t1 = time.time()
-    reranked_chunks = rerank(req.question, retrieved_chunks, top_n=5)
+    reranked_chunks = await arerank(question, retrieved_chunks, top_n=5)
     rerank_time = round((time.time() - t1) * 1000, 2)
 
-    # 3️⃣ CONTEXT BUILDING
-    context = build_context(reranked_chunks)
+    return reranked_chunks, {
+        "retrieval_time_ms": retrieval_time,
+        "rerank_time_ms": rerank_time
+    }
 
-    # 4️⃣ PROMPT + GENERATION
-    t2 = time.time()
-    prompt = build_prompt(req.question, context)
-    answer = generate(prompt)
-    generation_time = round((time.time() - t2) * 1000, 2)
 
-    # 5️⃣ EVALUATION (FAITHFULNESS)
-    eval_metrics = faithfulness(answer, context)
+async def evaluate_and_explain(answer: str, context: str, chunks: list, metrics: dict, sources: str, store):
+    """
+    Faithfulness scoring (local model) and the insight LLM call run concurrently.
+    The insight is therefore based on latency metrics and sources only.
+    """
+    insight_prompt = build_metrics_insight_prompt(metrics, sources)
+    # Reuse the chunk embeddings stored in the index instead of re-encoding the context
+    chunk_vectors = store.get_vectors([c["id"] for c in chunks])
+    eval_metrics, insight = await asyncio.gather(
+        run_inference(faithfulness, answer, context, chunk_vectors),
+        agenerate_insight(insight_prompt)
+    )
 
-    # 6️⃣ METRICS OBJECT (⚠️ MUST COME BEFORE INSIGHT)
     metrics = {
-        "retrieval_time_ms": retrieval_time,
-        "rerank_time_ms": rerank_time,
-        "generation_time_ms": generation_time,
+        **metrics,
         "faithfulness_score": eval_metrics["faithfulness_score"],
-        "answerable": eval_metrics["answerable"]
+        "answerable": eval_metrics["answerable"],
+        "sentence_support": eval_metrics["sentence_scores"],
+        "cache_hit": False
     }
+    return metrics, insight
+
+
+def check_filters(filters: dict = None):
+    """
+    Client-supplied filter expressions are validated up front: a malformed one
+    is a 400, not a 500 raised from inside the metadata index.
+    """
+    if filters:
+        try:
+            validate_filters(filters)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid filters: {e}")
+
+
+async def cache_lookup(question: str, cache_key: tuple, filters: dict = None):
+    """
+    Returns (query_vector, cached response or None).
+    Filtered questions bypass the cache: answers depend on the filter too.
+    """
+    query_vector = await aencode_query(question)
+    if not CACHE_ENABLED or filters:
+        return query_vector, None
+    return query_vector, semantic_cache.lookup(query_vector, cache_key)
+
+
+def cache_store(question: str, query_vector, response: dict, cache_key: tuple, filters: dict = None):
+    # Keyed by the store the answer was computed against, even if a reload happened since
+    if CACHE_ENABLED and not filters:
+        semantic_cache.put(question, query_vector, response, cache_key)
+
+
+@app.post("/ask", response_model=QueryResponse)
+async def ask_question(req: QueryRequest):
+    check_filters(req.filters)
+    await reload_store()
+    current = store
+    cache_key = store_key(current)
+
+    # 0️⃣ SEMANTIC CACHE
+    query_vector, cached = await cache_lookup(req.question, cache_key, req.filters)
+    if cached is not None:
+        return cached
+
+    # 1️⃣ RETRIEVAL + 2️⃣ RE-RANKING
+    reranked_chunks, metrics = await retrieve_and_rerank(req.question, current, query_vector, req.filters)
+
+    # 3️⃣ CONTEXT BUILDING
+    context = build_context(reranked_chunks)
+
+    # 4️⃣ PROMPT + GENERATION
+    t2 = time.time()
+    prompt = build_prompt(req.question, context)
+    answer = await agenerate(prompt)
+    metrics["generation_time_ms"] = round((time.time() - t2) * 1000, 2)
 
-    # 7️⃣ SOURCES
+    # 5️⃣ SOURCES
     sources = format_sources(reranked_chunks)
 
-    # 8️⃣ SYSTEM INSIGHT (LLM ANALYSIS OF METRICS)
-    insight_prompt = build_metrics_insight_prompt(metrics, sources)
-    system_insight = generate_insight(insight_prompt)
+    # 6️⃣ EVALUATION (FAITHFULNESS) ∥ SYSTEM INSIGHT
+    metrics, system_insight = await evaluate_and_explain(answer, context, reranked_chunks, metrics, sources, current)
 
-    # 9️⃣ FINAL RESPONSE
-    return {
+    # 7️⃣ FINAL RESPONSE
+    response = {
         "answer": answer,
         "sources": sources,
         "metrics": metrics,
         "insight": system_insight
     }
+    cache_store(req.question, query_vector, response, cache_key, req.filters)
+    return response
+
+
+@app.get("/metrics/batching")
+def batching_metrics():
+    return {
+        "query_encode": get_query_batcher().stats(),
+        "rerank": get_rerank_batcher().stats()
+    }
+
+
+@app.get("/metrics/rerank")
+def rerank_metrics():
+    return rerank_stats()
+
+
+@app.get("/metrics/cache")
+def cache_metrics():
+    return semantic_cache.stats()
+
+
+@app.post("/admin/reload")
+async def reload():
+    """Reloads the store right away (e.g. called at the end of an ingest)."""
+    await reload_store(force=True)
+    return {"generation": store_generation, "vectors": len(store), "index_type": store.index_type}
+
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/ask/stream")
+async def ask_question_stream(req: QueryRequest):
+    """
+    Server-sent events version of /ask:
+    sources -> token* -> metrics -> insight -> done
+
+    The response status is sent before generation starts, so a later failure
+    is reported in-band: ... -> error -> done (the stream always ends with done).
+    """
+    check_filters(req.filters)
+    await reload_store()
+    current = store
+    cache_key = store_key(current)
+
+    async def answer_events(progress: dict):
+        # 0️⃣ SEMANTIC CACHE (replayed as the same event sequence)
+        progress["stage"] = "Cache lookup"
+        query_vector, cached = await cache_lookup(req.question, cache_key, req.filters)
+        if cached is not None:
+            yield sse_event("sources", {"sources": cached["sources"]})
+            yield sse_event("token", {"text": cached["answer"]})
+            yield sse_event("metrics", cached["metrics"])
+            yield sse_event("insight", {"insight": cached["insight"]})
+            yield sse_event("done", {
+                "answer": cached["answer"],
+                "cached": True,
+                "cache_similarity": cached["cache_similarity"],
+                "cached_question": cached["cached_question"]
+            })
+            return
+
+        # 1️⃣ RETRIEVAL + 2️⃣ RE-RANKING
+        progress["stage"] = "Retrieval"
+        reranked_chunks, metrics = await retrieve_and_rerank(req.question, current, query_vector, req.filters)
+
+        # 3️⃣ SOURCES (sent before generation starts)
+        sources = format_sources(reranked_chunks)
+        yield sse_event("sources", {"sources": sources})
+
+        # 4️⃣ STREAMED GENERATION
+        progress["stage"] = "Generation"
+        context = build_context(reranked_chunks)
+        prompt = build_prompt(req.question, context)
+
+        t2 = time.time()
+        first_token_time = None
+        tokens = progress["tokens"]
+        async for token in agenerate_stream(prompt):
+            if first_token_time is None:
+                first_token_time = round((time.time() - t2) * 1000, 2)
+            tokens.append(token)
+            yield sse_event("token", {"text": token})
+        metrics["generation_time_ms"] = round((time.time() - t2) * 1000, 2)
+        metrics["first_token_time_ms"] = first_token_time
+        answer = "".join(tokens)
+
+        # 5️⃣ EVALUATION ∥ SYSTEM INSIGHT (trailing events)
+        progress["stage"] = "Evaluation"
+        metrics, insight = await evaluate_and_explain(answer, context, reranked_chunks, metrics, sources, current)
+        yield sse_event("metrics", metrics)
+        yield sse_event("insight", {"insight": insight})
+
+        cache_store(req.question, query_vector, {
+            "answer": answer,
+            "sources": sources,
+            "metrics": metrics,
+            "insight": insight
+        }, cache_key, req.filters)
+        yield sse_event("done", {"answer": answer, "cached": False})
+
+    async def events():
+        progress = {"stage": "Cache lookup", "tokens": []}
+        try:
+            async for event in answer_events(progress):
+                yield event
+        except Exception as e:
+            # Any failure after the headers went out; partial answers are never cached
+            yield sse_event("error", {"message": f"{progress['stage']} failed: {e}"})
+            yield sse_event("done", {"answer": "".join(progress["tokens"])})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Disable proxy buffering so tokens reach the client as they arrive
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
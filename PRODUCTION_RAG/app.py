@@ -1,5 +1,6 @@
 import streamlit as st
 from app_core import answer_question
+from evaluation.faithfulness import HIGH_CONFIDENCE, MEDIUM_CONFIDENCE
 
 # ======================================================
 # PAGE CONFIG
@@ -81,9 +82,10 @@ if query:
     # ------------------------------------------------------
     st.markdown("### 🔒 Trust & Confidence Assessment")
 
-    if metrics["faithfulness_score"] >= 0.6:
+    # Bands over the share of answer sentences supported by a retrieved chunk
+    if metrics["faithfulness_score"] >= HIGH_CONFIDENCE:
         st.success("🟢 **High Confidence** — The answer is strongly supported by retrieved policy content.")
-    elif metrics["faithfulness_score"] >= 0.35:
+    elif metrics["faithfulness_score"] >= MEDIUM_CONFIDENCE:
         st.warning("🟡 **Medium Confidence** — The answer is mostly grounded, but review sources if critical.")
     else:
         st.error("🔴 **Low Confidence** — The answer may not be fully supported. Manual verification recommended.")
@@ -94,6 +96,11 @@ if query:
     # ANSWER
     # ======================================================
     st.markdown("## 🧠 Answer")
+    if data.get("cached"):
+        st.info(
+            f"♻️ Reused answer to a similar earlier question "
+            f"(similarity {data['cache_similarity']}): “{data['cached_question']}”"
+        )
     st.markdown(answer)
 
     # ======================================================
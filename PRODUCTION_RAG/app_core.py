@@ -1,22 +1,63 @@
 import os
 import time
 
-from retrieval.retriever import load_retriever, retrieve
+from retrieval.retriever import STORE_RELOAD_CHECK_S, ingest_stamp, load_retriever, retrieve
+from retrieval.hybrid import hybrid_retrieve
 from reranking.reranker import rerank
 from generation.prompts import build_prompt, build_metrics_insight_prompt
 from generation.llm import generate, generate_insight
 from evaluation.faithfulness import faithfulness
 from utils.context import build_context, format_sources
+from embeddings.embedder import encode_texts
+from utils.semantic_cache import CACHE_ENABLED, SemanticCache
 
-# Load vector store ONCE
+# Load vector store ONCE; reloaded when an ingest rewrites it on disk
 base_path = os.path.dirname(__file__)
 store_path = os.path.join(base_path, "vectorstore_data")
 store = load_retriever(store_path)
+store_stamp = ingest_stamp(store_path)
+store_generation = 0
+semantic_cache = SemanticCache(dim=store.dim)
+_next_reload_check = 0.0
+
+RETRIEVAL_MODE = os.getenv("RAG_RETRIEVAL_MODE", "dense")
+RERANK_CANDIDATES = int(os.getenv("RAG_RERANK_CANDIDATES", "15"))
+
+def reload_store():
+    """
+    Swaps in the store after an ingest (run in another process) and drops the
+    semantic cache built against the old one.
+    """
+    global store, store_stamp, store_generation, _next_reload_check
+    now = time.monotonic()
+    if now < _next_reload_check:
+        return
+    _next_reload_check = now + STORE_RELOAD_CHECK_S
+
+    stamp = ingest_stamp(store_path)
+    if stamp != store_stamp:
+        store = load_retriever(store_path)
+        store_stamp = stamp
+        store_generation += 1
+        semantic_cache.invalidate()
+
+def answer_question(question: str, filters: dict = None):
+    reload_store()
+    cache_key = (store_generation, store.version)
+
+    # 0️⃣ SEMANTIC CACHE (paraphrases of a recent question; filtered questions bypass it)
+    query_vector = encode_texts([question])[0]
+    if CACHE_ENABLED and not filters:
+        cached = semantic_cache.lookup(query_vector, cache_key)
+        if cached is not None:
+            return cached
 
-def answer_question(question: str):
     # 1️⃣ RETRIEVAL
     t0 = time.time()
-    retrieved_chunks = retrieve(question, store, top_k=15)
+    if RETRIEVAL_MODE == "hybrid":
+        retrieved_chunks = hybrid_retrieve(question, store, top_k=RERANK_CANDIDATES, filters=filters)
+    else:
+        retrieved_chunks = retrieve(question, store, top_k=RERANK_CANDIDATES, filters=filters)
     retrieval_time = round((time.time() - t0) * 1000, 2)
 
     # 2️⃣ RE-RANKING
@@ -34,14 +75,17 @@ def answer_question(question: str):
     generation_time = round((time.time() - t2) * 1000, 2)
 
     # 5️⃣ EVALUATION
-    eval_metrics = faithfulness(answer, context)
+    chunk_vectors = store.get_vectors([c["id"] for c in reranked_chunks])
+    eval_metrics = faithfulness(answer, context, chunk_vectors)
 
     metrics = {
         "retrieval_time_ms": retrieval_time,
         "rerank_time_ms": rerank_time,
         "generation_time_ms": generation_time,
         "faithfulness_score": eval_metrics["faithfulness_score"],
-        "answerable": eval_metrics["answerable"]
+        "answerable": eval_metrics["answerable"],
+        "sentence_support": eval_metrics["sentence_scores"],
+        "cache_hit": False
     }
 
     # 6️⃣ SOURCES
@@ -51,9 +95,14 @@ def answer_question(question: str):
     insight_prompt = build_metrics_insight_prompt(metrics, sources)
     insight = generate_insight(insight_prompt)
 
-    return {
+    response = {
         "answer": answer,
         "sources": sources,
         "metrics": metrics,
         "insight": insight
     }
+
+    if CACHE_ENABLED and not filters:
+        semantic_cache.put(question, query_vector, response, cache_key)
+
+    return response
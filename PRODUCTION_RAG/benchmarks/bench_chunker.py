@@ -0,0 +1,112 @@
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.stats import run_info, write_report
+from chunking.chunker import MAX_TOKENS, MIN_TOKENS, chunk_documents, token_len
+
+WORDS = (
+    "employee leave policy manager approval days annual notice period salary "
+    "benefits clause section applicable company shall may must within working "
+    "travel reimbursement expense claim submitted hr department review"
+).split()
+
+
+def synthetic_corpus(n_paragraphs: int, seed: int = 0):
+    """
+    Paragraphs of 20-400 words, with ~2% oversized ones (1000+ words) like
+    the long clauses unstructured emits for dense policy pages.
+    """
+    rng = np.random.default_rng(seed)
+    docs = []
+    for i in range(n_paragraphs):
+        n_words = int(rng.integers(1000, 1600)) if rng.random() < 0.02 else int(rng.integers(20, 400))
+        words = rng.choice(WORDS, size=n_words)
+        sentences = [" ".join(words[j:j + 15]).capitalize() + "." for j in range(0, n_words, 15)]
+        docs.append({
+            "text": " ".join(sentences),
+            "metadata": {"page_number": i // 10 + 1, "category": "NarrativeText", "source": "synthetic.pdf"}
+        })
+    return docs
+
+
+def legacy_chunk_documents(docs):
+    """
+    The previous chunker: re-tokenizes the whole growing buffer per paragraph.
+    """
+    chunks = []
+    buffer_text = ""
+    buffer_meta = None
+
+    for doc in docs:
+        text = doc["text"]
+        meta = doc["metadata"]
+
+        if not buffer_text:
+            buffer_text = text
+            buffer_meta = meta
+            continue
+
+        combined = buffer_text + " " + text
+        if token_len(combined) <= MAX_TOKENS:
+            buffer_text = combined
+            continue
+
+        if token_len(buffer_text) >= MIN_TOKENS:
+            chunks.append({"text": buffer_text, "metadata": buffer_meta})
+
+        buffer_text = text
+        buffer_meta = meta
+
+    if buffer_text and token_len(buffer_text) >= MIN_TOKENS:
+        chunks.append({"text": buffer_text, "metadata": buffer_meta})
+
+    return chunks
+
+
+def timed(fn, docs):
+    t0 = time.perf_counter()
+    chunks = fn(docs)
+    elapsed = time.perf_counter() - t0
+    sizes = [token_len(c["text"]) for c in chunks]
+    return {
+        "seconds": round(elapsed, 3),
+        "paragraphs_per_s": round(len(docs) / elapsed, 1),
+        "chunks": len(chunks),
+        "max_chunk_tokens": max(sizes) if sizes else 0,
+        "oversized_chunks": sum(1 for s in sizes if s > MAX_TOKENS),
+    }
+
+
+def run_benchmark(n_paragraphs: int = 20000, overlap_tokens: int = 0):
+    docs = synthetic_corpus(n_paragraphs)
+    return {
+        "run": run_info(),
+        "paragraphs": n_paragraphs,
+        "overlap_tokens": overlap_tokens,
+        "legacy": timed(legacy_chunk_documents, docs),
+        "linear": timed(lambda d: chunk_documents(d, overlap_tokens=overlap_tokens), docs),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chunker throughput: legacy buffer re-tokenization vs linear-time chunking.")
+    parser.add_argument("--paragraphs", type=int, default=20000)
+    parser.add_argument("--overlap", type=int, default=0, help="Overlap tokens for the linear chunker")
+    parser.add_argument("--output", help="Optional path to write the report as JSON")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.paragraphs, args.overlap)
+
+    print(f"{report['paragraphs']} paragraphs, overlap={report['overlap_tokens']}\n")
+    print(f"{'chunker':<8} {'seconds':>8} {'para/s':>10} {'chunks':>7} {'max tok':>8} {'oversized':>10}")
+    for name in ("legacy", "linear"):
+        r = report[name]
+        print(
+            f"{name:<8} {r['seconds']:>8.3f} {r['paragraphs_per_s']:>10.1f} {r['chunks']:>7} "
+            f"{r['max_chunk_tokens']:>8} {r['oversized_chunks']:>10}"
+        )
+
+    if args.output:
+        write_report(report, args.output)
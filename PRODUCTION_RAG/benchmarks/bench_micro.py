@@ -0,0 +1,177 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+from benchmarks.bench_chunker import synthetic_corpus
+from benchmarks.stats import peak_rss_mb, run_info, summarize, time_calls, write_report
+
+# Benchmarks must not read from or write into the persistent embedding cache
+# (.cache/embeddings.sqlite); only the in-memory tier is used. Must be set
+# before the embedder creates the process-wide cache
+os.environ.setdefault("RAG_EMBEDDING_CACHE", "off")
+
+SUITES = ("chunk", "embed", "search", "rerank", "faithfulness")
+
+QUESTIONS = [
+    "How many days of annual leave do employees get?",
+    "Who approves travel reimbursement claims?",
+    "What is the notice period for resignation?",
+    "Can unused leave be carried over to the next year?",
+]
+
+ANSWER = (
+    "Employees are entitled to annual leave as defined in the leave policy. "
+    "Leave requests must be approved by the reporting manager. "
+    "Unused leave may be carried over subject to HR review."
+)
+
+
+def random_vectors(n: int, dim: int = 384, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(n, dim)).astype("float32")
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def bench_chunk(repeat: int, n_paragraphs: int = 2000):
+    from chunking.chunker import chunk_documents
+
+    docs = synthetic_corpus(n_paragraphs)
+    latencies = time_calls(lambda i: chunk_documents(docs), repeat)
+    return {
+        "paragraphs": n_paragraphs,
+        "latency": summarize(latencies),
+        "paragraphs_per_s": round(n_paragraphs / (np.median(latencies) / 1000), 1),
+    }
+
+
+def bench_embed(repeat: int, batch: int = 64):
+    from embeddings.embedder import embed_chunks
+
+    docs = synthetic_corpus(batch, seed=1)
+
+    def run(i):
+        # Unique texts per call: measure the model, not the embedding cache
+        embed_chunks([{"text": f"{d['text']} [{i}]", "metadata": d["metadata"]} for d in docs])
+
+    latencies = time_calls(run, repeat)
+    return {
+        "batch": batch,
+        "latency": summarize(latencies),
+        "chunks_per_s": round(batch / (np.median(latencies) / 1000), 1),
+    }
+
+
+def bench_search(repeat: int, sizes=(1_000, 10_000, 100_000), top_k: int = 10, batch: int = 64):
+    from vectorstore.faiss_store import FaissVectorStore
+    from vectorstore.index_factory import choose_index_type
+
+    results = []
+    queries = random_vectors(max(repeat, batch), seed=42)
+
+    for n in sizes:
+        vectors = random_vectors(n)
+        chunks = [{"text": f"chunk {i}", "metadata": {"page_number": i % 100}} for i in range(n)]
+
+        index_type = choose_index_type(n)
+        t0 = time.perf_counter()
+        store = FaissVectorStore(dim=vectors.shape[1])
+        store.add_vectors(chunks, vectors)
+        if index_type != "flat":
+            store.reindex(index_type)
+        build_s = time.perf_counter() - t0
+
+        single = time_calls(lambda i: store.search(queries[i % len(queries)], top_k=top_k), repeat)
+        batched = time_calls(lambda i: store.search_batch(queries[:batch], top_k=top_k), max(repeat // 10, 3))
+
+        results.append({
+            "n_vectors": n,
+            "index_type": index_type,
+            "build_s": round(build_s, 2),
+            "latency": summarize(single),
+            "qps_single": round(1000 / np.median(single), 1),
+            "qps_batched": round(batch * 1000 / np.median(batched), 1),
+        })
+    return results
+
+
+def bench_rerank(repeat: int, candidates: int = 10):
+    from reranking.reranker import RERANK_MODE, rerank
+
+    docs = synthetic_corpus(candidates, seed=2)
+    dense = np.linspace(0.8, 0.5, candidates)
+
+    def run(i):
+        # Fresh query per call so the score cache never answers
+        chunks = [
+            {"id": j, "text": d["text"], "metadata": d["metadata"], "score": float(s)}
+            for j, (d, s) in enumerate(zip(docs, dense))
+        ]
+        rerank(f"{QUESTIONS[i % len(QUESTIONS)]} ({i})", chunks, top_n=5)
+
+    latencies = time_calls(run, repeat)
+    return {
+        "mode": RERANK_MODE,
+        "candidates": candidates,
+        "latency": summarize(latencies),
+    }
+
+
+def bench_faithfulness(repeat: int, n_chunks: int = 5):
+    from embeddings.embedder import encode_texts
+    from evaluation.faithfulness import faithfulness
+
+    docs = synthetic_corpus(n_chunks, seed=3)
+    context = "\n\n".join(f"- {d['text']}" for d in docs)
+    chunk_vectors = encode_texts([d["text"] for d in docs])
+
+    def run(i):
+        faithfulness(f"{ANSWER} Reference {i}.", context, chunk_vectors)
+
+    latencies = time_calls(run, repeat)
+    return {
+        "chunks": n_chunks,
+        "latency": summarize(latencies),
+    }
+
+
+def run_benchmarks(suites=SUITES, repeat: int = 50, sizes=(1_000, 10_000, 100_000)):
+    report = {"run": run_info(), "repeat": repeat, "results": {}}
+
+    for suite in suites:
+        print(f"Running {suite}...")
+        if suite == "search":
+            report["results"][suite] = bench_search(repeat, sizes=sizes)
+        else:
+            report["results"][suite] = globals()[f"bench_{suite}"](repeat)
+
+    report["peak_rss_mb"] = peak_rss_mb()
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the RAG pipeline stages.")
+    parser.add_argument("--suites", default=",".join(SUITES), help=f"Comma-separated subset of {SUITES}")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Corpus sizes for the search benchmark")
+    parser.add_argument("--output", help="Optional path to write the report as JSON")
+    args = parser.parse_args()
+
+    report = run_benchmarks(
+        suites=[s for s in args.suites.split(",") if s],
+        repeat=args.repeat,
+        sizes=[int(n) for n in args.sizes.split(",")]
+    )
+
+    print()
+    for suite, result in report["results"].items():
+        for row in result if isinstance(result, list) else [result]:
+            latency = row["latency"]
+            label = f"{suite} (n={row['n_vectors']}, {row['index_type']})" if suite == "search" else suite
+            print(f"{label:<32} p50 {latency['p50_ms']:>9.3f} ms  p95 {latency['p95_ms']:>9.3f} ms  p99 {latency['p99_ms']:>9.3f} ms")
+    print(f"\npeak RSS: {report['peak_rss_mb']} MB")
+
+    if args.output:
+        write_report(report, args.output)
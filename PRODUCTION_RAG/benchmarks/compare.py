@@ -0,0 +1,64 @@
+import argparse
+import json
+import sys
+from typing import Dict, Iterator, Tuple
+
+# Leaf keys where higher means worse / better
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "mean_ms", "seconds", "peak_rss_mb", "rss_mb")
+HIGHER_IS_BETTER = ("throughput_rps", "qps_single", "qps_batched", "paragraphs_per_s", "chunks_per_s")
+
+
+def flatten(report, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    """
+    Yields (dotted.path, value) for every numeric leaf. List rows are keyed by
+    n_vectors when present (search results), else by position.
+    """
+    if isinstance(report, dict):
+        for key, value in report.items():
+            if key == "run":
+                continue
+            yield from flatten(value, f"{prefix}{key}.")
+    elif isinstance(report, list):
+        for i, row in enumerate(report):
+            label = row.get("n_vectors", i) if isinstance(row, dict) else i
+            yield from flatten(row, f"{prefix}{label}.")
+    elif isinstance(report, (int, float)) and not isinstance(report, bool):
+        yield prefix[:-1], float(report)
+
+
+def compare(baseline: Dict, candidate: Dict, threshold: float = 0.10):
+    """
+    Relative change of every tracked metric; a regression is a change of more
+    than `threshold` in the bad direction.
+    """
+    base = dict(flatten(baseline))
+    rows = []
+    for path, value in flatten(candidate):
+        metric = path.rsplit(".", 1)[-1]
+        if metric not in LOWER_IS_BETTER + HIGHER_IS_BETTER or not base.get(path):
+            continue
+        change = (value - base[path]) / base[path]
+        worse = change > threshold if metric in LOWER_IS_BETTER else change < -threshold
+        rows.append({"metric": path, "baseline": base[path], "candidate": value, "change": round(change, 4), "regression": worse})
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare two benchmark JSON reports and flag regressions.")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change counted as a regression")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    rows = compare(baseline, candidate, args.threshold)
+    print(f"baseline {baseline.get('run', {}).get('git_commit')} -> candidate {candidate.get('run', {}).get('git_commit')}\n")
+    for r in rows:
+        flag = "REGRESSION" if r["regression"] else ""
+        print(f"{r['metric']:<60} {r['baseline']:>12.3f} {r['candidate']:>12.3f} {r['change']:>+8.1%} {flag}")
+
+    sys.exit(1 if any(r["regression"] for r in rows) else 0)
@@ -0,0 +1,201 @@
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+import httpx
+
+from benchmarks.stats import process_memory_mb, run_info, summarize, write_report
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QUESTIONS = [
+    "How many days of annual leave do employees get?",
+    "Who approves travel reimbursement claims?",
+    "What is the notice period for resignation?",
+    "Can unused leave be carried over to the next year?",
+    "What expenses are reimbursable during business travel?",
+    "How is overtime compensated?",
+    "What is the policy on working from home?",
+    "How do I report a workplace grievance?",
+]
+
+# Server-side timings reported in the response metrics
+STAGE_METRICS = ("retrieval_time_ms", "rerank_time_ms", "generation_time_ms", "first_token_time_ms")
+
+
+async def ask(client: httpx.AsyncClient, endpoint: str, question: str):
+    """
+    One request. Returns (latency_ms, time_to_first_token_ms or None, response metrics).
+    """
+    t0 = time.perf_counter()
+
+    if endpoint == "/ask":
+        response = await client.post(endpoint, json={"question": question})
+        response.raise_for_status()
+        return (time.perf_counter() - t0) * 1000, None, response.json()["metrics"]
+
+    ttft = None
+    metrics = {}
+    event = None
+    async with client.stream("POST", endpoint, json={"question": question}) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                if event == "token" and ttft is None:
+                    ttft = (time.perf_counter() - t0) * 1000
+                elif event == "metrics":
+                    metrics = json.loads(line[len("data: "):])
+    return (time.perf_counter() - t0) * 1000, ttft, metrics
+
+
+async def run_load(url: str, endpoint: str = "/ask", n_requests: int = 200, concurrency: int = 8, unique: bool = True):
+    """
+    Closed-loop load: `concurrency` workers issue `n_requests` requests back to back.
+    """
+    latencies, ttfts, errors = [], [], 0
+    stages = {name: [] for name in STAGE_METRICS}
+    cache_hits = 0
+    next_request = 0
+
+    async def worker(client):
+        nonlocal next_request, errors, cache_hits
+        while next_request < n_requests:
+            i = next_request
+            next_request += 1
+            question = QUESTIONS[i % len(QUESTIONS)]
+            if unique:
+                question = f"{question} (request {i})"
+            try:
+                latency, ttft, metrics = await ask(client, endpoint, question)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+
+            latencies.append(latency)
+            if ttft is not None:
+                ttfts.append(ttft)
+            cache_hits += bool(metrics.get("cache_hit"))
+            for name in STAGE_METRICS:
+                if metrics.get(name) is not None:
+                    stages[name].append(metrics[name])
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=120.0, limits=limits) as client:
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - t0
+
+        server_metrics = {}
+        for name in ("batching", "rerank", "cache"):
+            try:
+                server_metrics[name] = (await client.get(f"/metrics/{name}")).json()
+            except httpx.HTTPError:
+                pass
+
+    return {
+        "endpoint": endpoint,
+        "requests": n_requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "cache_hits": cache_hits,
+        "seconds": round(elapsed, 2),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency": summarize(latencies),
+        "time_to_first_token": summarize(ttfts) if ttfts else None,
+        "server_stages": {name: summarize(values) for name, values in stages.items() if values},
+        "server_metrics": server_metrics,
+    }
+
+
+def wait_until_ready(url: str, timeout_s: float = 300.0):
+    deadline = time.time() + timeout_s
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{url}/metrics/cache", timeout=2.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(1.0)
+    raise TimeoutError(f"{url} did not become ready within {timeout_s}s")
+
+
+@contextmanager
+def spawned_stack(api_port: int, llm_port: int, semantic_cache: bool):
+    """
+    Starts the stub LLM and the API (pointed at it via GROQ_BASE_URL) as subprocesses.
+    Yields the API process.
+    """
+    env = {
+        **os.environ,
+        "GROQ_BASE_URL": f"http://127.0.0.1:{llm_port}",
+        "GROQ_API_KEY": os.getenv("GROQ_API_KEY", "stub"),
+        "RAG_SEMANTIC_CACHE": "1" if semantic_cache else "0",
+    }
+    llm = subprocess.Popen([sys.executable, "-m", "benchmarks.stub_llm", "--port", str(llm_port)], cwd=ROOT, env=env)
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(api_port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env
+    )
+    try:
+        yield api
+    finally:
+        for process in (api, llm):
+            process.terminate()
+            process.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test for the /ask endpoints.")
+    parser.add_argument("--url", default=None, help="Target API (default: spawn the API + stub LLM locally)")
+    parser.add_argument("--endpoint", choices=["/ask", "/ask/stream"], default="/ask")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--repeat-questions", action="store_true", help="Reuse questions verbatim (exercises caches)")
+    parser.add_argument("--semantic-cache", action="store_true", help="Keep the semantic cache on in the spawned API")
+    parser.add_argument("--api-port", type=int, default=8000)
+    parser.add_argument("--llm-port", type=int, default=9100)
+    parser.add_argument("--output", help="Optional path to write the report as JSON")
+    args = parser.parse_args()
+
+    def load(url):
+        return asyncio.run(run_load(
+            url,
+            endpoint=args.endpoint,
+            n_requests=args.requests,
+            concurrency=args.concurrency,
+            unique=not args.repeat_questions
+        ))
+
+    if args.url:
+        result = load(args.url)
+    else:
+        url = f"http://127.0.0.1:{args.api_port}"
+        with spawned_stack(args.api_port, args.llm_port, args.semantic_cache) as api:
+            wait_until_ready(url)
+            result = load(url)
+            result["server_memory"] = process_memory_mb(api.pid)
+
+    report = {"run": run_info(), **result}
+
+    latency = report["latency"]
+    print(f"{report['endpoint']}: {report['requests']} requests, concurrency {report['concurrency']}, errors {report['errors']}")
+    print(f"throughput: {report['throughput_rps']} req/s")
+    print(f"latency: p50 {latency.get('p50_ms')} ms  p95 {latency.get('p95_ms')} ms  p99 {latency.get('p99_ms')} ms")
+    if report["time_to_first_token"]:
+        ttft = report["time_to_first_token"]
+        print(f"time to first token: p50 {ttft['p50_ms']} ms  p95 {ttft['p95_ms']} ms  p99 {ttft['p99_ms']} ms")
+    for name, stage in report["server_stages"].items():
+        print(f"  {name:<22} p50 {stage['p50_ms']} ms  p95 {stage['p95_ms']} ms")
+    if report.get("server_memory"):
+        print(f"server memory: {report['server_memory']}")
+
+    if args.output:
+        write_report(report, args.output)
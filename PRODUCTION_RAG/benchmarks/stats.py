@@ -0,0 +1,94 @@
+import json
+import os
+import platform
+import resource
+import subprocess
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+
+def summarize(latencies_ms: List[float]) -> Dict[str, float]:
+    """
+    Latency percentiles (ms) of a list of samples.
+    """
+    if not latencies_ms:
+        return {"count": 0}
+    a = np.asarray(latencies_ms, dtype="float64")
+    return {
+        "count": int(a.size),
+        "mean_ms": round(float(a.mean()), 3),
+        "p50_ms": round(float(np.percentile(a, 50)), 3),
+        "p95_ms": round(float(np.percentile(a, 95)), 3),
+        "p99_ms": round(float(np.percentile(a, 99)), 3),
+        "max_ms": round(float(a.max()), 3),
+    }
+
+
+def time_calls(fn: Callable[[int], object], repeat: int, warmup: int = 2) -> List[float]:
+    """
+    Calls fn(i) `warmup` + `repeat` times and returns the timed latencies (ms).
+    `i` lets callers vary inputs so caches do not hide the real cost.
+    """
+    for i in range(warmup):
+        fn(-1 - i)
+
+    latencies = []
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        fn(i)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    return latencies
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if platform.system() == "Darwin" else 1024), 1)
+
+
+def process_memory_mb(pid: int) -> Dict[str, float]:
+    """
+    Current and peak RSS of another process (Linux /proc only).
+    """
+    memory = {}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ("VmRSS", "VmHWM"):
+                    memory["rss_mb" if key == "VmRSS" else "peak_rss_mb"] = round(int(value.split()[0]) / 1024, 1)
+    except OSError:
+        pass
+    return memory
+
+
+def run_info() -> Dict[str, str]:
+    """
+    Identifies the code and machine a report was produced on, for comparisons across versions.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "git_commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "inference_backend": os.getenv("RAG_INFERENCE_BACKEND", "torch"),
+    }
+
+
+def write_report(report: Dict, path: str):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
@@ -0,0 +1,95 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+# Simulated Groq behaviour: time to first token, then a fixed delay per token
+FIRST_TOKEN_MS = float(os.getenv("STUB_LLM_FIRST_TOKEN_MS", "150"))
+TOKEN_MS = float(os.getenv("STUB_LLM_TOKEN_MS", "5"))
+
+ANSWER = (
+    "According to the policy, employees are entitled to annual leave as described in the leave section. "
+    "Requests must be submitted in advance and approved by the reporting manager. "
+    "Unused leave may be carried forward subject to the limits defined by HR."
+)
+
+app = FastAPI(title="Stub LLM (Groq-compatible)")
+
+
+def tokens():
+    words = ANSWER.split(" ")
+    return [w if i == 0 else " " + w for i, w in enumerate(words)]
+
+
+def completion_id() -> str:
+    return f"chatcmpl-{uuid.uuid4().hex}"
+
+
+@app.post("/openai/v1/chat/completions")
+async def chat_completions(request: Request):
+    """
+    Minimal OpenAI/Groq chat completions endpoint: fixed answer, simulated latency.
+    Point the API at it with GROQ_BASE_URL=http://host:port.
+    """
+    body = await request.json()
+    model = body.get("model", "stub")
+    created = int(time.time())
+    parts = tokens()
+
+    if not body.get("stream"):
+        await asyncio.sleep((FIRST_TOKEN_MS + TOKEN_MS * len(parts)) / 1000)
+        return {
+            "id": completion_id(),
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "".join(parts)},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": len(parts), "total_tokens": len(parts)}
+        }
+
+    async def stream():
+        cid = completion_id()
+        await asyncio.sleep(FIRST_TOKEN_MS / 1000)
+        for i, part in enumerate(parts):
+            if i:
+                await asyncio.sleep(TOKEN_MS / 1000)
+            chunk = {
+                "id": cid,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": part}, "finish_reason": None}]
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+
+        done = {
+            "id": cid,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]
+        }
+        yield f"data: {json.dumps(done)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Groq-compatible stub LLM for load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    args = parser.parse_args()
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
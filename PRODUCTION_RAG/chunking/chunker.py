@@ -1,4 +1,6 @@
-from typing import List, Dict
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Tuple
 import tiktoken
 
 # Tokenizer only for size estimation (model-agnostic)
@@ -7,52 +9,143 @@ tokenizer = tiktoken.get_encoding("cl100k_base")
 MAX_TOKENS = 500
 MIN_TOKENS = 150
 
+# Tokens of trailing context repeated at the start of the next chunk (0 = no overlap)
+OVERLAP_TOKENS = int(os.getenv("RAG_CHUNK_OVERLAP", "0"))
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
 
 def token_len(text: str) -> int:
     return len(tokenizer.encode(text))
 
 
-def chunk_documents(docs: List[Dict]) -> List[Dict]:
+def split_units(text: str, max_tokens: int = MAX_TOKENS) -> List[Tuple[str, int]]:
     """
-    Converts ingestion paragraphs into retrieval-ready chunks.
+    Tokenizes a paragraph once and returns it as (text, n_tokens) units no
+    larger than max_tokens: the paragraph itself, or its sentences when it is
+    oversized, or fixed token windows for a single oversized sentence.
     """
-    chunks = []
+    tokens = tokenizer.encode_ordinary(text)
+    if len(tokens) <= max_tokens:
+        return [(text, len(tokens))]
 
-    buffer_text = ""
-    buffer_meta = None
+    units = []
+    for sentence in SENTENCE_SPLIT.split(text):
+        tokens = tokenizer.encode_ordinary(sentence)
+        if len(tokens) <= max_tokens:
+            units.append((sentence, len(tokens)))
+            continue
+        for start in range(0, len(tokens), max_tokens):
+            window = tokens[start:start + max_tokens]
+            units.append((tokenizer.decode(window), len(window)))
+    return units
 
-    for doc in docs:
-        text = doc["text"]
-        meta = doc["metadata"]
 
-        if not buffer_text:
-            buffer_text = text
-            buffer_meta = meta
+def _unit_tail(text: str, budget: int) -> List[Tuple[str, int]]:
+    """
+    Trailing part of a unit within `budget` tokens, last piece first: whole
+    sentences while they fit, then a token window of the next one.
+    """
+    pieces = []
+    for sentence in reversed(SENTENCE_SPLIT.split(text)):
+        tokens = tokenizer.encode_ordinary(sentence)
+        if len(tokens) <= budget:
+            pieces.append((sentence, len(tokens)))
+            budget -= len(tokens)
             continue
+        if budget > 0:
+            window = tokens[-budget:]
+            pieces.append((tokenizer.decode(window), len(window)))
+        break
+    return pieces
 
-        combined = buffer_text + " " + text
 
-        # If still within size → keep merging
-        if token_len(combined) <= MAX_TOKENS:
-            buffer_text = combined
-            continue
+def _overlap_tail(units: List[Tuple[str, int]], overlap_tokens: int) -> List[Tuple[str, int]]:
+    """
+    Up to `overlap_tokens` of trailing context from `units`. A unit that does
+    not fit whole is cut down (to sentences, then tokens), so a long last
+    paragraph still carries overlap into the next chunk.
+    """
+    tail = []
+    total = 0
+    for text, n in reversed(units):
+        if total + n > overlap_tokens:
+            tail.extend(_unit_tail(text, overlap_tokens - total))
+            break
+        tail.append((text, n))
+        total += n
+    tail.reverse()
+    return tail
+
+
+def iter_chunks(
+    docs: Iterable[Dict],
+    max_tokens: int = MAX_TOKENS,
+    min_tokens: int = MIN_TOKENS,
+    overlap_tokens: int = OVERLAP_TOKENS
+) -> Iterator[Dict]:
+    """
+    Streaming version of chunk_documents: consumes paragraphs from any
+    iterable (e.g. a PDF parsing generator) and yields chunks as soon as
+    they are complete. Chunks never span two source files.
+
+    Each paragraph is tokenized once; chunk sizes are tracked as running
+    token counts, so chunking is linear in the corpus size.
+    """
+    buffer: List[Tuple[str, int]] = []
+    buffer_tokens = 0
+    buffer_meta = None
+    # False while the buffer only holds overlap carried over from the previous chunk
+    fresh = False
 
-        # Save meaningful chunk
-        if token_len(buffer_text) >= MIN_TOKENS:
-            chunks.append({
-                "text": buffer_text,
+    def flush():
+        if fresh and buffer_tokens >= min_tokens:
+            return {
+                "text": " ".join(text for text, _ in buffer),
                 "metadata": buffer_meta
-            })
+            }
+        return None
+
+    for doc in docs:
+        meta = doc["metadata"]
 
-        # Reset buffer
-        buffer_text = text
-        buffer_meta = meta
+        if buffer and meta.get("source") != buffer_meta.get("source"):
+            chunk = flush()
+            if chunk:
+                yield chunk
+            buffer, buffer_tokens, fresh = [], 0, False
+
+        for text, n in split_units(doc["text"], max_tokens):
+            # If still within size → keep merging
+            if buffer and buffer_tokens + n > max_tokens:
+                chunk = flush()
+                if chunk:
+                    yield chunk
+
+                # Overlap shrinks rather than pushing the next chunk past max_tokens
+                buffer = _overlap_tail(buffer, min(overlap_tokens, max_tokens - n)) if chunk else []
+                buffer_tokens = sum(k for _, k in buffer)
+                fresh = False
+
+            if not fresh:
+                buffer_meta = meta
+                fresh = True
+            buffer.append((text, n))
+            buffer_tokens += n
 
     # Flush last chunk
-    if buffer_text and token_len(buffer_text) >= MIN_TOKENS:
-        chunks.append({
-            "text": buffer_text,
-            "metadata": buffer_meta
-        })
+    chunk = flush()
+    if chunk:
+        yield chunk
+
 
-    return chunks
+def chunk_documents(
+    docs: List[Dict],
+    max_tokens: int = MAX_TOKENS,
+    min_tokens: int = MIN_TOKENS,
+    overlap_tokens: int = OVERLAP_TOKENS
+) -> List[Dict]:
+    """
+    Converts ingestion paragraphs into retrieval-ready chunks.
+    """
+    return list(iter_chunks(docs, max_tokens, min_tokens, overlap_tokens))
@@ -0,0 +1,183 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ingestion.cleaner import clean_text
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    ".cache",
+    "embeddings.sqlite"
+)
+
+EVICT_CHECK_EVERY = 1_000
+# Disk-tier recency (last_access) is buffered in memory and written back in batches
+ACCESS_FLUSH_EVERY = 1_000
+
+
+def normalize_text(text: str) -> str:
+    return clean_text(unicodedata.normalize("NFC", text))
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache keyed by sha256(model name + normalized text).
+
+    - memory tier: LRU of the most recent `memory_items` vectors
+    - disk tier:   SQLite table of float32 blobs, trimmed to `max_disk_items`
+                   by least-recent access (pass path=None to disable it)
+
+    Lookups never write on their own: access times are collected in memory and
+    flushed to the disk tier every ACCESS_FLUSH_EVERY hits and on writes.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        path: Optional[str] = DEFAULT_CACHE_PATH,
+        memory_items: int = 10_000,
+        max_disk_items: int = 1_000_000
+    ):
+        self.model_name = model_name
+        self.memory_items = memory_items
+        self.max_disk_items = max_disk_items
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        # key -> last access time not yet written to the disk tier
+        self._accessed: Dict[str, float] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self._writes_since_evict = 0
+
+        if path:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings(last_access)"
+            )
+            self._db.commit()
+
+    def key(self, text: str) -> str:
+        payload = f"{self.model_name}\0{normalize_text(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        keys = [self.key(t) for t in texts]
+        found: List[Optional[np.ndarray]] = [None] * len(texts)
+        disk_lookup = {}
+        now = time.time()
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[i] = vector
+                    if self._db is not None:
+                        self._accessed[key] = now
+                else:
+                    disk_lookup.setdefault(key, []).append(i)
+
+            if disk_lookup and self._db is not None:
+                wanted = list(disk_lookup)
+                rows = []
+                # SQLite caps the number of bound parameters per statement
+                for start in range(0, len(wanted), 500):
+                    part = wanted[start:start + 500]
+                    rows.extend(self._db.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(part))})",
+                        part
+                    ).fetchall())
+
+                for key, blob in rows:
+                    vector = np.frombuffer(blob, dtype="float32")
+                    self._remember(key, vector)
+                    self._accessed[key] = now
+                    for i in disk_lookup[key]:
+                        found[i] = vector
+
+            if len(self._accessed) >= ACCESS_FLUSH_EVERY:
+                self._flush_access()
+                self._db.commit()
+
+            hits = sum(1 for v in found if v is not None)
+            self.hits += hits
+            self.misses += len(texts) - hits
+
+        return found
+
+    def put_many(self, texts: List[str], vectors: np.ndarray):
+        vectors = np.asarray(vectors, dtype="float32")
+        now = time.time()
+
+        with self._lock:
+            rows = []
+            for text, vector in zip(texts, vectors):
+                key = self.key(text)
+                # Copy: a row view would keep the whole batch array alive
+                self._remember(key, vector.copy())
+                self._accessed.pop(key, None)
+                rows.append((key, vector.tobytes(), now))
+
+            if self._db is not None and rows:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, last_access) VALUES (?, ?, ?)",
+                    rows
+                )
+                self._writes_since_evict += len(rows)
+                # Eviction order needs the buffered recency
+                self._flush_access()
+                # COUNT(*) is a table scan, so only check the bound periodically
+                if self._writes_since_evict >= EVICT_CHECK_EVERY:
+                    self._evict()
+                    self._writes_since_evict = 0
+                self._db.commit()
+
+    def _flush_access(self):
+        """Writes buffered access times (caller holds the lock and commits)."""
+        if self._accessed:
+            self._db.executemany(
+                "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._accessed.items()]
+            )
+            self._accessed.clear()
+
+    def _evict(self):
+        (count,) = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        overflow = count - self.max_disk_items
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+                (overflow,)
+            )
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "memory_items": len(self._memory)
+        }
@@ -1,8 +1,69 @@
-from typing import List, Dict
-from sentence_transformers import SentenceTransformer
+import os
+from typing import Callable, List, Dict
+import numpy as np
+
+from embeddings.cache import DEFAULT_CACHE_PATH, EmbeddingCache
+from utils.model_registry import EMBEDDING_MODEL, get_embedder
+from utils.onnx_backend import INFERENCE_BACKEND
+
+_cache = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """
+    Process-wide embedding cache. RAG_EMBEDDING_CACHE sets the SQLite path,
+    "off" keeps only the in-memory tier.
+    """
+    global _cache
+    if _cache is None:
+        path = os.getenv("RAG_EMBEDDING_CACHE", DEFAULT_CACHE_PATH)
+        _cache = EmbeddingCache(
+            # int8 vectors differ slightly from fp32 ones, so backends never share entries
+            f"{EMBEDDING_MODEL}@{INFERENCE_BACKEND}",
+            path=None if path == "off" else path,
+            memory_items=int(os.getenv("RAG_EMBEDDING_CACHE_MEMORY_ITEMS", "10000")),
+            max_disk_items=int(os.getenv("RAG_EMBEDDING_CACHE_MAX_ITEMS", "1000000"))
+        )
+    return _cache
+
+
+def encode_texts(
+    texts: List[str],
+    batch_size: int = 32,
+    show_progress_bar: bool = False,
+    encoder: Callable[[List[str]], np.ndarray] = None
+) -> np.ndarray:
+    """
+    Normalized float32 embeddings for `texts`. Cached texts are not re-encoded;
+    all misses go through the model in a single encode call, or through
+    `encoder` (e.g. ParallelEmbedder.encode) when given.
+    """
+    cache = get_embedding_cache()
+    cached = cache.get_many(texts)
+    missing = [i for i, v in enumerate(cached) if v is None]
+
+    if missing:
+        missing_texts = [texts[i] for i in missing]
+        if encoder is not None:
+            fresh = encoder(missing_texts)
+        else:
+            fresh = get_embedder().encode(
+                missing_texts,
+                batch_size=batch_size,
+                show_progress_bar=show_progress_bar,
+                normalize_embeddings=True,
+                convert_to_numpy=True
+            )
+        fresh = fresh.astype("float32", copy=False)
+        cache.put_many([texts[i] for i in missing], fresh)
+        for i, vector in zip(missing, fresh):
+            cached[i] = vector
+
+    if not texts:
+        return np.empty((0, get_embedder().get_sentence_embedding_dimension()), dtype="float32")
+
+    return np.vstack(cached)
 
-# Load once (CPU-friendly)
-model = SentenceTransformer("all-MiniLM-L6-v2")
 
 def embed_chunks(chunks: List[Dict]) -> List[Dict]:
     """
@@ -11,11 +72,10 @@ def embed_chunks(chunks: List[Dict]) -> List[Dict]:
 
     texts = [c["text"] for c in chunks]
 
-    embeddings = model.encode(
+    embeddings = encode_texts(
         texts,
         batch_size=32,
-        show_progress_bar=True,
-        normalize_embeddings=True
+        show_progress_bar=True
     )
 
     embedded_chunks = []
@@ -23,7 +83,7 @@ def embed_chunks(chunks: List[Dict]) -> List[Dict]:
     for chunk, emb in zip(chunks, embeddings):
         embedded_chunks.append({
             "text": chunk["text"],
-            "embedding": emb.tolist(),
+            "embedding": emb,  # float32 row view, no Python float lists
             "metadata": chunk["metadata"]
         })
 
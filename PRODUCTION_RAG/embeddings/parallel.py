@@ -0,0 +1,127 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List
+
+import numpy as np
+
+from utils.model_registry import EMBEDDING_MODEL
+from utils.onnx_backend import INFERENCE_BACKEND, resolve
+
+# One model per worker process, loaded by the pool initializer
+_worker_model = None
+
+
+def _init_worker(model_name: str, threads: int, backend: str):
+    global _worker_model
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    # Workers split the cores between them instead of all fighting over every core
+    torch.set_num_threads(threads)
+    path, kwargs = resolve(model_name, "embedder", backend)
+    _worker_model = SentenceTransformer(path, device="cpu", **kwargs)
+
+
+def _encode_shard(start: int, texts: List[str], batch_size: int):
+    vectors = _worker_model.encode(
+        texts,
+        batch_size=batch_size,
+        show_progress_bar=False,
+        normalize_embeddings=True,
+        convert_to_numpy=True
+    )
+    return start, vectors.astype("float32", copy=False)
+
+
+class ParallelEmbedder:
+    """
+    CPU embedding engine for large ingestion runs.
+
+    Texts are cut into shards and encoded by a pool of worker processes,
+    each holding its own model copy. Shard results are written straight
+    into a preallocated float32 matrix as they complete.
+
+    Use as a context manager so the pool (and the loaded models) is reused
+    across calls:
+
+        with ParallelEmbedder(workers=32) as embedder:
+            vectors = embedder.encode(texts)
+            print(embedder.stats())
+    """
+
+    def __init__(
+        self,
+        workers: int = None,
+        threads_per_worker: int = 1,
+        shard_size: int = 256,
+        batch_size: int = 32,
+        model_name: str = EMBEDDING_MODEL,
+        backend: str = INFERENCE_BACKEND
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.threads_per_worker = threads_per_worker
+        self.shard_size = shard_size
+        self.batch_size = batch_size
+        self.model_name = model_name
+        self.backend = backend
+
+        self._pool = None
+        self.total_chunks = 0
+        self.total_seconds = 0.0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self):
+        if self._pool is None:
+            # Export ONNX files once here, not concurrently in every worker
+            resolve(self.model_name, "embedder", self.backend)
+            # spawn: forking a process that already imported torch can deadlock
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.model_name, self.threads_per_worker, self.backend)
+            )
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        self.start()
+        t0 = time.perf_counter()
+
+        futures = [
+            self._pool.submit(_encode_shard, start, texts[start:start + self.shard_size], self.batch_size)
+            for start in range(0, len(texts), self.shard_size)
+        ]
+
+        out = None
+        for future in as_completed(futures):
+            start, vectors = future.result()
+            if out is None:
+                out = np.empty((len(texts), vectors.shape[1]), dtype="float32")
+            out[start:start + len(vectors)] = vectors
+
+        self.total_chunks += len(texts)
+        self.total_seconds += time.perf_counter() - t0
+
+        if out is None:
+            return np.empty((0, 0), dtype="float32")
+        return out
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "chunks": self.total_chunks,
+            "seconds": round(self.total_seconds, 2),
+            "chunks_per_s": round(self.total_chunks / self.total_seconds, 1) if self.total_seconds else 0.0
+        }
@@ -0,0 +1,107 @@
+import argparse
+import json
+import time
+
+import numpy as np
+
+from vectorstore.faiss_store import FaissVectorStore
+from vectorstore.index_factory import build_index, search_params
+
+# (index_type, build params, query-time knob name, knob values)
+SWEEP = [
+    ("hnsw", {}, "ef_search", [16, 32, 64, 128, 256]),
+    ("ivf_flat", {}, "nprobe", [1, 4, 16, 64]),
+    ("ivf_pq", {}, "nprobe", [1, 4, 16, 64]),
+]
+
+
+def sample_queries(vectors: np.ndarray, n_queries: int, noise: float = 0.05, seed: int = 0):
+    """
+    Synthetic queries: perturbed copies of corpus vectors, re-normalized.
+    """
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(len(vectors), size=min(n_queries, len(vectors)), replace=False)
+    queries = vectors[picks] + rng.normal(0, noise, size=(len(picks), vectors.shape[1]))
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    return queries.astype("float32")
+
+
+def timed_search(index, queries, top_k, params=None):
+    t0 = time.perf_counter()
+    _, ids = index.search(queries, top_k, params=params)
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    return ids, elapsed_ms / len(queries)
+
+
+def recall_at_k(truth: np.ndarray, found: np.ndarray) -> float:
+    hits = sum(len(set(t) & set(f)) for t, f in zip(truth, found))
+    return hits / truth.size
+
+
+def run_report(store_path: str, n_queries: int = 500, top_k: int = 10):
+    store = FaissVectorStore(dim=384)
+    store.load(store_path)
+    ids = store.ids()
+    vectors = store.index.reconstruct_batch(ids)
+    queries = sample_queries(vectors, n_queries)
+
+    flat = build_index("flat", store.dim)
+    flat.add_with_ids(vectors, ids)
+    truth, flat_ms = timed_search(flat, queries, top_k)
+
+    rows = [{
+        "index_type": "flat",
+        "knob": None,
+        "value": None,
+        "recall_at_k": 1.0,
+        "latency_ms_per_query": round(flat_ms, 4),
+    }]
+
+    for index_type, build_params, knob, values in SWEEP:
+        try:
+            index = build_index(index_type, store.dim, n_vectors=len(ids), **build_params)
+            t0 = time.perf_counter()
+            index.train(vectors)
+            index.add_with_ids(vectors, ids)
+            build_s = time.perf_counter() - t0
+        except RuntimeError as e:
+            # e.g. too few vectors to train IVF-PQ codebooks
+            print(f"Skipping {index_type}: {e}")
+            continue
+
+        for value in values:
+            params = search_params(index_type, **{knob: value})
+            found, ms = timed_search(index, queries, top_k, params=params)
+            rows.append({
+                "index_type": index_type,
+                "knob": knob,
+                "value": value,
+                "recall_at_k": round(recall_at_k(truth, found), 4),
+                "latency_ms_per_query": round(ms, 4),
+                "build_s": round(build_s, 2),
+            })
+
+    return {"n_vectors": len(ids), "n_queries": len(queries), "top_k": top_k, "results": rows}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recall-vs-latency report for ANN index types against flat search.")
+    parser.add_argument("--store", default="vectorstore_data")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--output", help="Optional path to write the report as JSON")
+    args = parser.parse_args()
+
+    report = run_report(args.store, n_queries=args.queries, top_k=args.top_k)
+
+    print(f"{report['n_vectors']} vectors, {report['n_queries']} queries, recall@{report['top_k']}\n")
+    print(f"{'index':<10} {'knob':<10} {'value':>6} {'recall':>8} {'ms/query':>10}")
+    for r in report["results"]:
+        print(
+            f"{r['index_type']:<10} {str(r['knob'] or '-'):<10} {str(r['value'] or '-'):>6} "
+            f"{r['recall_at_k']:>8.4f} {r['latency_ms_per_query']:>10.4f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
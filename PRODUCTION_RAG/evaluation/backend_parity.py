@@ -0,0 +1,111 @@
+import argparse
+import json
+import time
+
+import numpy as np
+
+from utils.model_registry import EMBEDDING_MODEL, RERANKER_MODEL, get_embedder, get_reranker
+from vectorstore.faiss_store import FaissVectorStore
+
+SAMPLE_QUERIES = [
+    "What is the responsibility of the HR department regarding this manual?",
+    "How many days of casual leave are employees entitled to?",
+    "What is the notice period for resignation?",
+    "Who approves travel reimbursement claims?",
+    "What qualifications are required for an Assistant General Manager?",
+    "How is misconduct handled under the disciplinary policy?",
+]
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, (time.perf_counter() - t0) * 1000
+
+
+def spearman(a, b) -> float:
+    ra = np.argsort(np.argsort(a))
+    rb = np.argsort(np.argsort(b))
+    return float(np.corrcoef(ra, rb)[0, 1])
+
+
+def embedder_parity(texts, queries, backend, top_k=5):
+    ref_model = get_embedder(EMBEDDING_MODEL, backend="torch")
+    new_model = get_embedder(EMBEDDING_MODEL, backend=backend)
+
+    ref, ref_ms = timed(lambda: ref_model.encode(texts, normalize_embeddings=True, batch_size=32))
+    new, new_ms = timed(lambda: new_model.encode(texts, normalize_embeddings=True, batch_size=32))
+    cosine = np.sum(ref * new, axis=1)
+
+    # Retrieval agreement: top-k over the sampled chunks with each backend's vectors
+    q_ref = ref_model.encode(queries, normalize_embeddings=True)
+    q_new = new_model.encode(queries, normalize_embeddings=True)
+    top_ref = np.argsort(-q_ref @ ref.T, axis=1)[:, :top_k]
+    top_new = np.argsort(-q_new @ new.T, axis=1)[:, :top_k]
+    overlap = np.mean([len(set(a) & set(b)) / top_k for a, b in zip(top_ref, top_new)])
+
+    return {
+        "min_cosine": round(float(cosine.min()), 5),
+        "mean_cosine": round(float(cosine.mean()), 5),
+        f"top{top_k}_overlap": round(float(overlap), 4),
+        "torch_ms": round(ref_ms, 1),
+        f"{backend}_ms": round(new_ms, 1),
+        "speedup": round(ref_ms / new_ms, 2) if new_ms else None
+    }
+
+
+def reranker_parity(texts, queries, backend, top_n=5):
+    ref_model = get_reranker(RERANKER_MODEL, backend="torch")
+    new_model = get_reranker(RERANKER_MODEL, backend=backend)
+
+    correlations, agreements, ref_total, new_total = [], [], 0.0, 0.0
+    for query in queries:
+        pairs = [(query, t) for t in texts]
+        ref, ref_ms = timed(lambda: ref_model.predict(pairs))
+        new, new_ms = timed(lambda: new_model.predict(pairs))
+        ref_total += ref_ms
+        new_total += new_ms
+
+        correlations.append(spearman(ref, new))
+        top_ref = set(np.argsort(-ref)[:top_n])
+        top_new = set(np.argsort(-new)[:top_n])
+        agreements.append(len(top_ref & top_new) / top_n)
+
+    return {
+        "mean_spearman": round(float(np.mean(correlations)), 4),
+        f"top{top_n}_agreement": round(float(np.mean(agreements)), 4),
+        "torch_ms": round(ref_total, 1),
+        f"{backend}_ms": round(new_total, 1),
+        "speedup": round(ref_total / new_total, 2) if new_total else None
+    }
+
+
+def run_parity(store_path: str, backend: str, n_texts: int = 200):
+    store = FaissVectorStore(dim=384)
+    store.load(store_path)
+    texts = [store.get(vid)["text"] for vid in store.ids()[:n_texts].tolist()]
+
+    return {
+        "backend": backend,
+        "n_texts": len(texts),
+        "n_queries": len(SAMPLE_QUERIES),
+        "embedder": embedder_parity(texts, SAMPLE_QUERIES, backend),
+        # Cross-encoder cost grows with pairs; a slice is enough for parity
+        "reranker": reranker_parity(texts[:30], SAMPLE_QUERIES, backend)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Accuracy and latency parity of an ONNX backend against PyTorch.")
+    parser.add_argument("--store", default="vectorstore_data")
+    parser.add_argument("--backend", choices=["onnx", "onnx-int8"], default="onnx-int8")
+    parser.add_argument("--texts", type=int, default=200)
+    parser.add_argument("--output", help="Optional path to write the report as JSON")
+    args = parser.parse_args()
+
+    report = run_parity(args.store, args.backend, n_texts=args.texts)
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
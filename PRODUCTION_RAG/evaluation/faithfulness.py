@@ -1,31 +1,80 @@
-from sentence_transformers import SentenceTransformer, util
+import os
+import re
 
-# Lightweight semantic model
-_model = SentenceTransformer("all-MiniLM-L6-v2")
+import numpy as np
 
-def faithfulness(answer: str, context: str):
+from embeddings.embedder import encode_texts
+
+# Sentence boundaries, plus line breaks used by bullet-style answers
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+MAX_SENTENCES = 64
+
+# MiniLM cosine at which an answer sentence counts as supported by a chunk.
+# Unrelated policy text sits around 0.1-0.3, restatements of a chunk above 0.5
+SUPPORT_THRESHOLD = float(os.getenv("RAG_FAITHFULNESS_SUPPORT", "0.5"))
+
+# Confidence bands over the score (the share of supported sentences):
+# high = at least 4 in 5 sentences supported, medium = at least half
+HIGH_CONFIDENCE = 0.8
+MEDIUM_CONFIDENCE = 0.5
+
+
+def split_sentences(text: str):
+    sentences = []
+    for s in SENTENCE_SPLIT.split(text):
+        s = s.strip().lstrip("-*• ").strip()
+        if len(s) >= 3:
+            sentences.append(s)
+    return sentences[:MAX_SENTENCES]
+
+
+def split_context(context: str):
+    # build_context joins chunks as "- text" blocks separated by blank lines
+    return [block.strip().lstrip("- ").strip() for block in context.split("\n\n") if block.strip()]
+
+
+def faithfulness(answer: str, context: str, chunk_vectors=None):
     """
-    Measures semantic alignment between answer and retrieved context.
+    Measures how well each answer sentence is supported by the retrieved chunks.
+
+    Every sentence is embedded (one batched encode) and scored by its max
+    cosine similarity to any chunk vector. The score is the share of
+    sentences whose support reaches SUPPORT_THRESHOLD, so the confidence
+    bands read as "how much of the answer is backed by a chunk". (The old
+    whole-answer similarity had a different scale; its 0.6 / 0.35 cut-offs
+    do not carry over.) Pass the chunk vectors stored in the vector store to
+    skip re-encoding the context; otherwise the context blocks are encoded
+    (usually served by the embedding cache).
     Returns a score between 0 and 1.
     """
 
     if not answer or not context:
         return {
             "faithfulness_score": 0.0,
-            "answerable": False
+            "answerable": False,
+            "sentence_scores": []
         }
 
-    answer_emb = _model.encode(answer, convert_to_tensor=True)
-    context_emb = _model.encode(context, convert_to_tensor=True)
+    sentences = split_sentences(answer) or [answer]
+    sentence_vectors = encode_texts(sentences)
+
+    if chunk_vectors is None or len(chunk_vectors) == 0:
+        chunk_vectors = encode_texts(split_context(context))
+    chunk_vectors = np.asarray(chunk_vectors, dtype="float32")
 
-    similarity = util.cos_sim(answer_emb, context_emb).item()
+    # Both sides are L2-normalized, so the dot product is cosine similarity
+    support = (sentence_vectors @ chunk_vectors.T).max(axis=1)
 
-    # Practical enterprise thresholds (NOT academic)
-    faithfulness_score = round(float(similarity), 2)
+    supported = support >= SUPPORT_THRESHOLD
+    faithfulness_score = round(float(supported.mean()), 2)
 
-    answerable = faithfulness_score >= 0.35
+    answerable = faithfulness_score >= MEDIUM_CONFIDENCE
 
     return {
         "faithfulness_score": faithfulness_score,
-        "answerable": answerable
+        "answerable": answerable,
+        "sentence_scores": [
+            {"sentence": s, "support": round(float(v), 3), "supported": bool(ok)}
+            for s, v, ok in zip(sentences, support, supported)
+        ]
     }
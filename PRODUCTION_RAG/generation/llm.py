@@ -1,9 +1,22 @@
 import os
-from groq import Groq
+import httpx
+from groq import AsyncGroq, Groq
 from dotenv import load_dotenv
 
 load_dotenv()
 client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+
+# Async client with a pooled, keep-alive connection set shared by all requests
+async_client = AsyncGroq(
+    api_key=os.getenv("GROQ_API_KEY"),
+    http_client=httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=int(os.getenv("GROQ_MAX_CONNECTIONS", "200")),
+            max_keepalive_connections=int(os.getenv("GROQ_MAX_KEEPALIVE", "50"))
+        ),
+        timeout=httpx.Timeout(60.0, connect=5.0)
+    )
+)
 def generate(prompt: str) -> str:
     response = client.chat.completions.create(
         model="llama-3.1-8b-instant",
@@ -18,3 +31,52 @@ def generate_insight(prompt: str) -> str:
         temperature=0.2
     )
     return response.choices[0].message.content
+def generate_stream(prompt: str):
+    """
+    Yields answer tokens as Groq streams them back.
+    """
+    stream = client.chat.completions.create(
+        model="llama-3.1-8b-instant",
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0,
+        stream=True
+    )
+    for chunk in stream:
+        token = chunk.choices[0].delta.content
+        if token:
+            yield token
+
+
+async def agenerate(prompt: str) -> str:
+    response = await async_client.chat.completions.create(
+        model="llama-3.1-8b-instant",
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0
+    )
+    return response.choices[0].message.content
+
+
+async def agenerate_insight(prompt: str) -> str:
+    response = await async_client.chat.completions.create(
+        model="llama-3.1-8b-instant",
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.2
+    )
+    return response.choices[0].message.content
+
+
+async def agenerate_stream(prompt: str):
+    stream = await async_client.chat.completions.create(
+        model="llama-3.1-8b-instant",
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0,
+        stream=True
+    )
+    async for chunk in stream:
+        token = chunk.choices[0].delta.content
+        if token:
+            yield token
+
+
+async def aclose():
+    await async_client.close()
@@ -12,18 +12,27 @@ Question:
 Answer:
 """
 
+METRIC_LABELS = [
+    ("retrieval_time_ms", "Retrieval Time (ms)"),
+    ("rerank_time_ms", "Re-rank Time (ms)"),
+    ("generation_time_ms", "Generation Time (ms)"),
+    ("faithfulness_score", "Faithfulness Score (share of answer sentences supported by the evidence, 0–1)"),
+    ("answerable", "Answerable"),
+]
+
 def build_metrics_insight_prompt(metrics: dict, sources: str) -> str:
+    # Metrics that are not available yet (e.g. faithfulness computed
+    # concurrently with the insight) are simply left out
+    metric_lines = "\n".join(
+        f"- {label}: {metrics[key]}" for key, label in METRIC_LABELS if key in metrics
+    )
     return f"""
 You are an AI system analyst evaluating the quality of a Retrieval-Augmented Generation (RAG) response.
 
 Given the system metrics and retrieval evidence below, produce a concise, user-friendly insight.
 
 System Metrics:
-- Retrieval Time (ms): {metrics['retrieval_time_ms']}
-- Re-rank Time (ms): {metrics['rerank_time_ms']}
-- Generation Time (ms): {metrics['generation_time_ms']}
-- Faithfulness Score (0–1): {metrics['faithfulness_score']}
-- Answerable: {metrics['answerable']}
+{metric_lines}
 
 Retrieved Evidence:
 {sources}
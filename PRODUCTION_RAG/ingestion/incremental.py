@@ -0,0 +1,184 @@
+import os
+import time
+from contextlib import nullcontext
+from itertools import groupby
+from typing import Dict, List
+
+from ingestion.manifest import IngestManifest, file_hash, pdf_sources, text_hash
+from ingestion.streaming import PARSE_WORKERS, iter_documents
+from chunking.chunker import iter_chunks
+from embeddings.embedder import encode_texts
+from embeddings.parallel import ParallelEmbedder
+from vectorstore.faiss_store import FaissVectorStore
+from vectorstore.sharded_store import ShardedVectorStore
+
+EMBEDDING_DIM = 384
+
+# New chunks are embedded and added to the index every this many chunks
+EMBED_FLUSH = int(os.getenv("RAG_INGEST_EMBED_BATCH", "2048"))
+
+
+def new_store(shards: int = 0, partition: str = "source", dim: int = EMBEDDING_DIM):
+    if shards > 1:
+        return ShardedVectorStore(dim, n_shards=shards, partition=partition)
+    return FaissVectorStore(dim=dim)
+
+
+def load_store(store_path: str, dim: int = EMBEDDING_DIM):
+    if ShardedVectorStore.exists(store_path):
+        return ShardedVectorStore.load(store_path)
+
+    store = FaissVectorStore(dim=dim)
+    if os.path.exists(os.path.join(store_path, "index.faiss")):
+        store.load(store_path)
+    return store
+
+
+def ingest_incremental(
+    pdf_paths: List[str],
+    store_path: str,
+    rebuild: bool = False,
+    index_type: str = None,
+    workers: int = 1,
+    parse_workers: int = PARSE_WORKERS,
+    shards: int = 0,
+    partition: str = "source"
+) -> Dict[str, int]:
+    """
+    Brings the vector store in line with `pdf_paths` (PDF files and/or
+    directories, see pdf_sources for how documents are keyed):
+    - unchanged PDFs (same file hash) are skipped entirely
+    - changed PDFs are re-chunked, but only chunks with a new text hash are embedded
+    - chunks and PDFs that disappeared have their vectors removed
+    With `rebuild=True` the existing store and manifest are ignored and the
+    index type is chosen from corpus size unless `index_type` is given.
+    `workers` > 1 embeds with a process pool instead of in-process.
+    `shards` > 1 (on rebuild) creates a ShardedVectorStore partitioned by `partition`.
+
+    Changed PDFs are streamed: pages are partitioned by `parse_workers`
+    processes, chunked on the fly and embedded/added every EMBED_FLUSH
+    chunks, so no document is ever held in memory as a whole.
+    """
+    if rebuild:
+        store = new_store(shards, partition)
+        manifest = IngestManifest()
+    else:
+        store = load_store(store_path)
+        manifest = IngestManifest.load(store_path)
+
+        if len(store) and not manifest.documents:
+            # Store built before manifests existed: no way to map vectors back to files
+            print("No ingestion manifest found for existing store, rebuilding from scratch.")
+            if isinstance(store, ShardedVectorStore):
+                store = new_store(store.n_shards, store.partition)
+            else:
+                store = new_store()
+
+    stats = {
+        "documents_skipped": 0,
+        "documents_updated": 0,
+        "documents_removed": 0,
+        "chunks_embedded": 0,
+        "chunks_reused": 0,
+        "chunks_removed": 0,
+    }
+
+    # 1. Documents no longer present in the corpus
+    current = pdf_sources(pdf_paths)
+    for source in list(manifest.documents):
+        if source not in current:
+            stats["chunks_removed"] += store.remove(manifest.remove_document(source))
+            stats["documents_removed"] += 1
+
+    # 2. New or changed documents
+    changed = {}
+    for source, pdf_path in current.items():
+        doc_hash = file_hash(pdf_path)
+        if manifest.document_hash(source) == doc_hash:
+            stats["documents_skipped"] += 1
+        else:
+            changed[source] = (pdf_path, doc_hash)
+
+    updated: Dict[str, tuple] = {}
+    to_embed = []
+    embed_seconds = 0.0
+
+    def flush(encoder):
+        nonlocal embed_seconds
+        if not to_embed:
+            return
+
+        new = [chunk for _, _, chunk in to_embed]
+        t0 = time.perf_counter()
+        vectors = encode_texts([c["text"] for c in new], show_progress_bar=encoder is None, encoder=encoder)
+        embed_seconds += time.perf_counter() - t0
+
+        ids = store.add_vectors(new, vectors)
+        for (source, h, _), vid in zip(to_embed, ids):
+            updated[source][1].setdefault(h, []).append(vid)
+        stats["chunks_embedded"] += len(ids)
+        to_embed.clear()
+
+    embedder = ParallelEmbedder(workers=workers) if workers > 1 else nullcontext()
+    with embedder:
+        encoder = embedder.encode if workers > 1 else None
+
+        docs = iter_documents(
+            [path for path, _ in changed.values()],
+            workers=parse_workers,
+            sources=list(changed)
+        )
+        for source, chunks in groupby(iter_chunks(docs), key=lambda c: c["metadata"]["source"]):
+            old_chunks = manifest.chunk_ids(source)
+            new_chunks: Dict[str, List[int]] = {}
+            updated[source] = (changed[source][1], new_chunks)
+
+            for chunk in chunks:
+                h = text_hash(chunk["text"])
+                reusable = old_chunks.get(h)
+                if reusable:
+                    vid = reusable.pop()
+                    # Text is identical, but page numbers may have shifted
+                    store.update_metadata(vid, chunk["metadata"])
+                    new_chunks.setdefault(h, []).append(vid)
+                    stats["chunks_reused"] += 1
+                else:
+                    to_embed.append((source, h, chunk))
+                    if len(to_embed) >= EMBED_FLUSH:
+                        flush(encoder)
+
+            stale_ids = [vid for ids in old_chunks.values() for vid in ids]
+            stats["chunks_removed"] += store.remove(stale_ids)
+            stats["documents_updated"] += 1
+
+        flush(encoder)
+
+    # Changed PDFs that no longer yield any chunk
+    for source, (_, doc_hash) in changed.items():
+        if source not in updated:
+            stats["chunks_removed"] += store.remove(manifest.remove_document(source))
+            updated[source] = (doc_hash, {})
+            stats["documents_updated"] += 1
+
+    if stats["chunks_embedded"]:
+        stats["embed_chunks_per_s"] = round(stats["chunks_embedded"] / embed_seconds, 1) if embed_seconds else 0.0
+
+    for source, (doc_hash, new_chunks) in updated.items():
+        manifest.set_document(source, doc_hash, new_chunks)
+
+    if rebuild or index_type:
+        store.reindex(index_type or "auto")
+    else:
+        # One HNSW rebuild for all removals of this ingest
+        store.compact()
+    stats["index_type"] = store.index_type
+
+    if not isinstance(store, ShardedVectorStore) and ShardedVectorStore.exists(store_path):
+        # Rebuilt unsharded over a sharded store: drop the old shards so loaders
+        # don't pick them up and their files don't linger
+        ShardedVectorStore.delete(store_path)
+
+    store.save(store_path)
+    manifest.save(store_path)
+
+    return stats
@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List
+
+MANIFEST_FILE = "manifest.json"
+
+
+def file_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def pdf_sources(paths: Iterable[str]) -> Dict[str, str]:
+    """
+    Maps manifest keys (chunk "source") to PDF paths.
+    Directories are expanded recursively and their PDFs keyed by path relative
+    to that directory (the ingest root), so equal file names in different
+    folders stay distinct; files given directly are keyed by file name.
+    Raises ValueError if two different PDFs still end up with the same key.
+    """
+    sources: Dict[str, str] = {}
+
+    def put(source: str, pdf_path: str):
+        previous = sources.get(source)
+        if previous is not None and os.path.abspath(previous) != os.path.abspath(pdf_path):
+            raise ValueError(f"PDFs {previous} and {pdf_path} both map to source {source!r}")
+        sources[source] = pdf_path
+
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in sorted(os.walk(path)):
+                for f in sorted(files):
+                    if f.lower().endswith(".pdf"):
+                        pdf_path = os.path.join(root, f)
+                        put(os.path.relpath(pdf_path, path).replace(os.sep, "/"), pdf_path)
+        else:
+            put(os.path.basename(path), path)
+    return sources
+
+
+class IngestManifest:
+    """
+    Content-hash manifest stored next to the FAISS index.
+
+    Layout:
+        {"documents": {source: {"hash": <file sha256>,
+                                "chunks": {<chunk sha256>: [vector ids]}}}}
+    """
+
+    def __init__(self, documents: Dict[str, Dict] = None):
+        self.documents = documents or {}
+
+    @classmethod
+    def load(cls, path: str) -> "IngestManifest":
+        manifest_path = os.path.join(path, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return cls()
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return cls(json.load(f)["documents"])
+
+    def save(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        tmp_path = os.path.join(path, MANIFEST_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"documents": self.documents}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, os.path.join(path, MANIFEST_FILE))
+
+    def document_hash(self, source: str):
+        entry = self.documents.get(source)
+        return entry["hash"] if entry else None
+
+    def chunk_ids(self, source: str) -> Dict[str, List[int]]:
+        entry = self.documents.get(source)
+        return dict(entry["chunks"]) if entry else {}
+
+    def set_document(self, source: str, doc_hash: str, chunks: Dict[str, List[int]]):
+        self.documents[source] = {"hash": doc_hash, "chunks": chunks}
+
+    def remove_document(self, source: str) -> List[int]:
+        entry = self.documents.pop(source, None)
+        if not entry:
+            return []
+        return [vid for ids in entry["chunks"].values() for vid in ids]
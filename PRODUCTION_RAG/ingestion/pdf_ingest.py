@@ -1,28 +1,18 @@
+import argparse
+import os
 from unstructured.partition.pdf import partition_pdf
 from ingestion.cleaner import clean_text
-from chunking.chunker import chunk_documents
-from embeddings.embedder import embed_chunks
-from vectorstore.faiss_store import FaissVectorStore
 # Only keep meaningful content
 ALLOWED_CATEGORIES = {
     "NarrativeText",
     "ListItem"
 }
 
-def ingest_pdf(pdf_path: str):
+def filter_elements(elements, source: str, page_offset: int = 0):
     """
-    Ingests a PDF and returns clean narrative text blocks
-    suitable for RAG.
+    Yields clean narrative text blocks from unstructured elements.
+    `page_offset` maps page numbers of a partitioned page range back to the full PDF.
     """
-
-    elements = partition_pdf(
-        filename=pdf_path,
-        strategy="fast",              # balanced & safe on MacBook
-        infer_table_structure=True
-    )
-
-    documents = []
-
     for el in elements:
         # 1. Structural filtering
         if el.category not in ALLOWED_CATEGORIES:
@@ -38,37 +28,97 @@ def ingest_pdf(pdf_path: str):
         if len(cleaned) < 150:
             continue
 
-        documents.append({
+        page_number = el.metadata.page_number
+        if page_number is not None:
+            page_number += page_offset
+
+        yield {
             "text": cleaned,
             "metadata": {
-                "page_number": el.metadata.page_number,
-                "category": el.category
+                "page_number": page_number,
+                "category": el.category,
+                "source": source
             }
-        })
-
-    return documents
+        }
 
 
-if __name__ == "__main__":
-    pdf_file = "data/raw/policies_p.pdf"
-
-    # 1. Ingestion
-    docs = ingest_pdf(pdf_file)
+def ingest_pdf(pdf_path: str):
+    """
+    Ingests a PDF and returns clean narrative text blocks
+    suitable for RAG.
+    For large PDFs use ingestion.streaming.iter_documents instead.
+    """
 
-    # 2. Chunking
-    chunks = chunk_documents(docs)
-    print(f"Total chunks created: {len(chunks)}")
+    elements = partition_pdf(
+        filename=pdf_path,
+        strategy="fast",              # balanced & safe on MacBook
+        infer_table_structure=True
+    )
 
-    # 3. Embeddings
-    embedded_chunks = embed_chunks(chunks)
-    print(f"Total embedded chunks: {len(embedded_chunks)}")
-    print("Embedding vector length:", len(embedded_chunks[0]["embedding"]))
+    return list(filter_elements(elements, os.path.basename(pdf_path)))
 
-    # 4. Vector store
-    vector_store = FaissVectorStore(dim=len(embedded_chunks[0]["embedding"]))
-    vector_store.add(embedded_chunks)
 
-    # Save to disk
-    vector_store.save("vectorstore_data")
+if __name__ == "__main__":
+    from ingestion.incremental import ingest_incremental
+    from ingestion.streaming import PARSE_WORKERS
+
+    parser = argparse.ArgumentParser(description="Ingest policy PDFs into the FAISS vector store.")
+    parser.add_argument(
+        "pdfs",
+        nargs="*",
+        default=["data/raw/policies_p.pdf"],
+        help="PDF files and/or directories of PDFs"
+    )
+    parser.add_argument("--store", default="vectorstore_data")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only embed new/changed chunks and drop vectors of deleted ones"
+    )
+    parser.add_argument(
+        "--index-type",
+        choices=["auto", "flat", "hnsw", "ivf_flat", "ivf_pq"],
+        default=None,
+        help="Rebuild the FAISS index with this type (default: auto on full rebuilds)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Embedding worker processes (use the core count on large ingestion runs)"
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=PARSE_WORKERS,
+        help="PDF partitioning worker processes (page ranges of all files are parsed in parallel)"
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=0,
+        help="Partition the store into this many shards (full rebuilds only)"
+    )
+    parser.add_argument(
+        "--partition",
+        choices=["source", "hash"],
+        default="source",
+        help="Shard routing: by source document or by chunk text hash"
+    )
+    args = parser.parse_args()
+
+    # Ingestion -> chunking -> embeddings -> vector store (+ content-hash manifest)
+    stats = ingest_incremental(
+        args.pdfs,
+        args.store,
+        rebuild=not args.incremental,
+        index_type=args.index_type,
+        workers=args.workers,
+        parse_workers=args.parse_workers,
+        shards=args.shards,
+        partition=args.partition
+    )
+    for key, value in stats.items():
+        print(f"{key}: {value}")
 
     print("\nFAISS index created and saved successfully.")
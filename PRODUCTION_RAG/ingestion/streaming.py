@@ -0,0 +1,97 @@
+import io
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from ingestion.manifest import pdf_sources
+from ingestion.pdf_ingest import filter_elements
+
+# Pages per partition task: bounds worker memory and gives large PDFs intra-file parallelism
+PAGES_PER_SHARD = int(os.getenv("RAG_INGEST_PAGES_PER_SHARD", "50"))
+PARSE_WORKERS = int(os.getenv("RAG_INGEST_PARSE_WORKERS", "1"))
+
+
+def expand_pdf_paths(paths: Iterable[str]) -> List[str]:
+    """
+    Files are kept as given; directories are expanded to the PDFs they contain (recursively).
+    """
+    return list(pdf_sources(paths).values())
+
+
+def page_ranges(pdf_path: str, pages_per_shard: int = PAGES_PER_SHARD) -> List[Tuple[int, int]]:
+    """
+    Splits a PDF into [start, end) zero-based page ranges.
+    """
+    import fitz
+
+    with fitz.open(pdf_path) as doc:
+        n_pages = doc.page_count
+    return [(start, min(start + pages_per_shard, n_pages)) for start in range(0, n_pages, pages_per_shard)]
+
+
+def partition_range(pdf_path: str, start: int, end: int, whole_file: bool = False, source: str = None) -> List[Dict]:
+    """
+    Partitions pages [start, end) of a PDF and returns its clean text blocks.
+    `source` is the manifest key (defaults to the file name).
+    Runs inside the worker processes.
+    """
+    import fitz
+    from unstructured.partition.pdf import partition_pdf
+
+    source = source or os.path.basename(pdf_path)
+
+    if whole_file:
+        elements = partition_pdf(filename=pdf_path, strategy="fast", infer_table_structure=True)
+        return list(filter_elements(elements, source))
+
+    # Copy just this page range into an in-memory PDF
+    with fitz.open(pdf_path) as src, fitz.open() as part:
+        part.insert_pdf(src, from_page=start, to_page=end - 1)
+        data = part.tobytes()
+
+    elements = partition_pdf(file=io.BytesIO(data), strategy="fast", infer_table_structure=True)
+    return list(filter_elements(elements, source, page_offset=start))
+
+
+def _shards(pdf_paths: List[str], sources: List[str], pages_per_shard: int):
+    for pdf_path, source in zip(pdf_paths, sources):
+        ranges = page_ranges(pdf_path, pages_per_shard)
+        for start, end in ranges:
+            yield pdf_path, start, end, len(ranges) == 1, source
+
+
+def iter_documents(
+    pdf_paths: List[str],
+    workers: int = PARSE_WORKERS,
+    pages_per_shard: int = PAGES_PER_SHARD,
+    sources: List[str] = None
+) -> Iterator[Dict]:
+    """
+    Yields clean text blocks of every PDF, in file and page order.
+    `sources` gives each PDF's manifest key (defaults to the file names).
+
+    Page ranges of all files are partitioned by a process pool; only a
+    window of 2 x workers shards is in flight, so memory stays bounded
+    regardless of PDF size or corpus size.
+    """
+    if sources is None:
+        sources = [os.path.basename(p) for p in pdf_paths]
+    shards = _shards(pdf_paths, sources, pages_per_shard)
+
+    if workers <= 1:
+        for shard in shards:
+            yield from partition_range(*shard)
+        return
+
+    # spawn: same reasoning as the embedding pool
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        pending = deque()
+        for shard in shards:
+            pending.append(pool.submit(partition_range, *shard))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
@@ -1,13 +1,263 @@
-from sentence_transformers import CrossEncoder
+import hashlib
+import os
+import threading
+from collections import OrderedDict
 
-reranker = CrossEncoder("cross-encoder/ms-marco-MiniLM-L-6-v2")
+from utils.batching import MAX_WAIT_MS, RERANK_BATCH_SIZE, MicroBatcher
+from utils.model_registry import get_reranker
 
-def rerank(query, chunks, top_n=5):
-    pairs = [(query, c["text"]) for c in chunks]
-    scores = reranker.predict(pairs)
+# "full" scores every candidate; "adaptive" (opt-in) uses the margin cut-off and cascade
+RERANK_MODE = os.getenv("RAG_RERANK_MODE", "full")
+DENSE_MARGIN = float(os.getenv("RAG_RERANK_MARGIN", "0.15"))
+CASCADE_BATCH = int(os.getenv("RAG_RERANK_CASCADE_BATCH", "4"))
+# Consecutive batches that must leave the top_n unchanged before the cascade stops
+STABLE_BATCHES = int(os.getenv("RAG_RERANK_STABLE_BATCHES", "2"))
+SCORE_CACHE_SIZE = int(os.getenv("RAG_RERANK_CACHE_SIZE", "50000"))
+
+_batcher = None
+
+
+def get_rerank_batcher() -> MicroBatcher:
+    """
+    Coalesces (query, chunk) pairs from concurrent requests into one predict() call.
+    """
+    global _batcher
+    if _batcher is None:
+        _batcher = MicroBatcher(
+            lambda pairs: get_reranker().predict(pairs, batch_size=len(pairs)).tolist(),
+            max_batch_size=RERANK_BATCH_SIZE,
+            max_wait_ms=MAX_WAIT_MS,
+            name="rerank"
+        )
+    return _batcher
+
+
+class ScoreCache:
+    """
+    Bounded LRU of cross-encoder scores keyed by (query hash, chunk text hash).
+    """
+
+    def __init__(self, max_items: int = SCORE_CACHE_SIZE):
+        self.max_items = max_items
+        self._scores = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            score = self._scores.get(key)
+            if score is None:
+                self.misses += 1
+                return None
+            self._scores.move_to_end(key)
+            self.hits += 1
+            return score
+
+    def put(self, key, score: float):
+        with self._lock:
+            self._scores[key] = score
+            self._scores.move_to_end(key)
+            while len(self._scores) > self.max_items:
+                self._scores.popitem(last=False)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "items": len(self._scores),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+
+score_cache = ScoreCache()
+
+# How adaptive reranking ended, for observability (updated from inference threads)
+adaptive_stats = {"requests": 0, "margin_truncated": 0, "early_exit": 0, "pairs_scored": 0, "pairs_cached": 0}
+_stats_lock = threading.Lock()
 
+
+def _count(name, n=1):
+    with _stats_lock:
+        adaptive_stats[name] += n
+
+
+def apply_scores(chunks, scores, top_n=5):
     for c, s in zip(chunks, scores):
         c["rerank_score"] = float(s)
 
     chunks = sorted(chunks, key=lambda x: x["rerank_score"], reverse=True)
     return chunks[:top_n]
+
+
+def rerank(query, chunks, top_n=5):
+    if RERANK_MODE == "adaptive":
+        return adaptive_rerank(query, chunks, top_n)
+
+    pairs = [(query, c["text"]) for c in chunks]
+    scores = get_reranker().predict(pairs)
+
+    return apply_scores(chunks, scores, top_n)
+
+
+async def arerank(query, chunks, top_n=5):
+    if RERANK_MODE == "adaptive":
+        return await aadaptive_rerank(query, chunks, top_n)
+
+    pairs = [(query, c["text"]) for c in chunks]
+    scores = await get_rerank_batcher().asubmit_many(pairs)
+
+    return apply_scores(chunks, scores, top_n)
+
+
+# ---------------------------------------------------------------------------
+# Adaptive reranking
+# ---------------------------------------------------------------------------
+
+def _dense_score(chunk):
+    # Hybrid results carry the dense similarity separately from the RRF score
+    return chunk["dense_score"] if "dense_score" in chunk else chunk.get("score")
+
+
+def _decisive_candidates(chunks, top_n, margin):
+    """
+    If the dense scores already separate the top_n from the rest by at least
+    `margin`, only those top_n need cross-encoder scores (for ordering).
+    """
+    if len(chunks) <= top_n:
+        return chunks
+
+    dense = [_dense_score(c) for c in chunks]
+    if any(d is None for d in dense):
+        return None
+
+    ranked = sorted(zip(dense, range(len(chunks))), reverse=True)
+    if ranked[top_n - 1][0] - ranked[top_n][0] >= margin:
+        return [chunks[i] for _, i in ranked[:top_n]]
+    return None
+
+
+class _Cascade:
+    """
+    Scores candidates in first-stage order, a small batch at a time, and
+    stops once `stable_batches` consecutive batches leave the top_n set unchanged.
+    """
+
+    def __init__(self, query, chunks, top_n, margin, batch_size, stable_batches=STABLE_BATCHES):
+        self.query_key = hashlib.sha1(query.encode("utf-8")).hexdigest()
+        self.top_n = top_n
+        self.batch_size = batch_size
+        self.stable_batches = max(1, stable_batches)
+        self.stable_runs = 0
+        self.scored = []
+        self.position = 0
+        self.before = None
+
+        _count("requests")
+        decisive = _decisive_candidates(chunks, top_n, margin)
+        if decisive is not None and len(decisive) < len(chunks):
+            _count("margin_truncated")
+            self.candidates = decisive
+            # Everything left has to be scored for ordering anyway
+            self.batch_size = len(decisive)
+        else:
+            self.candidates = chunks
+
+    def _key(self, chunk):
+        # Not the vector id: rebuilds, shards and store reloads renumber chunks
+        return (self.query_key, hashlib.sha1(chunk["text"].encode("utf-8")).hexdigest())
+
+    def _top_ids(self):
+        top = sorted(self.scored, key=lambda x: x["rerank_score"], reverse=True)[:self.top_n]
+        return {id(c) for c in top}
+
+    def next_batch(self):
+        """
+        Returns the uncached chunks of the next batch (cached ones are scored in place),
+        or None when reranking is done.
+        """
+        while self.position < len(self.candidates):
+            # Always score at least top_n candidates before judging stability
+            size = max(self.batch_size, self.top_n - len(self.scored))
+            batch = self.candidates[self.position:self.position + size]
+            self.position += len(batch)
+
+            self.before = self._top_ids() if len(self.scored) >= self.top_n else None
+            pending = []
+            for c in batch:
+                score = score_cache.get(self._key(c))
+                if score is None:
+                    pending.append(c)
+                else:
+                    c["rerank_score"] = score
+                    self.scored.append(c)
+                    _count("pairs_cached")
+
+            if pending:
+                return pending
+            if self._batch_done():
+                return None
+        return None
+
+    def feed(self, chunks, scores):
+        for c, s in zip(chunks, scores):
+            c["rerank_score"] = float(s)
+            score_cache.put(self._key(c), c["rerank_score"])
+            self.scored.append(c)
+        _count("pairs_scored", len(chunks))
+
+    def _batch_done(self):
+        """
+        Called once per completed batch: counts consecutive batches that left
+        the top_n unchanged and stops the cascade after `stable_batches` of them.
+        """
+        if self.before is not None and self._top_ids() == self.before:
+            self.stable_runs += 1
+        else:
+            self.stable_runs = 0
+
+        if self.stable_runs >= self.stable_batches:
+            if self.position < len(self.candidates):
+                _count("early_exit")
+            self.position = len(self.candidates)
+            return True
+        return False
+
+    def done(self):
+        return self._batch_done() or self.position >= len(self.candidates)
+
+    def result(self):
+        return sorted(self.scored, key=lambda x: x["rerank_score"], reverse=True)[:self.top_n]
+
+
+def adaptive_rerank(query, chunks, top_n=5, margin=DENSE_MARGIN, batch_size=CASCADE_BATCH, stable_batches=STABLE_BATCHES):
+    cascade = _Cascade(query, chunks, top_n, margin, batch_size, stable_batches)
+    while True:
+        pending = cascade.next_batch()
+        if pending is None:
+            break
+        scores = get_reranker().predict([(query, c["text"]) for c in pending])
+        cascade.feed(pending, scores)
+        if cascade.done():
+            break
+    return cascade.result()
+
+
+async def aadaptive_rerank(query, chunks, top_n=5, margin=DENSE_MARGIN, batch_size=CASCADE_BATCH, stable_batches=STABLE_BATCHES):
+    cascade = _Cascade(query, chunks, top_n, margin, batch_size, stable_batches)
+    while True:
+        pending = cascade.next_batch()
+        if pending is None:
+            break
+        scores = await get_rerank_batcher().asubmit_many([(query, c["text"]) for c in pending])
+        cascade.feed(pending, scores)
+        if cascade.done():
+            break
+    return cascade.result()
+
+
+def rerank_stats():
+    with _stats_lock:
+        stats = dict(adaptive_stats)
+    return {**stats, "score_cache": score_cache.stats()}
@@ -0,0 +1,248 @@
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+# BM25 is only needed for hybrid retrieval: stores build, maintain and load
+# it only when this mode is on
+LEXICAL_ENABLED = os.getenv("RAG_RETRIEVAL_MODE", "dense") == "hybrid"
+
+# Files written next to index.faiss. Postings are grouped by term; terms are
+# looked up by a 64-bit hash in a sorted array, so nothing is decoded or
+# materialized per term at load time
+BM25_META_FILE = "bm25.json"
+TERMS_FILE = "bm25.terms.npy"                # sorted uint64 term hashes
+POSTINGS_OFFSETS_FILE = "bm25.post.off.npy"  # (n_terms + 1) offsets into the posting columns
+POSTINGS_IDS_FILE = "bm25.post.ids.npy"      # int64 doc ids
+POSTINGS_TF_FILE = "bm25.post.tf.npy"        # int32 term frequencies
+DOC_IDS_FILE = "bm25.docs.ids.npy"           # sorted int64 doc ids
+DOC_LEN_FILE = "bm25.docs.len.npy"           # int32 doc lengths
+COLUMN_FILES = (TERMS_FILE, POSTINGS_OFFSETS_FILE, POSTINGS_IDS_FILE, POSTINGS_TF_FILE, DOC_IDS_FILE, DOC_LEN_FILE)
+LEGACY_FILE = "bm25.pkl"
+
+# Keeps clause numbers ("4.2.1"), dates and hyphenated acronyms as single terms
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.\-/][a-z0-9]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def term_hash(term: str) -> int:
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class BM25Index:
+    """
+    Inverted index with Okapi BM25 scoring over chunk ids.
+    Maintained alongside the FAISS index so ids line up with vector ids.
+
+    Saved postings are memory-mapped numpy columns. Documents added or removed
+    since the last save live in a small in-memory overlay (like ChunkStore)
+    that is compacted into fresh columns on save().
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+
+        self._terms = np.empty(0, dtype="uint64")
+        self._post_off = np.zeros(1, dtype="int64")
+        self._post_ids = np.empty(0, dtype="int64")
+        self._post_tf = np.empty(0, dtype="int32")
+        self._doc_ids = np.empty(0, dtype="int64")
+        self._doc_len = np.empty(0, dtype="int32")
+
+        # Overlay: term hash -> {doc id: tf}, doc id -> length
+        self._added: Dict[int, Dict[int, int]] = defaultdict(dict)
+        self._added_len: Dict[int, int] = {}
+        self._deleted: Set[int] = set()
+        self.total_len = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_ids) - len(self._deleted) + len(self._added_len)
+
+    def _base_row(self, doc_id: int) -> int:
+        pos = int(np.searchsorted(self._doc_ids, doc_id))
+        if pos < len(self._doc_ids) and self._doc_ids[pos] == doc_id:
+            return pos
+        return -1
+
+    def add(self, doc_id: int, text: str):
+        tokens = tokenize(text)
+        for term, tf in Counter(tokens).items():
+            self._added[term_hash(term)][doc_id] = tf
+        self._added_len[doc_id] = len(tokens)
+        self.total_len += len(tokens)
+
+    def remove(self, doc_id: int, text: str):
+        if doc_id in self._added_len:
+            for term in set(tokenize(text)):
+                h = term_hash(term)
+                docs = self._added.get(h)
+                if docs is not None:
+                    docs.pop(doc_id, None)
+                    if not docs:
+                        del self._added[h]
+            self.total_len -= self._added_len.pop(doc_id)
+            return
+
+        row = self._base_row(doc_id)
+        if row >= 0 and doc_id not in self._deleted:
+            self._deleted.add(doc_id)
+            self.total_len -= int(self._doc_len[row])
+
+    def _base_postings(self, h: int):
+        pos = int(np.searchsorted(self._terms, np.uint64(h)))
+        if pos >= len(self._terms) or int(self._terms[pos]) != h:
+            return None, None
+        start, end = int(self._post_off[pos]), int(self._post_off[pos + 1])
+        ids = np.asarray(self._post_ids[start:end])
+        tfs = np.asarray(self._post_tf[start:end])
+        if self._deleted:
+            keep = ~np.isin(ids, np.fromiter(self._deleted, dtype="int64", count=len(self._deleted)))
+            ids, tfs = ids[keep], tfs[keep]
+        return ids, tfs
+
+    def search(self, query: str, top_k: int = 10, allowed: np.ndarray = None) -> List[Tuple[int, float]]:
+        """
+        `allowed` restricts scoring to a sorted array of chunk ids (metadata filters).
+        """
+        n_docs = len(self)
+        if not n_docs:
+            return []
+
+        avg_len = self.total_len / n_docs
+        allowed_ids = np.asarray(allowed, dtype="int64") if allowed is not None else None
+        scores: Dict[int, float] = defaultdict(float)
+
+        for term in set(tokenize(query)):
+            h = term_hash(term)
+            ids, tfs = self._base_postings(h)
+            overlay = self._added.get(h, {})
+            df = (len(ids) if ids is not None else 0) + len(overlay)
+            if not df:
+                continue
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+            if ids is not None and len(ids):
+                if allowed_ids is not None:
+                    keep = np.isin(ids, allowed_ids)
+                    ids, tfs = ids[keep], tfs[keep]
+                lens = self._doc_len[np.searchsorted(self._doc_ids, ids)]
+                norm = self.k1 * (1 - self.b + self.b * lens / avg_len)
+                term_scores = idf * tfs * (self.k1 + 1) / (tfs + norm)
+                for doc_id, score in zip(ids.tolist(), term_scores.tolist()):
+                    scores[doc_id] += score
+
+            if allowed_ids is not None and overlay:
+                overlay_ids = np.fromiter(overlay, dtype="int64", count=len(overlay))
+                overlay = {
+                    doc_id: overlay[doc_id]
+                    for doc_id in overlay_ids[np.isin(overlay_ids, allowed_ids)].tolist()
+                }
+            for doc_id, tf in overlay.items():
+                norm = self.k1 * (1 - self.b + self.b * self._added_len[doc_id] / avg_len)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        return heapq.nlargest(top_k, scores.items(), key=lambda x: x[1])
+
+    def save(self, path: str):
+        """
+        Compacts the saved columns and the overlay into fresh files.
+        """
+        os.makedirs(path, exist_ok=True)
+
+        # Saved postings minus deletions, regrouped with the overlay by term
+        postings: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        base_ids = np.asarray(self._post_ids)
+        base_tfs = np.asarray(self._post_tf)
+        keep = None
+        if self._deleted:
+            keep = ~np.isin(base_ids, np.fromiter(self._deleted, dtype="int64", count=len(self._deleted)))
+        offsets = np.asarray(self._post_off).tolist()
+        for pos, h in enumerate(self._terms.tolist()):
+            start, end = offsets[pos], offsets[pos + 1]
+            ids, tfs = base_ids[start:end], base_tfs[start:end]
+            if keep is not None:
+                ids, tfs = ids[keep[start:end]], tfs[keep[start:end]]
+            if len(ids):
+                postings[h] = (ids, tfs)
+        for h, docs in self._added.items():
+            extra_ids = np.fromiter(docs.keys(), dtype="int64", count=len(docs))
+            extra_tfs = np.fromiter(docs.values(), dtype="int32", count=len(docs))
+            if h in postings:
+                ids, tfs = postings[h]
+                postings[h] = (np.concatenate([ids, extra_ids]), np.concatenate([tfs, extra_tfs]))
+            else:
+                postings[h] = (extra_ids, extra_tfs)
+
+        terms = np.array(sorted(postings), dtype="uint64")
+        lists = [postings[int(h)] for h in terms]
+        offsets = np.zeros(len(lists) + 1, dtype="int64")
+        np.cumsum([len(ids) for ids, _ in lists], out=offsets[1:])
+
+        doc_ids = np.asarray(self._doc_ids)
+        doc_len = np.asarray(self._doc_len)
+        if self._deleted:
+            keep = ~np.isin(doc_ids, np.fromiter(self._deleted, dtype="int64", count=len(self._deleted)))
+            doc_ids, doc_len = doc_ids[keep], doc_len[keep]
+        doc_ids = np.concatenate([doc_ids, np.fromiter(self._added_len.keys(), dtype="int64", count=len(self._added_len))])
+        doc_len = np.concatenate([doc_len, np.fromiter(self._added_len.values(), dtype="int32", count=len(self._added_len))])
+        order = np.argsort(doc_ids, kind="stable")
+
+        columns = {
+            TERMS_FILE: terms,
+            POSTINGS_OFFSETS_FILE: offsets,
+            POSTINGS_IDS_FILE: np.concatenate([ids for ids, _ in lists]) if lists else np.empty(0, dtype="int64"),
+            POSTINGS_TF_FILE: np.concatenate([tfs for _, tfs in lists]) if lists else np.empty(0, dtype="int32"),
+            DOC_IDS_FILE: doc_ids[order],
+            DOC_LEN_FILE: doc_len[order],
+        }
+        for name, arr in columns.items():
+            with open(os.path.join(path, name + ".tmp"), "wb") as f:
+                np.save(f, arr)
+        with open(os.path.join(path, BM25_META_FILE + ".tmp"), "w") as f:
+            json.dump({"k1": self.k1, "b": self.b, "total_len": self.total_len}, f)
+
+        for name in (*columns, BM25_META_FILE):
+            os.replace(os.path.join(path, name + ".tmp"), os.path.join(path, name))
+
+        # Superseded by the column files
+        if os.path.exists(os.path.join(path, LEGACY_FILE)):
+            os.remove(os.path.join(path, LEGACY_FILE))
+
+        # Re-open the compacted columns and drop the overlay
+        fresh = BM25Index.load(path)
+        self.__dict__.update(fresh.__dict__)
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        return os.path.exists(os.path.join(path, BM25_META_FILE))
+
+    @staticmethod
+    def delete(path: str):
+        """Removes a saved index (it goes stale once the store changes without it)."""
+        for name in (BM25_META_FILE, *COLUMN_FILES, LEGACY_FILE):
+            if os.path.exists(os.path.join(path, name)):
+                os.remove(os.path.join(path, name))
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        with open(os.path.join(path, BM25_META_FILE)) as f:
+            meta = json.load(f)
+        index = cls(k1=meta["k1"], b=meta["b"])
+        index.total_len = meta["total_len"]
+        index._terms = np.load(os.path.join(path, TERMS_FILE), mmap_mode="r")
+        index._post_off = np.load(os.path.join(path, POSTINGS_OFFSETS_FILE), mmap_mode="r")
+        index._post_ids = np.load(os.path.join(path, POSTINGS_IDS_FILE), mmap_mode="r")
+        index._post_tf = np.load(os.path.join(path, POSTINGS_TF_FILE), mmap_mode="r")
+        index._doc_ids = np.load(os.path.join(path, DOC_IDS_FILE), mmap_mode="r")
+        index._doc_len = np.load(os.path.join(path, DOC_LEN_FILE), mmap_mode="r")
+        return index
@@ -0,0 +1,63 @@
+import asyncio
+from collections import defaultdict
+from typing import Dict, List
+
+from vectorstore.faiss_store import FaissVectorStore
+from retrieval.retriever import aretrieve, retrieve
+from utils.executor import run_inference
+
+# Standard RRF damping constant (Cormack et al.)
+RRF_K = 60
+
+
+def rrf_fuse(ranked_lists: List[List[int]], k: int = RRF_K) -> List[tuple]:
+    """
+    Reciprocal rank fusion: score(id) = sum over lists of 1 / (k + rank).
+    Returns (id, score) pairs, best first.
+    """
+    scores: Dict[int, float] = defaultdict(float)
+    for ranked in ranked_lists:
+        for rank, doc_id in enumerate(ranked, 1):
+            scores[doc_id] += 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda x: x[1], reverse=True)
+
+
+def fuse_results(store: FaissVectorStore, dense: List[Dict], sparse: List[tuple], top_k: int, k: int = RRF_K):
+    dense_by_id = {c["id"]: c for c in dense}
+    sparse_scores = dict(sparse)
+
+    fused = rrf_fuse([[c["id"] for c in dense], [doc_id for doc_id, _ in sparse]], k=k)
+
+    results = []
+    for doc_id, rrf_score in fused[:top_k]:
+        chunk = dense_by_id.get(doc_id) or store.get(doc_id)
+        if chunk is None:
+            continue
+        results.append({
+            "id": doc_id,
+            "text": chunk["text"],
+            "metadata": chunk["metadata"],
+            "score": rrf_score,
+            "dense_score": dense_by_id[doc_id]["score"] if doc_id in dense_by_id else None,
+            "bm25_score": sparse_scores.get(doc_id)
+        })
+    return results
+
+
+def hybrid_retrieve(query: str, store: FaissVectorStore, top_k: int = 10, candidates: int = 30, filters: Dict = None, **search_kwargs):
+    """
+    Dense (FAISS) + sparse (BM25) retrieval merged with reciprocal rank fusion.
+    Each retriever contributes its top `candidates`; the fused top_k is returned.
+    `filters` (metadata filter expression) applies to both retrievers.
+    """
+    dense = retrieve(query, store, top_k=candidates, filters=filters, **search_kwargs)
+    sparse = store.search_lexical(query, top_k=candidates, filters=filters)
+    return fuse_results(store, dense, sparse, top_k)
+
+
+async def ahybrid_retrieve(query: str, store: FaissVectorStore, top_k: int = 10, candidates: int = 30, query_vector=None, filters: Dict = None, **search_kwargs):
+    dense, sparse = await asyncio.gather(
+        aretrieve(query, store, top_k=candidates, query_vector=query_vector, filters=filters, **search_kwargs),
+        run_inference(store.search_lexical, query, candidates, filters)
+    )
+    return fuse_results(store, dense, sparse, top_k)
@@ -1,21 +1,87 @@
-from sentence_transformers import SentenceTransformer
+import os
+from typing import List
 from vectorstore.faiss_store import FaissVectorStore
-from sentence_transformers import CrossEncoder
-import time
+from vectorstore.sharded_store import ShardedVectorStore
+from embeddings.embedder import encode_texts
+from ingestion.manifest import MANIFEST_FILE
+from utils.batching import MAX_WAIT_MS, QUERY_BATCH_SIZE, MicroBatcher
+from utils.executor import run_inference
+
+# Comma-separated shard numbers this process serves (sharded stores only; default: all)
+LOADED_SHARDS = os.getenv("RAG_SHARDS")
+# Seconds between checks of the store on disk for a newer ingest (long-running processes)
+STORE_RELOAD_CHECK_S = float(os.getenv("RAG_STORE_RELOAD_CHECK_S", "5"))
+
+_batcher = None
 
-# Same embedding model used earlier
-model = SentenceTransformer("all-MiniLM-L6-v2")
-reranker = CrossEncoder("cross-encoder/ms-marco-MiniLM-L-6-v2")
 def load_retriever(path: str):
+    if ShardedVectorStore.exists(path):
+        shards = [int(s) for s in LOADED_SHARDS.split(",")] if LOADED_SHARDS else None
+        return ShardedVectorStore.load(path, shards=shards)
+
     store = FaissVectorStore(dim=384)
     store.load(path)
     return store
 
-def retrieve(query: str, store: FaissVectorStore, top_k: int = 5):
-    query_vector = model.encode(
-        query,
-        normalize_embeddings=True
-    )
+def ingest_stamp(path: str):
+    """
+    Identifies the ingest a store on disk comes from: the manifest is the last
+    file every ingest writes. None if there is no manifest.
+    """
+    try:
+        return os.stat(os.path.join(path, MANIFEST_FILE)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def get_query_batcher() -> MicroBatcher:
+    """
+    Coalesces query encodes from concurrent requests into one encode() call.
+    """
+    global _batcher
+    if _batcher is None:
+        _batcher = MicroBatcher(
+            lambda queries: list(encode_texts(queries, batch_size=len(queries))),
+            max_batch_size=QUERY_BATCH_SIZE,
+            max_wait_ms=MAX_WAIT_MS,
+            name="query_encode"
+        )
+    return _batcher
+
+def retrieve(query: str, store: FaissVectorStore, top_k: int = 5, **search_kwargs):
+    """
+    `search_kwargs` are forwarded to the store (e.g. nprobe / ef_search for ANN
+    indexes, or `filters` for a metadata filter expression).
+    """
+    # Repeated questions are served from the embedding cache
+    query_vector = encode_texts([query])[0]
+
+    results = store.search(query_vector, top_k=top_k, **search_kwargs)
+    return results
+
+
+def retrieve_batch(queries: List[str], store: FaissVectorStore, top_k: int = 5, batch_size: int = 64, **search_kwargs):
+    """
+    Encodes all queries in one model call and searches them in one index call.
+    Returns one result list per query, in input order.
+    """
+    if not queries:
+        return []
+
+    query_vectors = encode_texts(queries, batch_size=batch_size)
+
+    return store.search_batch(query_vectors, top_k=top_k, **search_kwargs)
+
+
+async def aencode_query(query: str):
+    return await get_query_batcher().asubmit(query)
+
 
-    results = store.search(query_vector, top_k=top_k)
-    return results
\ No newline at end of file
+async def aretrieve(query: str, store: FaissVectorStore, top_k: int = 5, query_vector=None, **search_kwargs):
+    """
+    Async retrieve for the API: the query is encoded through the micro-batcher
+    (unless `query_vector` is already known) and the index search runs on the
+    inference executor.
+    """
+    if query_vector is None:
+        query_vector = await aencode_query(query)
+    return await run_inference(store.search, query_vector, top_k=top_k, **search_kwargs)
@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+try:
+    from chunking import chunker
+except Exception as e:  # the tokenizer's encoding files are downloaded on first use
+    pytest.skip(f"tokenizer unavailable: {e}", allow_module_level=True)
+
+WORDS = ["employee", "leave", "policy", "manager", "approval", "salary", "notice", "period", "travel", "claim"]
+
+
+def paragraph(rng, n_sentences, sentence_words):
+    sentences = [" ".join(rng.choice(WORDS) for _ in range(sentence_words)).capitalize() + "." for _ in range(n_sentences)]
+    return " ".join(sentences)
+
+
+def corpus():
+    rng = random.Random(7)
+    docs = []
+    for i in range(40):
+        if i % 4 == 0:
+            # One long sentence: only a token window of it fits into the overlap.
+            # Units stay well below max_tokens, so the overlap is never capped by it
+            text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(50, 80)))
+        else:
+            text = paragraph(rng, rng.randint(2, 6), rng.randint(8, 20))
+        docs.append({"text": text, "metadata": {"source": "policy.pdf", "page_number": i}})
+    return docs
+
+
+def shared_tail(prev: str, nxt: str) -> str:
+    for size in range(min(len(prev), len(nxt)), 0, -1):
+        if prev.endswith(nxt[:size]):
+            return nxt[:size]
+    return ""
+
+
+@pytest.mark.parametrize("overlap", [20, 40])
+def test_every_chunk_boundary_overlaps(overlap):
+    chunks = chunker.chunk_documents(corpus(), max_tokens=200, min_tokens=40, overlap_tokens=overlap)
+    assert len(chunks) > 5
+
+    for prev, nxt in zip(chunks, chunks[1:]):
+        carried = shared_tail(prev["text"], nxt["text"]).strip()
+        assert chunker.token_len(carried) >= overlap // 2
+        assert chunker.token_len(nxt["text"]) <= 200
+
+
+def test_no_overlap_by_default():
+    chunks = chunker.chunk_documents(corpus(), max_tokens=200, min_tokens=40, overlap_tokens=0)
+    text = " ".join(c["text"] for c in chunks)
+    assert text == " ".join(d["text"] for d in corpus())
@@ -0,0 +1,22 @@
+import numpy as np
+
+from evaluation import faithfulness as faith
+
+# Unit vectors: sentence -> embedding
+VECTORS = {
+    "Employees get 20 days of annual leave.": [1.0, 0.0, 0.0],
+    "Leave requests need manager approval.": [0.6, 0.8, 0.0],
+    "The cafeteria opens at 8am.": [0.0, 0.0, 1.0],
+}
+
+
+def test_score_is_the_share_of_supported_sentences(monkeypatch):
+    monkeypatch.setattr(faith, "encode_texts", lambda texts: np.array([VECTORS[t] for t in texts], dtype="float32"))
+    chunk_vectors = np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]], dtype="float32")
+
+    result = faith.faithfulness(" ".join(VECTORS), "- leave policy", chunk_vectors)
+
+    assert [s["supported"] for s in result["sentence_scores"]] == [True, True, False]
+    assert result["faithfulness_score"] == 0.67
+    assert faith.MEDIUM_CONFIDENCE <= result["faithfulness_score"] < faith.HIGH_CONFIDENCE
+    assert result["answerable"]
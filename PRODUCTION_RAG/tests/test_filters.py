@@ -0,0 +1,90 @@
+import os
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from vectorstore.metadata_index import MetadataIndex, validate_filters
+
+
+@pytest.fixture
+def index():
+    index = MetadataIndex()
+    index.add(0, {"department": "hr", "page_number": 3})
+    index.add(1, {"department": "finance", "page_number": 12})
+    return index
+
+
+@pytest.mark.parametrize("filters", [
+    {"department": {"$regex": "h.*"}},
+    {"$nor": [{"department": "hr"}]},
+    {"department": ["hr", "finance"]},
+    {"department": {"$eq": ["hr"]}},
+    {"department": {"$in": "hr"}},
+    {"$or": {"department": "hr"}},
+])
+def test_invalid_filters_are_rejected(filters):
+    with pytest.raises(ValueError):
+        validate_filters(filters)
+
+
+def test_valid_filters_pass(index):
+    filters = {"$or": [{"department": "hr"}, {"page_number": {"$gte": 10, "$lte": 20}}], "department": {"$nin": ["legal"]}}
+    validate_filters(filters)
+    assert index.select(filters).tolist() == [0, 1]
+
+
+FILTERS = [
+    {"department": "hr"},
+    {"tags": "leave"},
+    {"page_number": {"$gte": 10}},
+    {"department": {"$ne": "hr"}},
+    {"department": {"$nin": ["hr", "legal"]}},
+    {"$or": [{"department": "legal"}, {"page_number": {"$lt": 5}}]},
+]
+
+
+def test_saved_index_is_memory_mapped_and_keeps_overlay_edits(tmp_path):
+    index = MetadataIndex()
+    for i in range(6):
+        index.add(i, {"department": ["hr", "finance", "legal"][i % 3], "page_number": i * 4, "tags": ["leave", "pay"][:i % 2 + 1]})
+    expected = {str(f): index.select(f).tolist() for f in FILTERS}
+    index.save(str(tmp_path))
+
+    loaded = MetadataIndex.load(str(tmp_path))
+    assert isinstance(loaded._post_ids, np.memmap)
+    assert {str(f): loaded.select(f).tolist() for f in FILTERS} == expected
+
+    # Overlay on top of the mapped columns: removal, metadata update, new chunk
+    loaded.remove(0, {"department": "hr", "page_number": 0, "tags": ["leave"]})
+    loaded.remove(4, {"department": "finance", "page_number": 16, "tags": ["leave"]})
+    loaded.add(4, {"department": "legal", "page_number": 16, "tags": ["pay"]})
+    loaded.add(9, {"department": "hr", "page_number": 2, "tags": ["leave"]})
+    assert loaded.select({"department": "hr"}).tolist() == [3, 9]
+    assert loaded.select({"department": "legal"}).tolist() == [2, 4, 5]
+    assert loaded.select({"tags": "leave"}).tolist() == [1, 2, 3, 5, 9]
+    assert loaded.select({"$or": [{"department": "legal"}, {"page_number": {"$lt": 5}}]}).tolist() == [1, 2, 4, 5, 9]
+
+    edited = {str(f): loaded.select(f).tolist() for f in FILTERS}
+    loaded.save(str(tmp_path))
+    assert {str(f): MetadataIndex.load(str(tmp_path)).select(f).tolist() for f in FILTERS} == edited
+
+
+@pytest.fixture(scope="module")
+def client():
+    os.environ.setdefault("GROQ_API_KEY", "test")
+    api = pytest.importorskip("api.main")
+    return TestClient(api.app)
+
+
+@pytest.mark.parametrize("endpoint", ["/ask", "/ask/stream"])
+def test_unknown_operator_is_a_400(client, endpoint):
+    response = client.post(endpoint, json={"question": "leave?", "filters": {"department": {"$regex": "h.*"}}})
+    assert response.status_code == 400
+    assert "$regex" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("endpoint", ["/ask", "/ask/stream"])
+def test_list_valued_equality_is_a_400(client, endpoint):
+    response = client.post(endpoint, json={"question": "leave?", "filters": {"department": ["hr", "finance"]}})
+    assert response.status_code == 400
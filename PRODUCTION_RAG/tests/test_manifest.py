@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from ingestion.manifest import pdf_sources
+
+
+def touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"%PDF-1.4 " + str(path).encode())
+    return path
+
+
+def test_same_file_name_in_different_folders_gets_distinct_sources(tmp_path):
+    hr = touch(tmp_path / "corpus" / "hr" / "policy.pdf")
+    finance = touch(tmp_path / "corpus" / "finance" / "policy.pdf")
+
+    sources = pdf_sources([str(tmp_path / "corpus")])
+
+    assert sources == {"finance/policy.pdf": str(finance), "hr/policy.pdf": str(hr)}
+
+
+def test_files_given_directly_are_keyed_by_name(tmp_path):
+    pdf = touch(tmp_path / "policies_p.pdf")
+    assert pdf_sources([str(pdf), str(pdf)]) == {"policies_p.pdf": str(pdf)}
+
+
+def test_colliding_sources_are_rejected(tmp_path):
+    a = touch(tmp_path / "a" / "policy.pdf")
+    b = touch(tmp_path / "b" / "policy.pdf")
+
+    with pytest.raises(ValueError, match="policy.pdf"):
+        pdf_sources([str(a), str(b)])
+
+
+def test_incremental_ingest_keeps_both_colliding_names(tmp_path, monkeypatch):
+    pytest.importorskip("unstructured")
+    from ingestion import incremental
+
+    def fake_documents(pdf_paths, workers=1, sources=None):
+        for pdf_path, source in zip(pdf_paths, sources):
+            yield {"text": f"Clause text of {source}. " * 20, "metadata": {"source": source, "page_number": 1}}
+
+    monkeypatch.setattr(incremental, "iter_documents", fake_documents)
+    monkeypatch.setattr(
+        incremental, "encode_texts",
+        lambda texts, **kwargs: np.ones((len(texts), incremental.EMBEDDING_DIM), dtype="float32")
+    )
+
+    touch(tmp_path / "corpus" / "hr" / "policy.pdf")
+    touch(tmp_path / "corpus" / "finance" / "policy.pdf")
+    store_path = str(tmp_path / "store")
+
+    first = incremental.ingest_incremental([str(tmp_path / "corpus")], store_path, rebuild=True)
+    second = incremental.ingest_incremental([str(tmp_path / "corpus")], store_path)
+
+    assert first["documents_updated"] == 2
+    assert second["documents_skipped"] == 2 and second["documents_removed"] == 0
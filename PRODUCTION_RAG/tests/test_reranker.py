@@ -0,0 +1,86 @@
+import importlib
+
+import pytest
+
+from reranking import reranker
+
+
+class FakeCrossEncoder:
+    """Scores a pair by looking up the chunk text."""
+
+    def __init__(self, scores):
+        self.scores = scores
+        self.calls = 0
+
+    def predict(self, pairs, **kwargs):
+        self.calls += 1
+        return [self.scores[text] for _, text in pairs]
+
+
+@pytest.fixture
+def chunks():
+    # First-stage order c0..c9; c4 is the best chunk but arrives in the third batch
+    scores = {f"c{i}": 1.0 for i in range(10)}
+    scores.update({"c0": 10.0, "c1": 9.0, "c4": 20.0})
+    return scores, [{"id": i, "text": f"c{i}"} for i in range(10)]
+
+
+def test_full_rerank_is_the_default(monkeypatch, chunks):
+    monkeypatch.delenv("RAG_RERANK_MODE", raising=False)
+    importlib.reload(reranker)
+    scores, candidates = chunks
+    encoder = FakeCrossEncoder(scores)
+    monkeypatch.setattr(reranker, "get_reranker", lambda: encoder)
+
+    # Dense scores separate the top 2 by a wide margin: adaptive mode would stop there
+    for i, c in enumerate(candidates):
+        c["score"] = 1.0 if i < 2 else 0.1
+    top = reranker.rerank("query default mode", candidates, top_n=2)
+
+    assert [c["text"] for c in top] == ["c4", "c0"]
+    assert encoder.calls == 1
+    assert reranker.rerank_stats()["requests"] == 0
+
+
+def test_score_cache_is_keyed_by_chunk_text(monkeypatch):
+    encoder = FakeCrossEncoder({"old text": 1.0, "new text": 5.0, "other": 0.0})
+    monkeypatch.setattr(reranker, "get_reranker", lambda: encoder)
+    query = "query after reload"
+
+    reranker.adaptive_rerank(query, [{"id": 0, "text": "old text"}, {"id": 1, "text": "other"}], top_n=1)
+    # Same ids after a rebuild, different chunks behind them
+    top = reranker.adaptive_rerank(query, [{"id": 0, "text": "new text"}, {"id": 1, "text": "other"}], top_n=1)
+
+    assert top[0]["text"] == "new text"
+    assert top[0]["rerank_score"] == 5.0
+
+
+@pytest.mark.parametrize("stable_batches, expected_top", [
+    (1, ["c0", "c1"]),  # stops after the first unchanged batch and misses c4
+    (2, ["c4", "c0"]),
+])
+def test_cascade_requires_consecutive_stable_batches(monkeypatch, chunks, stable_batches, expected_top):
+    scores, candidates = chunks
+    monkeypatch.setattr(reranker, "get_reranker", lambda: FakeCrossEncoder(scores))
+
+    top = reranker.adaptive_rerank(
+        f"query stable={stable_batches}", candidates, top_n=2, margin=float("inf"),
+        batch_size=2, stable_batches=stable_batches
+    )
+
+    assert [c["text"] for c in top] == expected_top
+
+
+def test_cascade_stops_early_once_stable(monkeypatch):
+    scores = {f"c{i}": 10.0 - i for i in range(20)}
+    encoder = FakeCrossEncoder(scores)
+    monkeypatch.setattr(reranker, "get_reranker", lambda: encoder)
+    candidates = [{"id": i, "text": f"c{i}"} for i in range(20)]
+
+    top = reranker.adaptive_rerank(
+        "query early exit", candidates, top_n=2, margin=float("inf"), batch_size=2, stable_batches=2
+    )
+
+    assert [c["text"] for c in top] == ["c0", "c1"]
+    # Initial batch plus two stable batches
+    assert encoder.calls == 3
@@ -0,0 +1,63 @@
+import asyncio
+import importlib
+import os
+
+import numpy as np
+import pytest
+
+from utils import semantic_cache
+from utils.semantic_cache import SemanticCache
+
+
+def test_cache_is_dropped_when_the_store_key_changes():
+    cache = SemanticCache(dim=4, threshold=0.9)
+    vector = np.array([1, 0, 0, 0], dtype="float32")
+    cache.put("q", vector, {"answer": "a", "metrics": {}}, (0, 1))
+
+    assert cache.lookup(vector, (0, 1))["answer"] == "a"
+    # Reloaded store reporting the same version
+    assert cache.lookup(vector, (1, 1)) is None
+
+
+def test_semantic_cache_is_opt_in(monkeypatch):
+    monkeypatch.delenv("RAG_SEMANTIC_CACHE", raising=False)
+    assert not importlib.reload(semantic_cache).CACHE_ENABLED
+
+
+def test_cached_responses_are_marked():
+    cache = SemanticCache(dim=4, threshold=0.9)
+    cache.put("leave for 3 years?", np.array([1, 0, 0, 0], dtype="float32"), {"answer": "a", "metrics": {}}, 1)
+
+    paraphrase = np.array([1, 0.1, 0, 0], dtype="float32")
+    hit = cache.lookup(paraphrase / np.linalg.norm(paraphrase), 1)
+
+    assert hit["cached"] is True
+    assert hit["cached_question"] == "leave for 3 years?"
+    assert 0.9 <= hit["cache_similarity"] < 1.0
+
+
+@pytest.fixture
+def api(monkeypatch):
+    os.environ.setdefault("GROQ_API_KEY", "test")
+    api = pytest.importorskip("api.main")
+    for name in ("store", "store_stamp", "store_generation", "_next_reload_check"):
+        monkeypatch.setattr(api, name, getattr(api, name))
+    return api
+
+
+def test_api_reloads_the_store_after_an_ingest(api, monkeypatch):
+    new_store = object()
+    monkeypatch.setattr(api, "load_retriever", lambda path: new_store)
+    vector = np.ones(api.store.dim, dtype="float32")
+    api.semantic_cache.put("q", vector, {"answer": "old", "metrics": {}}, api.store_key(api.store))
+
+    # Nothing ingested since startup
+    assert not asyncio.run(api.reload_store())
+    assert api.store is not new_store
+
+    monkeypatch.setattr(api, "ingest_stamp", lambda path: "new ingest")
+    monkeypatch.setattr(api, "_next_reload_check", 0.0)
+    assert asyncio.run(api.reload_store())
+    assert api.store is new_store
+    assert api.store_generation == 1
+    assert not api.semantic_cache.entries
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def api(monkeypatch):
+    os.environ.setdefault("GROQ_API_KEY", "test")
+    api = pytest.importorskip("api.main")
+
+    async def cache_lookup(question, cache_key, filters=None):
+        return [0.0] * api.store.dim, None
+
+    async def retrieve_and_rerank(question, store, query_vector=None, filters=None):
+        return [], {"retrieval_time_ms": 0.0, "rerank_time_ms": 0.0}
+
+    monkeypatch.setattr(api, "cache_lookup", cache_lookup)
+    monkeypatch.setattr(api, "retrieve_and_rerank", retrieve_and_rerank)
+    return api
+
+
+def events(response):
+    return [block.split("\n")[0].removeprefix("event: ") for block in response.text.strip().split("\n\n")]
+
+
+def ask_stream(api):
+    response = TestClient(api.app).post("/ask/stream", json={"question": "leave?"})
+    assert response.status_code == 200
+    return response
+
+
+def test_generation_failure_ends_with_error_and_done(api, monkeypatch):
+    async def failing_stream(prompt):
+        yield "Partial"
+        raise RuntimeError("LLM connection reset")
+
+    monkeypatch.setattr(api, "agenerate_stream", failing_stream)
+    response = ask_stream(api)
+
+    assert events(response) == ["sources", "token", "error", "done"]
+    assert "Generation failed: LLM connection reset" in response.text
+    assert '"answer": "Partial"' in response.text
+
+
+def test_retrieval_failure_ends_with_error_and_done(api, monkeypatch):
+    async def failing_retrieval(question, store, query_vector=None, filters=None):
+        raise RuntimeError("reranker out of memory")
+
+    monkeypatch.setattr(api, "retrieve_and_rerank", failing_retrieval)
+    response = ask_stream(api)
+
+    assert events(response) == ["error", "done"]
+    assert "Retrieval failed: reranker out of memory" in response.text
+
+
+def test_cache_lookup_failure_ends_with_error_and_done(api, monkeypatch):
+    async def failing_lookup(question, cache_key, filters=None):
+        raise RuntimeError("embedder unavailable")
+
+    monkeypatch.setattr(api, "cache_lookup", failing_lookup)
+    response = ask_stream(api)
+
+    assert events(response) == ["error", "done"]
+    assert "Cache lookup failed: embedder unavailable" in response.text
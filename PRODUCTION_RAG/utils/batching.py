@@ -0,0 +1,127 @@
+import asyncio
+import bisect
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List
+
+# Defaults for the query-encode and rerank batchers
+MAX_WAIT_MS = float(os.getenv("RAG_BATCH_MAX_WAIT_MS", "5"))
+QUERY_BATCH_SIZE = int(os.getenv("RAG_QUERY_BATCH_SIZE", "32"))
+RERANK_BATCH_SIZE = int(os.getenv("RAG_RERANK_BATCH_SIZE", "128"))
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (Prometheus style: counts per upper bound).
+    """
+
+    def __init__(self, buckets: List[float]):
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.total += value
+            self.count += 1
+
+    def snapshot(self):
+        with self._lock:
+            labels = [str(b) for b in self.buckets] + ["+Inf"]
+            return {
+                "buckets": dict(zip(labels, self.counts)),
+                "count": self.count,
+                "mean": round(self.total / self.count, 3) if self.count else 0.0
+            }
+
+
+class MicroBatcher:
+    """
+    Coalesces single-item requests from many concurrent callers into one
+    call of `batch_fn(items) -> results`.
+
+    A background thread takes the first queued item, then keeps collecting
+    until `max_batch_size` items are pending or `max_wait_ms` has passed,
+    runs one batched forward pass and resolves each caller's future.
+    """
+
+    def __init__(self, batch_fn: Callable[[List], List], max_batch_size: int = 32, max_wait_ms: float = 5.0, name: str = "batcher"):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.name = name
+
+        self.batch_sizes = Histogram([1, 2, 4, 8, 16, 32, 64, 128, 256])
+        self.queue_wait_ms = Histogram([0.5, 1, 2, 5, 10, 20, 50, 100, 250, 1000])
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item) -> Future:
+        future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def submit_many(self, items: List) -> List[Future]:
+        return [self.submit(item) for item in items]
+
+    async def asubmit_many(self, items: List) -> List:
+        futures = [asyncio.wrap_future(f) for f in self.submit_many(items)]
+        return list(await asyncio.gather(*futures))
+
+    async def asubmit(self, item):
+        return await asyncio.wrap_future(self.submit(item))
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        while True:
+            # Drop items whose caller went away (e.g. client disconnected)
+            batch = [b for b in self._collect() if b[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            started = time.perf_counter()
+
+            self.batch_sizes.observe(len(batch))
+            for _, _, enqueued in batch:
+                self.queue_wait_ms.observe((started - enqueued) * 1000)
+
+            try:
+                results = self.batch_fn([item for item, _, _ in batch])
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+
+    def stats(self):
+        return {
+            "name": self.name,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queue_depth": self._queue.qsize(),
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot()
+        }
@@ -0,0 +1,23 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+# Bounded pool for CPU-bound model inference (encode / rerank / faithfulness).
+# torch releases the GIL, so a few threads keep the cores busy without
+# oversubscribing them the way the default 40-thread Starlette pool does.
+INFERENCE_WORKERS = int(os.getenv("RAG_INFERENCE_WORKERS", str(min(8, os.cpu_count() or 1))))
+
+_executor = ThreadPoolExecutor(max_workers=INFERENCE_WORKERS, thread_name_prefix="inference")
+
+
+async def run_inference(fn, *args, **kwargs):
+    """
+    Runs a blocking inference call on the bounded executor without blocking the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(fn, *args, **kwargs))
+
+
+def shutdown():
+    _executor.shutdown(wait=False)
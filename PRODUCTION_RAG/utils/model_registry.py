@@ -0,0 +1,65 @@
+import threading
+
+from utils.onnx_backend import INFERENCE_BACKEND, resolve
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+RERANKER_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+
+# Process-wide cache: every module shares the same model instances
+_models = {}
+_lock = threading.Lock()
+
+
+def _get_or_load(key, loader):
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _lock:
+        # Another thread may have finished loading while we waited
+        if key not in _models:
+            _models[key] = loader()
+        return _models[key]
+
+
+def get_embedder(name: str = EMBEDDING_MODEL, backend: str = None):
+    """
+    Shared SentenceTransformer, loaded on first use.
+    `backend` defaults to RAG_INFERENCE_BACKEND (torch / onnx / onnx-int8).
+    """
+    backend = backend or INFERENCE_BACKEND
+
+    def load():
+        from sentence_transformers import SentenceTransformer
+        path, kwargs = resolve(name, "embedder", backend)
+        return SentenceTransformer(path, **kwargs)
+
+    return _get_or_load(("embedder", name, backend), load)
+
+
+def get_reranker(name: str = RERANKER_MODEL, backend: str = None):
+    """
+    Shared CrossEncoder, loaded on first use.
+    `backend` defaults to RAG_INFERENCE_BACKEND (torch / onnx / onnx-int8).
+    """
+    backend = backend or INFERENCE_BACKEND
+
+    def load():
+        from sentence_transformers import CrossEncoder
+        path, kwargs = resolve(name, "reranker", backend)
+        return CrossEncoder(path, **kwargs)
+
+    return _get_or_load(("reranker", name, backend), load)
+
+
+def warmup():
+    """
+    Loads all models and runs one tiny forward pass so the first
+    request does not pay for weight loading or lazy kernel init.
+    """
+    get_embedder().encode(["warmup"], normalize_embeddings=True)
+    get_reranker().predict([("warmup", "warmup")])
+
+
+def loaded_models():
+    return sorted(f"{kind}:{name}@{backend}" for kind, name, backend in _models)
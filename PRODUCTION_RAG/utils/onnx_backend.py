@@ -0,0 +1,82 @@
+import os
+import threading
+
+# "torch" (eager fp32), "onnx" (onnxruntime fp32) or "onnx-int8" (dynamic int8 quantization)
+INFERENCE_BACKEND = os.getenv("RAG_INFERENCE_BACKEND", "torch")
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+# onnxruntime quantization preset: arm64, avx2, avx512 or avx512_vnni
+QUANT_CONFIG = os.getenv("RAG_ONNX_QUANT_CONFIG", "avx2")
+
+EXPORT_DIR = os.getenv(
+    "RAG_ONNX_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "onnx")
+)
+
+_export_lock = threading.Lock()
+
+
+def _require_onnx(backend: str):
+    # Optional dependency (requirements-onnx.txt), only needed by the onnx backends
+    try:
+        import optimum.onnxruntime  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            f"The {backend} inference backend needs optimum[onnxruntime]: "
+            "pip install -r requirements-onnx.txt"
+        ) from e
+
+
+def _model_class(kind: str):
+    from sentence_transformers import CrossEncoder, SentenceTransformer
+    return SentenceTransformer if kind == "embedder" else CrossEncoder
+
+
+def quantized_file_name(quant_config: str = QUANT_CONFIG) -> str:
+    return f"onnx/model_qint8_{quant_config}.onnx"
+
+
+def export_dir(name: str) -> str:
+    return os.path.join(EXPORT_DIR, name.replace("/", "__"))
+
+
+def export_onnx(name: str, kind: str, quantize: bool = False, quant_config: str = QUANT_CONFIG) -> str:
+    """
+    Exports `name` to ONNX (once) under RAG_ONNX_DIR and optionally writes a
+    dynamically int8-quantized copy next to it. Returns the local model dir.
+    """
+    target = export_dir(name)
+
+    with _export_lock:
+        if not os.path.exists(os.path.join(target, "onnx", "model.onnx")):
+            # backend="onnx" converts the Hugging Face weights on load
+            model = _model_class(kind)(name, backend="onnx")
+            model.save_pretrained(target)
+
+        if quantize and not os.path.exists(os.path.join(target, quantized_file_name(quant_config))):
+            from sentence_transformers import export_dynamic_quantized_onnx_model
+
+            model = _model_class(kind)(target, backend="onnx")
+            export_dynamic_quantized_onnx_model(model, quant_config, target)
+
+    return target
+
+
+def resolve(name: str, kind: str, backend: str = None):
+    """
+    Returns (model path or name, constructor kwargs) for SentenceTransformer /
+    CrossEncoder under the requested backend.
+    """
+    backend = backend or INFERENCE_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend: {backend}. Expected one of {BACKENDS}")
+
+    if backend == "torch":
+        return name, {}
+
+    _require_onnx(backend)
+    path = export_onnx(name, kind, quantize=backend == "onnx-int8")
+    kwargs = {"backend": "onnx"}
+    if backend == "onnx-int8":
+        kwargs["model_kwargs"] = {"file_name": quantized_file_name()}
+    return path, kwargs
@@ -0,0 +1,132 @@
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import faiss
+import numpy as np
+
+# Opt-in: questions differing only in an entity or a number ("3 years" vs
+# "5 years") can be more similar than the threshold and get the other answer
+CACHE_ENABLED = os.getenv("RAG_SEMANTIC_CACHE", "0") == "1"
+CACHE_THRESHOLD = float(os.getenv("RAG_SEMANTIC_CACHE_THRESHOLD", "0.92"))
+CACHE_TTL_S = float(os.getenv("RAG_SEMANTIC_CACHE_TTL_S", "3600"))
+CACHE_MAX_ENTRIES = int(os.getenv("RAG_SEMANTIC_CACHE_SIZE", "1000"))
+
+# Nearest neighbours checked per lookup, in case the closest ones expired
+LOOKUP_K = 4
+
+
+class SemanticCache:
+    """
+    Response cache keyed by question embedding similarity.
+
+    Past questions live in a small dedicated flat inner-product index.
+    A lookup returns the cached response of the most similar question if
+    cosine similarity >= `threshold` and the entry is younger than `ttl_s`.
+    Entries are evicted LRU beyond `max_entries`, and the whole cache is
+    dropped when the key of the vector store it was built against (its
+    version, or any value identifying the loaded store) changes.
+
+    Cached responses are marked (`cached`, `cache_similarity`, `cached_question`)
+    so callers can tell users the answer was given to another question.
+    """
+
+    def __init__(
+        self,
+        dim: int = 384,
+        threshold: float = CACHE_THRESHOLD,
+        ttl_s: float = CACHE_TTL_S,
+        max_entries: int = CACHE_MAX_ENTRIES
+    ):
+        self.dim = dim
+        self.threshold = threshold
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+
+        self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+        self.entries: "OrderedDict[int, Dict]" = OrderedDict()
+        self.store_version = None
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def _check_version(self, store_version):
+        if store_version != self.store_version:
+            self.index.reset()
+            self.entries.clear()
+            self.store_version = store_version
+
+    def _drop(self, entry_id: int):
+        self.entries.pop(entry_id, None)
+        self.index.remove_ids(np.array([entry_id], dtype="int64"))
+
+    def lookup(self, query_vector, store_version) -> Optional[Dict]:
+        vector = np.asarray(query_vector, dtype="float32").reshape(1, -1)
+        now = time.time()
+
+        with self._lock:
+            self._check_version(store_version)
+
+            if self.index.ntotal:
+                scores, ids = self.index.search(vector, min(LOOKUP_K, self.index.ntotal))
+                for score, entry_id in zip(scores[0].tolist(), ids[0].tolist()):
+                    if entry_id < 0 or score < self.threshold:
+                        break
+                    entry = self.entries[entry_id]
+                    if now - entry["created"] > self.ttl_s:
+                        self._drop(entry_id)
+                        continue
+
+                    self.entries.move_to_end(entry_id)
+                    self.hits += 1
+                    response = copy.deepcopy(entry["response"])
+                    response["cached"] = True
+                    response["cache_similarity"] = round(score, 4)
+                    response["cached_question"] = entry["question"]
+                    response["metrics"]["cache_hit"] = True
+                    response["metrics"]["cache_similarity"] = round(score, 4)
+                    response["metrics"]["cached_question"] = entry["question"]
+                    return response
+
+            self.misses += 1
+            return None
+
+    def put(self, question: str, query_vector, response: Dict, store_version):
+        vector = np.asarray(query_vector, dtype="float32").reshape(1, -1)
+
+        with self._lock:
+            self._check_version(store_version)
+
+            entry_id = self._next_id
+            self._next_id += 1
+            self.index.add_with_ids(vector, np.array([entry_id], dtype="int64"))
+            self.entries[entry_id] = {
+                "question": question,
+                "response": copy.deepcopy(response),
+                "created": time.time()
+            }
+
+            while len(self.entries) > self.max_entries:
+                oldest = next(iter(self.entries))
+                self._drop(oldest)
+
+    def invalidate(self):
+        with self._lock:
+            self.index.reset()
+            self.entries.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "threshold": self.threshold,
+            "ttl_s": self.ttl_s
+        }
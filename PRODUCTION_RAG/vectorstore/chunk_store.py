@@ -0,0 +1,167 @@
+import json
+import mmap
+import os
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Column files written next to index.faiss
+IDS_FILE = "chunks.ids.npy"
+TEXT_FILE = "chunks.text.bin"
+TEXT_OFFSETS_FILE = "chunks.text.off.npy"
+META_FILE = "chunks.meta.bin"
+META_OFFSETS_FILE = "chunks.meta.off.npy"
+
+
+def _map_file(path: str):
+    if os.path.getsize(path) == 0:
+        return b""
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class ChunkStore:
+    """
+    Offset-indexed, memory-mapped storage for chunk text and metadata.
+
+    On disk every column is a flat byte file plus an (N+1) offsets array,
+    rows are sorted by vector id, and nothing is decoded until a row is read.
+    Rows added, removed or edited since the last save live in a small
+    in-memory overlay that is compacted into new column files on save().
+    """
+
+    def __init__(self):
+        self._ids = np.empty(0, dtype="int64")
+        self._text = b""
+        self._text_off = np.zeros(1, dtype="int64")
+        self._meta = b""
+        self._meta_off = np.zeros(1, dtype="int64")
+
+        self._added: Dict[int, Dict] = {}
+        self._deleted = set()
+        self._meta_updates: Dict[int, Dict] = {}
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        return os.path.exists(os.path.join(path, IDS_FILE))
+
+    @classmethod
+    def open(cls, path: str) -> "ChunkStore":
+        store = cls()
+        store._ids = np.load(os.path.join(path, IDS_FILE), mmap_mode="r")
+        store._text_off = np.load(os.path.join(path, TEXT_OFFSETS_FILE), mmap_mode="r")
+        store._meta_off = np.load(os.path.join(path, META_OFFSETS_FILE), mmap_mode="r")
+        store._text = _map_file(os.path.join(path, TEXT_FILE))
+        store._meta = _map_file(os.path.join(path, META_FILE))
+        return store
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def _row(self, vid: int) -> int:
+        pos = int(np.searchsorted(self._ids, vid))
+        if pos < len(self._ids) and self._ids[pos] == vid:
+            return pos
+        return -1
+
+    def get(self, vid: int) -> Optional[Dict]:
+        if vid in self._added:
+            return self._added[vid]
+        if vid in self._deleted:
+            return None
+
+        row = self._row(vid)
+        if row < 0:
+            return None
+
+        text = self._text[self._text_off[row]:self._text_off[row + 1]].decode("utf-8")
+        metadata = self._meta_updates.get(vid)
+        if metadata is None:
+            metadata = json.loads(self._meta[self._meta_off[row]:self._meta_off[row + 1]])
+
+        return {"text": text, "metadata": metadata}
+
+    def __contains__(self, vid: int) -> bool:
+        if vid in self._added:
+            return True
+        return vid not in self._deleted and self._row(vid) >= 0
+
+    def __len__(self) -> int:
+        return len(self._ids) - len(self._deleted) + len(self._added)
+
+    def ids(self) -> np.ndarray:
+        """
+        Live ids in ascending order.
+        """
+        base = np.asarray(self._ids)
+        if self._deleted:
+            base = base[~np.isin(base, np.fromiter(self._deleted, dtype="int64"))]
+        added = np.fromiter(sorted(self._added), dtype="int64", count=len(self._added))
+        return np.concatenate([base, added])
+
+    def rows(self) -> Iterable[tuple]:
+        for vid in self.ids().tolist():
+            doc = self.get(vid)
+            yield vid, doc["text"], doc["metadata"]
+
+    # ------------------------------------------------------------------
+    # Writes (buffered until save)
+    # ------------------------------------------------------------------
+    def add(self, vid: int, text: str, metadata: Dict):
+        self._deleted.discard(vid)
+        self._added[vid] = {"text": text, "metadata": metadata}
+
+    def remove(self, vid: int) -> bool:
+        if self._added.pop(vid, None) is not None:
+            return True
+        if self._row(vid) >= 0 and vid not in self._deleted:
+            self._deleted.add(vid)
+            self._meta_updates.pop(vid, None)
+            return True
+        return False
+
+    def update_metadata(self, vid: int, metadata: Dict):
+        if vid in self._added:
+            self._added[vid]["metadata"] = metadata
+        elif vid in self:
+            self._meta_updates[vid] = metadata
+
+    def save(self, path: str):
+        """
+        Compacts base rows and the overlay into fresh column files.
+        Files are swapped in with os.replace so readers never see partial columns.
+        """
+        os.makedirs(path, exist_ok=True)
+
+        ids: List[int] = []
+        text_off = [0]
+        meta_off = [0]
+
+        text_tmp = os.path.join(path, TEXT_FILE + ".tmp")
+        meta_tmp = os.path.join(path, META_FILE + ".tmp")
+
+        with open(text_tmp, "wb") as text_f, open(meta_tmp, "wb") as meta_f:
+            for vid, text, metadata in self.rows():
+                text_b = text.encode("utf-8")
+                meta_b = json.dumps(metadata, ensure_ascii=False).encode("utf-8")
+                text_f.write(text_b)
+                meta_f.write(meta_b)
+                ids.append(vid)
+                text_off.append(text_off[-1] + len(text_b))
+                meta_off.append(meta_off[-1] + len(meta_b))
+
+        columns = {
+            IDS_FILE: np.array(ids, dtype="int64"),
+            TEXT_OFFSETS_FILE: np.array(text_off, dtype="int64"),
+            META_OFFSETS_FILE: np.array(meta_off, dtype="int64"),
+        }
+        for name, arr in columns.items():
+            with open(os.path.join(path, name + ".tmp"), "wb") as f:
+                np.save(f, arr)
+
+        for name in (TEXT_FILE, META_FILE, *columns):
+            os.replace(os.path.join(path, name + ".tmp"), os.path.join(path, name))
+
+        # Re-open the compacted columns and drop the overlay
+        fresh = ChunkStore.open(path)
+        self.__dict__.update(fresh.__dict__)
@@ -1,46 +1,338 @@
 from typing import List, Dict
 import faiss
 import numpy as np
+import json
 import pickle
 import os
 
+from retrieval.bm25 import LEXICAL_ENABLED, BM25Index
+from vectorstore.chunk_store import ChunkStore
+from vectorstore.metadata_index import MetadataIndex
+from vectorstore.index_factory import (
+    build_index,
+    choose_index_type,
+    detect_index_type,
+    search_params,
+)
+
+# Filters matching at most this many chunks are searched exactly over just those
+# vectors: restrictive selectors hurt HNSW/IVF recall and exact is cheap here
+FILTER_EXACT_MAX = int(os.getenv("RAG_FILTER_EXACT_MAX", "4096"))
+
 class FaissVectorStore:
-    def __init__(self, dim: int):
+    def __init__(self, dim: int, index_type: str = "flat", lexical: bool = None, **index_params):
         self.dim = dim
-        self.index = faiss.IndexFlatIP(dim)  # cosine similarity
-        self.documents = []
+        self.index_type = index_type
+        self.index_params = index_params
+        # Stable int64 ids so chunks can be removed without renumbering
+        self.index = build_index(index_type, dim, **index_params)  # cosine similarity
+        # Text + metadata only; vectors live in the FAISS index
+        self.chunks = ChunkStore()
+        # Lexical index over the same ids, only kept for hybrid retrieval
+        self.lexical = LEXICAL_ENABLED if lexical is None else lexical
+        self.bm25 = BM25Index() if self.lexical else None
+        # field -> value -> ids, for metadata-filtered search
+        self.metadata = MetadataIndex()
+        self.next_id = 0
+        # HNSW graphs cannot delete: removed ids stay in the graph, are excluded
+        # at search time and dropped by compact()
+        self.tombstones = set()
+        self._tombstone_sel = None
+        # Bumped on every mutation so caches built on top can detect changes
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def ids(self) -> np.ndarray:
+        return self.chunks.ids()
+
+    def get_vectors(self, ids: List[int]) -> np.ndarray:
+        """
+        Stored (normalized) embeddings for `ids`, read back from the index.
+        IVF-PQ returns its compressed approximation.
+        """
+        if not ids:
+            return np.empty((0, self.dim), dtype="float32")
+        return self.index.reconstruct_batch(np.array(ids, dtype="int64"))
+
+    def get(self, vid: int):
+        doc = self.chunks.get(vid)
+        if doc is None:
+            return None
+        return {"id": vid, "text": doc["text"], "metadata": doc["metadata"]}
+
+    def train(self, vectors: np.ndarray):
+        """
+        Trains IVF coarse quantizers / PQ codebooks. No-op for flat and HNSW.
+        """
+        if not self.index.is_trained:
+            self.index.train(np.ascontiguousarray(vectors, dtype="float32"))
+
+    def add(self, embedded_chunks: List[Dict]) -> List[int]:
+        """
+        Adds embedded chunks and returns the vector ids assigned to them.
+        """
+        if not embedded_chunks:
+            return []
 
-    def add(self, embedded_chunks: List[Dict]):
         vectors = np.array(
             [c["embedding"] for c in embedded_chunks],
             dtype="float32"
         )
+        return self.add_vectors(embedded_chunks, vectors)
+
+    def add_vectors(self, chunks: List[Dict], vectors: np.ndarray) -> List[int]:
+        """
+        Adds chunks with a precomputed (N, d) float32 matrix of their embeddings.
+        """
+        if not chunks:
+            return []
+
+        vectors = np.ascontiguousarray(vectors, dtype="float32")
+        ids = np.arange(self.next_id, self.next_id + len(chunks), dtype="int64")
+
+        self.train(vectors)
+        self.index.add_with_ids(vectors, ids)
+        for vid, chunk in zip(ids.tolist(), chunks):
+            self.chunks.add(vid, chunk["text"], chunk["metadata"])
+            if self.bm25 is not None:
+                self.bm25.add(vid, chunk["text"])
+            self.metadata.add(vid, chunk["metadata"])
+        self.next_id += len(chunks)
+        self.version += 1
+
+        return ids.tolist()
+
+    def remove(self, ids: List[int]) -> int:
+        """
+        Removes vectors (and their documents) by id. Returns the number removed.
+        """
+        if not ids:
+            return 0
+
+        for vid in ids:
+            doc = self.chunks.get(vid)
+            if doc is not None:
+                if self.bm25 is not None:
+                    self.bm25.remove(vid, doc["text"])
+                self.metadata.remove(vid, doc["metadata"])
+
+        if self.index_type == "hnsw":
+            # Tombstone instead of rebuilding the graph per call; see compact()
+            removed = 0
+            for vid in ids:
+                if self.chunks.remove(vid):
+                    self.tombstones.add(int(vid))
+                    removed += 1
+            self._tombstone_sel = None
+            self.version += 1
+            return removed
+
+        removed = self.index.remove_ids(np.array(ids, dtype="int64"))
+        for vid in ids:
+            self.chunks.remove(vid)
+        self.version += 1
+
+        return int(removed)
+
+    def compact(self):
+        """
+        Rebuilds an HNSW graph without its tombstoned vectors. Call once after
+        a batch of removals (e.g. at the end of an ingest), not per removal.
+        """
+        if self.tombstones:
+            self.reindex(self.index_type, **self.index_params)
+
+    def reindex(self, index_type: str = "auto", **index_params):
+        """
+        Rebuilds the index as `index_type` from the vectors currently stored.
+        "auto" picks the type from corpus size.
+        """
+        ids = self.chunks.ids()
+        vectors = self.index.reconstruct_batch(ids) if len(ids) else np.empty((0, self.dim), dtype="float32")
 
-        self.index.add(vectors)
-        self.documents.extend(embedded_chunks)
+        if index_type == "auto":
+            index_type = choose_index_type(len(ids))
 
-    def search(self, query_vector, top_k: int = 5):
-        query_vector = np.array([query_vector], dtype="float32")
-        scores, indices = self.index.search(query_vector, top_k)
+        self.index_type = index_type
+        self.index_params = index_params
+        self.index = build_index(index_type, self.dim, n_vectors=len(ids), **index_params)
 
-        results = []
-        for score, idx in zip(scores[0], indices[0]):
-            if idx < len(self.documents):
-                doc = self.documents[idx].copy()
-                doc["score"] = float(score)
-                results.append(doc)
+        if len(ids):
+            self.train(vectors)
+            self.index.add_with_ids(vectors, ids)
+        self.tombstones = set()
+        self._tombstone_sel = None
+        self.version += 1
 
-        return results
+    def update_metadata(self, vid: int, metadata: Dict):
+        doc = self.chunks.get(vid)
+        if doc is not None:
+            self.metadata.remove(vid, doc["metadata"])
+            self.metadata.add(vid, metadata)
+        self.chunks.update_metadata(vid, metadata)
+        self.version += 1
+
+    def search(self, query_vector, top_k: int = 5, nprobe: int = None, ef_search: int = None, filters: Dict = None):
+        return self.search_batch(
+            [query_vector], top_k=top_k, nprobe=nprobe, ef_search=ef_search, filters=filters
+        )[0]
+
+    def search_batch(self, query_vectors, top_k: int = 5, nprobe: int = None, ef_search: int = None, filters: Dict = None):
+        """
+        Searches an (N, d) matrix of query vectors in a single index call.
+        Returns one result list per query.
+        `filters` is a metadata filter expression (see MetadataIndex); matching
+        ids are resolved first and applied inside the FAISS search.
+        """
+        query_vectors = np.ascontiguousarray(query_vectors, dtype="float32")
+        if query_vectors.ndim == 1:
+            query_vectors = query_vectors[None, :]
+
+        sel = None
+        if filters:
+            allowed_ids = np.ascontiguousarray(self.metadata.select(filters), dtype="int64")
+            if not len(allowed_ids):
+                return [[] for _ in range(len(query_vectors))]
+
+            if len(allowed_ids) <= FILTER_EXACT_MAX:
+                return self._exact_search(query_vectors, allowed_ids, top_k)
+            sel = faiss.IDSelectorBatch(allowed_ids)
+        elif self.tombstones:
+            # Filtered ids never include tombstones (the metadata index drops them)
+            sel = self._tombstone_selector()
+
+        params = search_params(self.index_type, nprobe=nprobe, ef_search=ef_search, sel=sel, index=self.index)
+        scores, indices = self.index.search(query_vectors, top_k, params=params)
+
+        return self._to_results(scores, indices)
+
+    def _tombstone_selector(self):
+        if self._tombstone_sel is None:
+            removed = faiss.IDSelectorBatch(np.fromiter(self.tombstones, dtype="int64", count=len(self.tombstones)))
+            # Keep the inner selector referenced: IDSelectorNot does not own it
+            self._tombstone_sel = (faiss.IDSelectorNot(removed), removed)
+        return self._tombstone_sel[0]
+
+    def _exact_search(self, query_vectors: np.ndarray, ids: np.ndarray, top_k: int):
+        vectors = self.index.reconstruct_batch(ids)
+        sims = query_vectors @ vectors.T
+
+        k = min(top_k, len(ids))
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        return self._to_results(np.take_along_axis(top_scores, order, axis=1), ids[np.take_along_axis(top, order, axis=1)])
+
+    def _to_results(self, scores: np.ndarray, indices: np.ndarray):
+        batch_results = []
+        for row_scores, row_ids in zip(scores.tolist(), indices.tolist()):
+            results = []
+            for score, idx in zip(row_scores, row_ids):
+                # Only the returned rows are read from the memory-mapped chunk store
+                doc = self.chunks.get(idx) if idx >= 0 else None
+                if doc is not None:
+                    results.append({
+                        "id": idx,
+                        "text": doc["text"],
+                        "metadata": doc["metadata"],
+                        "score": score
+                    })
+            batch_results.append(results)
+
+        return batch_results
+
+    def search_lexical(self, query: str, top_k: int = 10, filters: Dict = None):
+        """
+        BM25 search, optionally restricted by a metadata filter expression.
+        """
+        allowed = self.metadata.select(filters) if filters else None
+        if allowed is not None and not len(allowed):
+            return []
+        if self.bm25 is None:
+            # Lexical search on a store loaded without BM25
+            self.bm25 = self._build_bm25()
+        return self.bm25.search(query, top_k=top_k, allowed=allowed)
+
+    def _build_bm25(self) -> BM25Index:
+        bm25 = BM25Index()
+        for vid, text, _ in self.chunks.rows():
+            bm25.add(vid, text)
+        return bm25
 
     def save(self, path: str):
         os.makedirs(path, exist_ok=True)
         faiss.write_index(self.index, f"{path}/index.faiss")
-        with open(f"{path}/docs.pkl", "wb") as f:
-            pickle.dump(self.documents, f)
+        self.chunks.save(path)
+        if self.lexical and self.bm25 is not None:
+            self.bm25.save(path)
+        else:
+            # Not maintained by this process: a saved copy would be stale
+            BM25Index.delete(path)
+        self.metadata.save(path)
+        with open(f"{path}/store.json", "w") as f:
+            json.dump({
+                "next_id": self.next_id,
+                "index_type": self.index_type,
+                "tombstones": sorted(self.tombstones)
+            }, f)
+
+        # Superseded by the chunk store
+        if os.path.exists(f"{path}/docs.pkl"):
+            os.remove(f"{path}/docs.pkl")
 
     def load(self, path: str):
         self.index = faiss.read_index(f"{path}/index.faiss")
-        with open(f"{path}/docs.pkl", "rb") as f:
-            self.documents = pickle.load(f)
+        self.index_type = detect_index_type(self.index)
+        self.version += 1
+
+        if ChunkStore.exists(path):
+            self.chunks = ChunkStore.open(path)
+            with open(f"{path}/store.json") as f:
+                meta = json.load(f)
+            self.next_id = meta["next_id"]
+            self.tombstones = set(meta.get("tombstones", []))
+            self._tombstone_sel = None
+        else:
+            # Older stores: everything pickled in docs.pkl
+            with open(f"{path}/docs.pkl", "rb") as f:
+                data = pickle.load(f)
+
+            if isinstance(data, list):
+                # Legacy layout: positional list + plain flat index
+                self._upgrade_legacy(data)
+            else:
+                self._load_documents(data["documents"])
+                self.next_id = data["next_id"]
+
+        if not self.lexical:
+            self.bm25 = None
+        elif BM25Index.exists(path):
+            self.bm25 = BM25Index.load(path)
+        else:
+            # Stores saved without BM25: build it from the chunk text
+            self.bm25 = self._build_bm25()
+
+        if MetadataIndex.exists(path):
+            self.metadata = MetadataIndex.load(path)
+        else:
+            self.metadata = MetadataIndex()
+            for vid, _, metadata in self.chunks.rows():
+                self.metadata.add(vid, metadata)
+
+    def _load_documents(self, documents: Dict[int, Dict]):
+        self.chunks = ChunkStore()
+        for vid, doc in documents.items():
+            # The duplicated "embedding" field is intentionally dropped
+            self.chunks.add(vid, doc["text"], doc["metadata"])
 
+    def _upgrade_legacy(self, documents: List[Dict]):
+        vectors = self.index.reconstruct_n(0, self.index.ntotal)
+        ids = np.arange(len(vectors), dtype="int64")
 
+        self.index = build_index("flat", self.dim)
+        self.index_type = "flat"
+        self.index.add_with_ids(vectors, ids)
+        self._load_documents(dict(enumerate(documents)))
+        self.next_id = len(documents)
@@ -0,0 +1,119 @@
+import math
+import faiss
+
+INDEX_TYPES = ("flat", "hnsw", "ivf_flat", "ivf_pq")
+
+# Corpus-size thresholds used by index_type="auto"
+FLAT_MAX_VECTORS = 10_000
+HNSW_MAX_VECTORS = 500_000
+IVF_FLAT_MAX_VECTORS = 2_000_000
+
+# Sensible defaults for 384-d MiniLM vectors
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+IVF_NPROBE = 16
+PQ_M = 48          # 384 / 48 = 8 dims per sub-quantizer
+PQ_NBITS = 8
+
+
+def choose_index_type(n_vectors: int) -> str:
+    """
+    Picks an index type from corpus size:
+    exact search while it is cheap, HNSW for mid-size corpora,
+    IVF for large ones and IVF-PQ once raw vectors stop fitting in RAM.
+    """
+    if n_vectors <= FLAT_MAX_VECTORS:
+        return "flat"
+    if n_vectors <= HNSW_MAX_VECTORS:
+        return "hnsw"
+    if n_vectors <= IVF_FLAT_MAX_VECTORS:
+        return "ivf_flat"
+    return "ivf_pq"
+
+
+def default_nlist(n_vectors: int) -> int:
+    # ~4*sqrt(N) lists, and at least 39 training points per centroid
+    nlist = int(4 * math.sqrt(max(n_vectors, 1)))
+    return max(1, min(nlist, n_vectors // 39 or 1))
+
+
+def build_index(index_type: str, dim: int, n_vectors: int = 0, **params):
+    """
+    Creates an empty inner-product index that accepts explicit int64 ids.
+    IVF indexes must be trained before vectors are added.
+    """
+    if index_type == "flat":
+        return faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+
+    if index_type == "hnsw":
+        base = faiss.IndexHNSWFlat(dim, params.get("m", HNSW_M), faiss.METRIC_INNER_PRODUCT)
+        base.hnsw.efConstruction = params.get("ef_construction", HNSW_EF_CONSTRUCTION)
+        base.hnsw.efSearch = params.get("ef_search", HNSW_EF_SEARCH)
+        return faiss.IndexIDMap2(base)
+
+    if index_type in ("ivf_flat", "ivf_pq"):
+        nlist = params.get("nlist") or default_nlist(n_vectors)
+        quantizer = faiss.IndexFlatIP(dim)
+
+        if index_type == "ivf_flat":
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        else:
+            index = faiss.IndexIVFPQ(
+                quantizer, dim, nlist,
+                params.get("pq_m", PQ_M),
+                params.get("pq_nbits", PQ_NBITS),
+                faiss.METRIC_INNER_PRODUCT
+            )
+
+        # IVF stores ids natively; the hashtable direct map enables
+        # reconstruct() by id while still allowing remove_ids()
+        index.set_direct_map_type(faiss.DirectMap.Hashtable)
+        index.nprobe = params.get("nprobe", IVF_NPROBE)
+        return index
+
+    raise ValueError(f"Unknown index type: {index_type}. Expected one of {INDEX_TYPES}")
+
+
+def detect_index_type(index) -> str:
+    """
+    Recovers the index type of an index read back from disk.
+    """
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexIDMap):
+        index = faiss.downcast_index(index.index)
+
+    if isinstance(index, faiss.IndexHNSW):
+        return "hnsw"
+    if isinstance(index, faiss.IndexIVFPQ):
+        return "ivf_pq"
+    if isinstance(index, faiss.IndexIVF):
+        return "ivf_flat"
+    return "flat"
+
+
+def search_params(index_type: str, nprobe: int = None, ef_search: int = None, sel=None, index=None):
+    """
+    Per-call search parameters, so query-time knobs never mutate the shared index.
+    `sel` restricts the search to an IDSelector (metadata filters). Parameter
+    objects reset efSearch / nprobe to library defaults, so when only a
+    selector is given the values configured on `index` are carried over.
+    """
+    if index_type == "hnsw" and (ef_search or sel is not None):
+        if not ef_search:
+            ef_search = _inner_index(index).hnsw.efSearch if index is not None else HNSW_EF_SEARCH
+        return faiss.SearchParametersHNSW(efSearch=ef_search, sel=sel)
+    if index_type in ("ivf_flat", "ivf_pq") and (nprobe or sel is not None):
+        if not nprobe:
+            nprobe = faiss.extract_index_ivf(index).nprobe if index is not None else IVF_NPROBE
+        return faiss.SearchParametersIVF(nprobe=nprobe, sel=sel)
+    if sel is not None:
+        return faiss.SearchParameters(sel=sel)
+    return None
+
+
+def _inner_index(index):
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexIDMap):
+        index = faiss.downcast_index(index.index)
+    return index
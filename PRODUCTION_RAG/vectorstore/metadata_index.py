@@ -0,0 +1,302 @@
+import json
+import os
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set
+
+import numpy as np
+
+# Files written next to index.faiss. Every distinct (field, value) pair is a
+# key; its posting list is a sorted slice of one int64 id column, so nothing
+# but the (small) distinct values is decoded at load time
+METADATA_KEYS_FILE = "metadata.json"                  # fields -> distinct values, in key order
+POSTINGS_OFFSETS_FILE = "metadata.post.off.npy"       # (n_keys + 1) offsets into the id column
+POSTINGS_IDS_FILE = "metadata.post.ids.npy"           # int64 ids, sorted within each key
+ALL_IDS_FILE = "metadata.ids.npy"                     # sorted int64 ids of every indexed chunk
+COLUMN_FILES = (POSTINGS_OFFSETS_FILE, POSTINGS_IDS_FILE, ALL_IDS_FILE)
+LEGACY_FILE = "metadata_index.pkl"
+
+EMPTY = np.empty(0, dtype="int64")
+
+# Comparison operators evaluated against the distinct values of a field
+RANGE_OPS = {
+    "$gt": lambda v, x: v > x,
+    "$gte": lambda v, x: v >= x,
+    "$lt": lambda v, x: v < x,
+    "$lte": lambda v, x: v <= x,
+}
+
+
+FIELD_OPS = {"$eq", "$ne", "$in", "$nin", *RANGE_OPS}
+BOOL_OPS = {"$and", "$or"}
+
+
+def _check_scalar(value, where: str):
+    if isinstance(value, (dict, list, tuple, set)):
+        raise ValueError(f"{where}: expected a scalar value, got {type(value).__name__}")
+
+
+def validate_filters(filters) -> None:
+    """
+    Checks that a filter expression is well formed (see MetadataIndex) before
+    it is evaluated. Raises ValueError describing the first problem found.
+    """
+    if not isinstance(filters, dict):
+        raise ValueError(f"filter must be an object, got {type(filters).__name__}")
+
+    for key, condition in filters.items():
+        if key in BOOL_OPS:
+            if not isinstance(condition, list) or not condition:
+                raise ValueError(f"{key}: expected a non-empty list of filters")
+            for sub in condition:
+                validate_filters(sub)
+        elif key.startswith("$"):
+            raise ValueError(f"Unknown filter operator: {key}")
+        elif isinstance(condition, dict):
+            if not condition:
+                raise ValueError(f"{key}: empty condition")
+            for op, operand in condition.items():
+                if op not in FIELD_OPS:
+                    raise ValueError(f"{key}: unknown filter operator: {op}")
+                if op in ("$in", "$nin"):
+                    if not isinstance(operand, list):
+                        raise ValueError(f"{key}.{op}: expected a list")
+                    for v in operand:
+                        _check_scalar(v, f"{key}.{op}")
+                else:
+                    _check_scalar(operand, f"{key}.{op}")
+        else:
+            _check_scalar(condition, key)
+
+
+class MetadataIndex:
+    """
+    Inverted index field -> value -> chunk ids, maintained at add time so
+    filters resolve to an id set before the vector search runs.
+
+    Filter expressions are dicts:
+        {"category": "ListItem"}                          equality
+        {"page_number": {"$gte": 3, "$lte": 10}}          ranges ($gt/$gte/$lt/$lte)
+        {"department": {"$in": ["hr", "finance"]}}       membership ($in / $nin)
+        {"tenant_id": {"$ne": "acme"}}                    inequality
+        {"$or": [{...}, {...}]}, {"$and": [...]}          boolean combinations
+    Top-level keys are ANDed. List-valued metadata matches if any element matches.
+
+    Saved postings are memory-mapped sorted id columns. Chunks added or
+    removed since the last save live in a small in-memory overlay (like
+    ChunkStore and BM25Index) that is compacted into fresh columns on save().
+    """
+
+    def __init__(self):
+        # field -> value -> key number into the posting columns
+        self._keys: Dict[str, Dict[object, int]] = {}
+        self._post_off = np.zeros(1, dtype="int64")
+        self._post_ids = EMPTY
+        self._all_ids = EMPTY
+
+        # Overlay: field -> value -> ids, added ids, removed base ids
+        self._added: Dict[str, Dict[object, Set[int]]] = defaultdict(lambda: defaultdict(set))
+        self._added_ids: Set[int] = set()
+        self._deleted: Set[int] = set()
+        self._deleted_arr = None
+
+    @staticmethod
+    def _values(value) -> Iterable:
+        if isinstance(value, (list, tuple, set)):
+            return value
+        return (value,)
+
+    @staticmethod
+    def _array(ids: Iterable[int]) -> np.ndarray:
+        ids = list(ids)
+        return np.unique(np.array(ids, dtype="int64")) if ids else EMPTY
+
+    def _in_base(self, doc_id: int) -> bool:
+        pos = int(np.searchsorted(self._all_ids, doc_id))
+        return pos < len(self._all_ids) and self._all_ids[pos] == doc_id
+
+    def add(self, doc_id: int, metadata: Dict):
+        self._added_ids.add(doc_id)
+        for field, value in (metadata or {}).items():
+            for v in self._values(value):
+                if v is not None and not isinstance(v, dict):
+                    self._added[field][v].add(doc_id)
+
+    def remove(self, doc_id: int, metadata: Dict):
+        if doc_id in self._added_ids:
+            self._added_ids.discard(doc_id)
+            for field, value in (metadata or {}).items():
+                values = self._added.get(field)
+                if values is None:
+                    continue
+                for v in self._values(value):
+                    if v is None or isinstance(v, dict):
+                        continue
+                    ids = values.get(v)
+                    if ids is not None:
+                        ids.discard(doc_id)
+                        if not ids:
+                            del values[v]
+                if not values:
+                    del self._added[field]
+
+        # Base postings are immutable until the next save
+        if self._in_base(doc_id):
+            self._deleted.add(doc_id)
+            self._deleted_arr = None
+
+    # ------------------------------------------------------------------
+    # Postings
+    # ------------------------------------------------------------------
+
+    def _drop_deleted(self, ids: np.ndarray) -> np.ndarray:
+        if not self._deleted or not len(ids):
+            return np.asarray(ids)
+        if self._deleted_arr is None:
+            self._deleted_arr = self._array(self._deleted)
+        return ids[~np.isin(ids, self._deleted_arr, assume_unique=True)]
+
+    def _postings(self, field: str, value) -> np.ndarray:
+        """Sorted ids whose `field` has `value`."""
+        ids = EMPTY
+        key = self._keys.get(field, {}).get(value)
+        if key is not None:
+            ids = self._drop_deleted(self._post_ids[self._post_off[key]:self._post_off[key + 1]])
+        extra = self._added.get(field, {}).get(value)
+        if extra:
+            ids = np.union1d(ids, self._array(extra))
+        return ids
+
+    def _field_values(self, field: str) -> Set:
+        return set(self._keys.get(field, ())) | set(self._added.get(field, ()))
+
+    def all_ids(self) -> np.ndarray:
+        return np.union1d(self._drop_deleted(self._all_ids), self._array(self._added_ids))
+
+    @staticmethod
+    def _union(arrays: List[np.ndarray]) -> np.ndarray:
+        arrays = [a for a in arrays if len(a)]
+        return np.unique(np.concatenate(arrays)) if arrays else EMPTY
+
+    # ------------------------------------------------------------------
+    # Filter evaluation
+    # ------------------------------------------------------------------
+
+    def select(self, filters: Dict) -> np.ndarray:
+        """
+        Resolves a filter expression to the sorted int64 array of matching chunk ids.
+        """
+        result = None
+        for key, condition in filters.items():
+            if key == "$and":
+                ids = self._intersect(self.select(f) for f in condition)
+            elif key == "$or":
+                ids = self._union([self.select(f) for f in condition])
+            else:
+                ids = self._match_field(key, condition)
+            result = ids if result is None else np.intersect1d(result, ids, assume_unique=True)
+            if not len(result):
+                return EMPTY
+        return self.all_ids() if result is None else result
+
+    def _intersect(self, arrays) -> np.ndarray:
+        result = None
+        for ids in arrays:
+            result = ids if result is None else np.intersect1d(result, ids, assume_unique=True)
+        return self.all_ids() if result is None else result
+
+    def _match_field(self, field: str, condition) -> np.ndarray:
+        if not isinstance(condition, dict):
+            return self._postings(field, condition)
+
+        result = None
+        for op, operand in condition.items():
+            if op == "$eq":
+                ids = self._postings(field, operand)
+            elif op == "$ne":
+                ids = np.setdiff1d(self.all_ids(), self._postings(field, operand), assume_unique=True)
+            elif op == "$in":
+                ids = self._union([self._postings(field, v) for v in operand])
+            elif op == "$nin":
+                excluded = self._union([self._postings(field, v) for v in operand])
+                ids = np.setdiff1d(self.all_ids(), excluded, assume_unique=True)
+            elif op in RANGE_OPS:
+                matching = []
+                for v in self._field_values(field):
+                    try:
+                        if RANGE_OPS[op](v, operand):
+                            matching.append(self._postings(field, v))
+                    except TypeError:
+                        # Mixed types (e.g. str vs int): not comparable, not a match
+                        continue
+                ids = self._union(matching)
+            else:
+                raise ValueError(f"Unknown filter operator: {op}")
+            result = ids if result is None else np.intersect1d(result, ids, assume_unique=True)
+        return EMPTY if result is None else result
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str):
+        """
+        Compacts the saved columns and the overlay into fresh files.
+        """
+        os.makedirs(path, exist_ok=True)
+
+        fields = {}
+        lists = []
+        for field in sorted(set(self._keys) | set(self._added)):
+            values = []
+            for v in self._field_values(field):
+                ids = self._postings(field, v)
+                if len(ids):
+                    values.append(v)
+                    lists.append(ids)
+            if values:
+                fields[field] = values
+
+        offsets = np.zeros(len(lists) + 1, dtype="int64")
+        np.cumsum([len(ids) for ids in lists], out=offsets[1:])
+        columns = {
+            POSTINGS_OFFSETS_FILE: offsets,
+            POSTINGS_IDS_FILE: np.concatenate(lists) if lists else EMPTY,
+            ALL_IDS_FILE: self.all_ids(),
+        }
+        for name, arr in columns.items():
+            with open(os.path.join(path, name + ".tmp"), "wb") as f:
+                np.save(f, arr)
+        with open(os.path.join(path, METADATA_KEYS_FILE + ".tmp"), "w", encoding="utf-8") as f:
+            # Field order is kept: keys are numbered field by field, value by value
+            json.dump({"fields": list(fields.items())}, f, ensure_ascii=False)
+
+        for name in (*columns, METADATA_KEYS_FILE):
+            os.replace(os.path.join(path, name + ".tmp"), os.path.join(path, name))
+
+        # Superseded by the column files
+        if os.path.exists(os.path.join(path, LEGACY_FILE)):
+            os.remove(os.path.join(path, LEGACY_FILE))
+
+        # Re-open the compacted columns and drop the overlay
+        fresh = MetadataIndex.load(path)
+        self.__dict__.update(fresh.__dict__)
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        return os.path.exists(os.path.join(path, METADATA_KEYS_FILE))
+
+    @classmethod
+    def load(cls, path: str) -> "MetadataIndex":
+        with open(os.path.join(path, METADATA_KEYS_FILE), encoding="utf-8") as f:
+            fields = json.load(f)["fields"]
+        index = cls()
+        key = 0
+        for field, values in fields:
+            index._keys[field] = {}
+            for v in values:
+                index._keys[field][v] = key
+                key += 1
+        index._post_off = np.load(os.path.join(path, POSTINGS_OFFSETS_FILE), mmap_mode="r")
+        index._post_ids = np.load(os.path.join(path, POSTINGS_IDS_FILE), mmap_mode="r")
+        index._all_ids = np.load(os.path.join(path, ALL_IDS_FILE), mmap_mode="r")
+        return index
@@ -0,0 +1,272 @@
+import glob
+import heapq
+import json
+import os
+import shutil
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+
+from vectorstore.faiss_store import FaissVectorStore
+
+SHARDS_FILE = "shards.json"
+PARTITIONS = ("source", "hash")
+SHARD_DIR_PATTERN = "shard_[0-9][0-9][0-9]"
+
+
+def shard_dir(path: str, shard_no: int) -> str:
+    return os.path.join(path, f"shard_{shard_no:03d}")
+
+
+def shard_dirs(path: str) -> Dict[int, str]:
+    """Shard directories present on disk, by shard number."""
+    return {
+        int(os.path.basename(d)[len("shard_"):]): d
+        for d in glob.glob(os.path.join(path, SHARD_DIR_PATTERN))
+    }
+
+
+class ShardedVectorStore:
+    """
+    Partitions chunks across N independent FaissVectorStore shards on disk.
+
+    Chunks are routed by source document ("source", keeps a document's chunks
+    together, e.g. one tenant corpus per shard) or by text hash ("hash", even
+    spread). Global ids encode the shard: id = local_id * n_shards + shard_no.
+
+    Searches (dense and BM25) fan out to the loaded shards in parallel threads
+    (FAISS releases the GIL) and the per-shard top-k lists are merged with a
+    heap. A process can load only a subset of shards, in which case it only
+    answers for those.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        n_shards: int = 4,
+        partition: str = "source",
+        index_type: str = "flat",
+        shards: List[int] = None,
+        **index_params
+    ):
+        """
+        `shards` limits the shard numbers held by this process (partial replica).
+        """
+        if partition not in PARTITIONS:
+            raise ValueError(f"Unknown partition: {partition}. Expected one of {PARTITIONS}")
+
+        self.dim = dim
+        self.n_shards = n_shards
+        self.partition = partition
+        wanted = range(n_shards) if shards is None else shards
+        self.shards: Dict[int, FaissVectorStore] = {
+            shard_no: FaissVectorStore(dim, index_type, **index_params) for shard_no in wanted
+        }
+        # Created up front: searches from concurrent requests share it.
+        # Threads are only started on first use
+        self._pool = None
+        if len(self.shards) > 1:
+            self._pool = ThreadPoolExecutor(max_workers=len(self.shards), thread_name_prefix="shard-search")
+
+    # ------------------------------------------------------------------
+    # Ids and routing
+    # ------------------------------------------------------------------
+
+    def global_id(self, shard_no: int, local_id: int) -> int:
+        return local_id * self.n_shards + shard_no
+
+    def split_id(self, vid: int):
+        return vid % self.n_shards, vid // self.n_shards
+
+    def shard_for(self, chunk: Dict) -> int:
+        if self.partition == "source":
+            key = str(chunk["metadata"].get("source", ""))
+        else:
+            key = chunk["text"]
+        return zlib.crc32(key.encode("utf-8")) % self.n_shards
+
+    def _shard(self, shard_no: int) -> FaissVectorStore:
+        shard = self.shards.get(shard_no)
+        if shard is None:
+            raise KeyError(f"Shard {shard_no} is not loaded in this process")
+        return shard
+
+    def _group_ids(self, ids: List[int]) -> Dict[int, List[int]]:
+        groups: Dict[int, List[int]] = {}
+        for vid in ids:
+            shard_no, local_id = self.split_id(int(vid))
+            groups.setdefault(shard_no, []).append(local_id)
+        return groups
+
+    def _fan_out(self, fn) -> Dict[int, object]:
+        """
+        Runs fn(shard) on every loaded shard in parallel; returns {shard_no: result}.
+        """
+        if self._pool is None:
+            return {shard_no: fn(shard) for shard_no, shard in self.shards.items()}
+
+        futures = {shard_no: self._pool.submit(fn, shard) for shard_no, shard in self.shards.items()}
+        return {shard_no: future.result() for shard_no, future in futures.items()}
+
+    # ------------------------------------------------------------------
+    # FaissVectorStore interface
+    # ------------------------------------------------------------------
+
+    @property
+    def version(self) -> int:
+        return sum(shard.version for shard in self.shards.values())
+
+    @property
+    def index_type(self) -> str:
+        return ",".join(sorted({shard.index_type for shard in self.shards.values()}))
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self.shards.values())
+
+    def ids(self) -> np.ndarray:
+        parts = [shard.ids() * self.n_shards + shard_no for shard_no, shard in self.shards.items()]
+        return np.concatenate(parts) if parts else np.empty(0, dtype="int64")
+
+    def get(self, vid: int):
+        shard_no, local_id = self.split_id(vid)
+        shard = self.shards.get(shard_no)
+        doc = shard.get(local_id) if shard is not None else None
+        if doc is None:
+            return None
+        return {**doc, "id": vid}
+
+    def get_vectors(self, ids: List[int]) -> np.ndarray:
+        out = np.empty((len(ids), self.dim), dtype="float32")
+        positions: Dict[int, List[int]] = {}
+        for pos, vid in enumerate(ids):
+            positions.setdefault(self.split_id(int(vid))[0], []).append(pos)
+
+        for shard_no, local_ids in self._group_ids(ids).items():
+            out[positions[shard_no]] = self._shard(shard_no).get_vectors(local_ids)
+        return out
+
+    def add(self, embedded_chunks: List[Dict]) -> List[int]:
+        if not embedded_chunks:
+            return []
+
+        vectors = np.array([c["embedding"] for c in embedded_chunks], dtype="float32")
+        return self.add_vectors(embedded_chunks, vectors)
+
+    def add_vectors(self, chunks: List[Dict], vectors: np.ndarray) -> List[int]:
+        """
+        Routes each chunk to its shard and returns global ids in input order.
+        """
+        if not chunks:
+            return []
+
+        vectors = np.ascontiguousarray(vectors, dtype="float32")
+        positions: Dict[int, List[int]] = {}
+        for pos, chunk in enumerate(chunks):
+            positions.setdefault(self.shard_for(chunk), []).append(pos)
+
+        ids = [0] * len(chunks)
+        for shard_no, pos in positions.items():
+            local_ids = self._shard(shard_no).add_vectors([chunks[p] for p in pos], vectors[pos])
+            for p, local_id in zip(pos, local_ids):
+                ids[p] = self.global_id(shard_no, local_id)
+        return ids
+
+    def remove(self, ids: List[int]) -> int:
+        return sum(self._shard(shard_no).remove(local_ids) for shard_no, local_ids in self._group_ids(ids).items())
+
+    def compact(self):
+        for shard in self.shards.values():
+            shard.compact()
+
+    def update_metadata(self, vid: int, metadata: Dict):
+        shard_no, local_id = self.split_id(vid)
+        self._shard(shard_no).update_metadata(local_id, metadata)
+
+    def reindex(self, index_type: str = "auto", **index_params):
+        # "auto" picks the type per shard from that shard's size
+        for shard in self.shards.values():
+            shard.reindex(index_type, **index_params)
+
+    def search(self, query_vector, top_k: int = 5, nprobe: int = None, ef_search: int = None, filters: Dict = None):
+        return self.search_batch(
+            [query_vector], top_k=top_k, nprobe=nprobe, ef_search=ef_search, filters=filters
+        )[0]
+
+    def search_batch(self, query_vectors, top_k: int = 5, nprobe: int = None, ef_search: int = None, filters: Dict = None):
+        # Each shard resolves `filters` against its own metadata index
+        per_shard = self._fan_out(
+            lambda shard: shard.search_batch(
+                query_vectors, top_k=top_k, nprobe=nprobe, ef_search=ef_search, filters=filters
+            )
+        )
+
+        n_queries = len(next(iter(per_shard.values()))) if per_shard else 0
+        batch_results = []
+        for q in range(n_queries):
+            candidates = []
+            for shard_no, results in per_shard.items():
+                for r in results[q]:
+                    r["id"] = self.global_id(shard_no, r["id"])
+                    candidates.append(r)
+            batch_results.append(heapq.nlargest(top_k, candidates, key=lambda r: r["score"]))
+        return batch_results
+
+    def search_lexical(self, query: str, top_k: int = 10, filters: Dict = None):
+        """
+        BM25 over every loaded shard; each shard scores with its own statistics.
+        """
+        per_shard = self._fan_out(lambda shard: shard.search_lexical(query, top_k=top_k, filters=filters))
+        hits = (
+            (self.global_id(shard_no, doc_id), score)
+            for shard_no, results in per_shard.items()
+            for doc_id, score in results
+        )
+        return heapq.nlargest(top_k, hits, key=lambda x: x[1])
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        return os.path.exists(os.path.join(path, SHARDS_FILE))
+
+    @staticmethod
+    def delete(path: str):
+        """Removes a saved sharded store (shards.json and every shard directory)."""
+        if os.path.exists(os.path.join(path, SHARDS_FILE)):
+            os.remove(os.path.join(path, SHARDS_FILE))
+        for d in shard_dirs(path).values():
+            shutil.rmtree(d)
+
+    def save(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        for shard_no, shard in self.shards.items():
+            shard.save(shard_dir(path, shard_no))
+        # Left over from a rebuild with more shards
+        for shard_no, d in shard_dirs(path).items():
+            if shard_no >= self.n_shards:
+                shutil.rmtree(d)
+        with open(os.path.join(path, SHARDS_FILE), "w") as f:
+            json.dump({"dim": self.dim, "n_shards": self.n_shards, "partition": self.partition}, f)
+
+    @classmethod
+    def load(cls, path: str, shards: List[int] = None) -> "ShardedVectorStore":
+        """
+        Loads all shards, or only `shards` (shard numbers) for a partial replica.
+        """
+        with open(os.path.join(path, SHARDS_FILE)) as f:
+            meta = json.load(f)
+
+        store = cls(meta["dim"], n_shards=meta["n_shards"], partition=meta["partition"], shards=shards)
+        for shard_no, shard in store.shards.items():
+            if os.path.exists(os.path.join(shard_dir(path, shard_no), "index.faiss")):
+                shard.load(shard_dir(path, shard_no))
+        return store
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
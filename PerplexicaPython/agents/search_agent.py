@@ -1,6 +1,7 @@
 import asyncio
-from typing import List, Dict, Any, Optional, Generator
-from search.serper_client import SerperClient
+from typing import List, Dict, Any, Optional, Generator, AsyncGenerator, Tuple
+from config.settings import get_settings
+from search.orchestrator import get_search_orchestrator
 from search.jina_scraper import JinaScraper
 from core.content_selection import select_relevant_content
 from llm.groq_engine import GroqEngine
@@ -12,7 +13,7 @@ class SearchAgent:
     """
     
     def __init__(self):
-        self.search_client = SerperClient()
+        self.search_client = get_search_orchestrator()
         self.scraper = JinaScraper()
         self.llm = GroqEngine()
         
@@ -44,22 +45,24 @@ class SearchAgent:
             
         yield {"type": "status", "message": "Scraping and analyzing content..."}
         
-        # 3. Scrape top web results
-        urls_to_scrape = [res["url"] for res in web_results]
-        scraped_data = await self.scraper.scrape_batch(urls_to_scrape)
+        # 3. Scrape top web results, processing each page as soon as it arrives
+        context_parts: List[Optional[str]] = [None] * len(web_results)
+        scraped = 0
+        async for i, md in self._scrape_pages(web_results):
+            res = web_results[i]
+            relevant = select_relevant_content(md, query, 2000)
+            context_parts[i] = f"[{i+1}] {res['title']}\nURL: {res['url']}\n{relevant}"
+            res["content_length"] = len(md)
+            scraped += 1
+            yield {"type": "status", "message": f"Analyzed {scraped}/{len(web_results)} sources..."}
         
-        # 4. Process context
-        context_parts = []
+        # 4. Fall back to search snippets for pages that failed or missed the deadline
         for i, res in enumerate(web_results):
-            # Find corresponding markdown
-            md = next((s["markdown"] for s in scraped_data if s["url"] == res["url"]), "")
-            content = md if md else res.get("snippet", "")
-            
-            relevant = select_relevant_content(content, query, 2000)
-            context_parts.append(f"[{i+1}] {res['title']}\nURL: {res['url']}\n{relevant}")
-            
-            # Update web_results with character count info for UI
-            res["content_length"] = len(content)
+            if context_parts[i] is None:
+                snippet = res.get("snippet", "")
+                relevant = select_relevant_content(snippet, query, 2000)
+                context_parts[i] = f"[{i+1}] {res['title']}\nURL: {res['url']}\n{relevant}"
+                res["content_length"] = len(snippet)
             
         context = "\n\n---\n\n".join(context_parts)
         
@@ -89,5 +92,43 @@ class SearchAgent:
         # For this orchestrator, we'll return a helper to generate them later.
         yield {"type": "ready_for_followups"}
         
+    async def _scrape_pages(self, web_results: List[Dict[str, Any]]) -> AsyncGenerator[Tuple[int, str], None]:
+        """
+        Scrape all result pages concurrently and yield (index, markdown) in
+        completion order, so one slow site does not hold up the others.
+        
+        Stops at the global scrape deadline, or scrape_grace seconds after
+        scrape_min_sources pages are ready; unfinished scrapes are cancelled.
+        Failed (empty) scrapes are not yielded.
+        """
+        settings = get_settings()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.scrape_deadline
+        
+        tasks = {
+            asyncio.ensure_future(self.scraper.scrape(res["url"])): i
+            for i, res in enumerate(web_results)
+        }
+        pending = set(tasks)
+        ready = 0
+        try:
+            while pending:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    md = task.result() if task.exception() is None else ""
+                    if md:
+                        ready += 1
+                        yield tasks[task], md
+                
+                # Enough context: give the stragglers only a short grace period
+                if ready >= settings.scrape_min_sources:
+                    deadline = min(deadline, loop.time() + settings.scrape_grace)
+        finally:
+            for task in pending:
+                task.cancel()
+        
     def get_follow_ups(self, query: str, full_answer: str) -> List[str]:
         return self.llm.generate_follow_ups(query, full_answer)
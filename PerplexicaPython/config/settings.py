@@ -91,6 +91,182 @@ class Settings(BaseSettings):
         description="Default search language code"
     )
     
+    # Shared HTTP Client (search + scraping)
+    http_max_connections: int = Field(
+        default=100,
+        ge=1,
+        description="Total connections in the shared HTTP pool"
+    )
+    http_max_connections_per_host: int = Field(
+        default=10,
+        ge=1,
+        description="Concurrent requests allowed per host"
+    )
+    http_max_keepalive_connections: int = Field(
+        default=20,
+        ge=0,
+        description="Idle connections kept open for reuse"
+    )
+    http_keepalive_expiry: float = Field(
+        default=30.0,
+        ge=0.0,
+        description="Seconds an idle connection is kept alive"
+    )
+    http2: bool = Field(
+        default=True,
+        description="Negotiate HTTP/2 when the h2 package is installed"
+    )
+    http_connect_timeout: float = Field(
+        default=5.0,
+        gt=0.0,
+        description="Connect timeout in seconds"
+    )
+    http_max_retries: int = Field(
+        default=2,
+        ge=0,
+        le=10,
+        description="Retries for transport errors and 429/5xx responses"
+    )
+    http_retry_backoff: float = Field(
+        default=0.25,
+        ge=0.0,
+        description="Base delay in seconds for jittered exponential backoff"
+    )
+    http_retry_max_backoff: float = Field(
+        default=4.0,
+        ge=0.0,
+        description="Upper bound for a single retry delay in seconds"
+    )
+    
+    # Search Result Cache
+    search_cache_enabled: bool = Field(
+        default=True,
+        description="Cache Serper/SearXNG results"
+    )
+    search_cache_persistent: bool = Field(
+        default=True,
+        description="Also keep cached results in the database (survives restarts)"
+    )
+    search_cache_max_entries: int = Field(
+        default=1000,
+        ge=1,
+        description="Entries kept in the in-process LRU tier"
+    )
+    search_cache_ttl_web: int = Field(
+        default=3600,
+        ge=0,
+        description="Seconds web results stay fresh"
+    )
+    search_cache_ttl_news: int = Field(
+        default=600,
+        ge=0,
+        description="Seconds news results stay fresh"
+    )
+    search_cache_ttl_images: int = Field(
+        default=86400,
+        ge=0,
+        description="Seconds image results stay fresh"
+    )
+    search_cache_max_rows: int = Field(
+        default=10000,
+        ge=1,
+        description="Rows kept in the persistent tier; the oldest are deleted beyond it"
+    )
+    search_cache_stale_factor: float = Field(
+        default=1.0,
+        ge=0.0,
+        description="Expired entries are served (and refreshed in the background) for ttl * factor more seconds"
+    )
+    
+    # Scraped Page Cache
+    page_cache_enabled: bool = Field(
+        default=True,
+        description="Cache scraped page markdown in the database"
+    )
+    page_cache_max_bytes: int = Field(
+        default=256 * 1024 * 1024,
+        ge=0,
+        description="Budget for compressed cached pages; least recently used pages are evicted beyond it"
+    )
+    page_cache_ttl: int = Field(
+        default=6 * 3600,
+        ge=0,
+        description="Seconds a cached page is used without revalidation"
+    )
+    page_cache_domain_ttls: dict[str, int] = Field(
+        default={
+            "wikipedia.org": 7 * 86400,
+            "reuters.com": 900,
+            "bloomberg.com": 900,
+            "cnn.com": 900,
+            "bbc.com": 900,
+        },
+        description="Per-domain TTL overrides (subdomains included), as JSON in the environment"
+    )
+    
+    # Multi-Provider Search (hedged requests)
+    search_providers: list[str] = Field(
+        default=["serper", "searxng"],
+        description="Search providers in priority order; later ones receive hedged requests"
+    )
+    search_hedge_enabled: bool = Field(
+        default=True,
+        description="Send a hedged request to the next provider when the current one is slow"
+    )
+    search_hedge_quantile: float = Field(
+        default=0.95,
+        gt=0.0,
+        lt=1.0,
+        description="Provider latency quantile after which the hedged request is sent"
+    )
+    search_hedge_default_delay: float = Field(
+        default=1.0,
+        ge=0.0,
+        description="Hedge delay in seconds until a provider has search_hedge_min_samples latencies"
+    )
+    search_hedge_min_delay: float = Field(
+        default=0.1,
+        ge=0.0,
+        description="Lower bound of the adaptive hedge delay in seconds"
+    )
+    search_hedge_max_delay: float = Field(
+        default=3.0,
+        ge=0.0,
+        description="Upper bound of the adaptive hedge delay in seconds"
+    )
+    search_hedge_min_samples: int = Field(
+        default=20,
+        ge=1,
+        description="Latency samples needed before the hedge delay adapts"
+    )
+    search_hedge_merge_window: float = Field(
+        default=0.1,
+        ge=0.0,
+        description="Seconds to wait for other in-flight providers after the first answer, to merge their results"
+    )
+    search_latency_window: int = Field(
+        default=1000,
+        ge=10,
+        description="Recent requests kept in each provider's latency histogram"
+    )
+    
+    # Scrape Pipeline
+    scrape_deadline: float = Field(
+        default=8.0,
+        gt=0.0,
+        description="Seconds to wait for page scrapes; unfinished pages fall back to their search snippet"
+    )
+    scrape_min_sources: int = Field(
+        default=3,
+        ge=1,
+        description="Scraped pages after which generation may start early"
+    )
+    scrape_grace: float = Field(
+        default=1.0,
+        ge=0.0,
+        description="Extra seconds to wait for remaining pages once scrape_min_sources are ready"
+    )
+    
     def get_max_iterations(self, mode: Literal["speed", "balanced", "quality"]) -> int:
         """Get max research iterations based on optimization mode."""
         if mode == "speed":
@@ -99,6 +275,24 @@ class Settings(BaseSettings):
             return self.max_research_iterations_balanced
         else:
             return self.max_research_iterations_quality
+    
+    def get_search_cache_ttl(self, search_type: str) -> int:
+        """Get the freshness TTL for a search type."""
+        if search_type == "news":
+            return self.search_cache_ttl_news
+        elif search_type == "images":
+            return self.search_cache_ttl_images
+        else:
+            return self.search_cache_ttl_web
+    
+    def get_page_cache_ttl(self, domain: str) -> int:
+        """Get the page cache TTL for a domain (longest matching suffix wins)."""
+        best = None
+        for suffix, ttl in self.page_cache_domain_ttls.items():
+            if domain == suffix or domain.endswith("." + suffix):
+                if best is None or len(suffix) > len(best[0]):
+                    best = (suffix, ttl)
+        return best[1] if best else self.page_cache_ttl
 
 
 # Global settings instance
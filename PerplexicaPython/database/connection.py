@@ -2,6 +2,9 @@
 Database connection and session management.
 """
 
+import threading
+from contextlib import contextmanager
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.pool import StaticPool
@@ -14,6 +17,10 @@ Base = declarative_base()
 _engine = None
 _SessionLocal = None
 
+# SQLite runs on a single shared connection (StaticPool): every session used
+# from worker threads (caches via asyncio.to_thread) must hold this lock.
+_db_lock = threading.RLock()
+
 
 def get_engine():
     """Get or create the database engine."""
@@ -69,16 +76,36 @@ def get_db():
         db.close()
 
 
+@contextmanager
+def locked_session():
+    """
+    Get a database session while holding the process-wide database lock.
+    Use from worker threads, which would otherwise interleave statements on
+    the shared SQLite connection.
+    
+    Example:
+        with locked_session() as db:
+            # Use db session
+            pass
+    """
+    with _db_lock:
+        db = get_session_factory()()
+        try:
+            yield db
+        finally:
+            db.close()
+
+
 def init_db():
     """Initialize the database (create all tables)."""
-    from database.models import Chat, Message  # Import models
+    from database.models import Chat, Message, SearchCacheEntry, ScrapedPage  # Import models
     engine = get_engine()
     Base.metadata.create_all(bind=engine)
 
 
 def reset_db():
     """Reset the database (drop and recreate all tables). USE WITH CAUTION!"""
-    from database.models import Chat, Message  # Import models
+    from database.models import Chat, Message, SearchCacheEntry, ScrapedPage  # Import models
     engine = get_engine()
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
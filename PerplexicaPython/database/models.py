@@ -3,7 +3,7 @@ Database models using SQLAlchemy ORM.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Float, LargeBinary
 from database.connection import Base
 
 
@@ -59,3 +59,54 @@ class Message(Base):
             "response_blocks": self.response_blocks,
             "status": self.status
         }
+
+
+class SearchCacheEntry(Base):
+    """Persistent tier of the search result cache."""
+    
+    __tablename__ = "search_cache"
+    
+    key = Column(String, primary_key=True)  # SHA256 of the cache key tuple
+    provider = Column(String, nullable=False)
+    search_type = Column(String, nullable=False)
+    query = Column(Text, nullable=False)  # Normalized query
+    results = Column(JSON, nullable=False, default=list)
+    fetched_at = Column(Float, nullable=False, index=True)  # Unix timestamp
+    
+    def to_dict(self):
+        """Convert to dictionary."""
+        return {
+            "key": self.key,
+            "provider": self.provider,
+            "search_type": self.search_type,
+            "query": self.query,
+            "results": self.results,
+            "fetched_at": self.fetched_at
+        }
+
+
+class ScrapedPage(Base):
+    """Cached page markdown from the Jina scraper."""
+    
+    __tablename__ = "scraped_pages"
+    
+    url = Column(String, primary_key=True)
+    domain = Column(String, nullable=False, index=True)
+    content = Column(LargeBinary, nullable=False)  # zlib-compressed markdown
+    size = Column(Integer, nullable=False)  # Compressed bytes, for the byte budget
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+    fetched_at = Column(Float, nullable=False)  # Unix timestamp of the last (re)validation
+    last_access = Column(Float, nullable=False, index=True)  # For LRU eviction
+    
+    def to_dict(self):
+        """Convert to dictionary (without the content blob)."""
+        return {
+            "url": self.url,
+            "domain": self.domain,
+            "size": self.size,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "fetched_at": self.fetched_at,
+            "last_access": self.last_access
+        }
@@ -0,0 +1,173 @@
+"""
+Shared async HTTP transport for the search and scraping clients.
+
+One pooled httpx.AsyncClient (keep-alive, HTTP/2 when available) is reused by
+SerperClient, SearxngClient and JinaScraper, so repeated calls to the same
+host skip the TCP/TLS handshake. Adds per-host concurrency caps, consistent
+timeouts and retries with jittered exponential backoff.
+"""
+
+import asyncio
+import random
+import weakref
+from typing import Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from config.settings import get_settings
+
+try:
+    import h2  # noqa: F401  (required by httpx for HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Responses worth retrying: rate limiting and transient upstream failures
+RETRY_STATUSES = {429, 502, 503, 504}
+
+
+class HttpClient:
+    """
+    Pooled async HTTP client with per-host limits and retries.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_connections_per_host: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        http2: Optional[bool] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Initialize the HTTP client. Unset arguments come from settings.
+
+        Args:
+            max_connections: Total connection pool size.
+            max_connections_per_host: Concurrent requests allowed per host.
+            max_retries: Retries for transport errors and retryable statuses.
+            http2: Negotiate HTTP/2 (needs the `h2` package).
+            transport: Custom httpx transport (e.g. httpx.MockTransport in tests).
+        """
+        settings = get_settings()
+        self.max_connections_per_host = max_connections_per_host or settings.http_max_connections_per_host
+        self.max_retries = settings.http_max_retries if max_retries is None else max_retries
+        self.backoff_base = settings.http_retry_backoff
+        self.backoff_max = settings.http_retry_max_backoff
+
+        use_http2 = settings.http2 if http2 is None else http2
+        self._client = httpx.AsyncClient(
+            http2=use_http2 and HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=max_connections or settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                keepalive_expiry=settings.http_keepalive_expiry
+            ),
+            timeout=httpx.Timeout(settings.search_timeout, connect=settings.http_connect_timeout),
+            follow_redirects=True,
+            transport=transport
+        )
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+
+    def _slots(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        slots = self._host_slots.get(host)
+        if slots is None:
+            slots = self._host_slots[host] = asyncio.Semaphore(self.max_connections_per_host)
+        return slots
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Full-jitter exponential backoff, honouring a numeric Retry-After header."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        retries: Optional[int] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Send a request through the shared pool.
+
+        Args:
+            method: HTTP method.
+            url: Absolute URL.
+            retries: Override of the retry count for this call.
+            **kwargs: Passed to httpx (params, json, headers, timeout, ...).
+
+        Returns:
+            The final response. Retryable statuses are returned (not raised)
+            once retries are exhausted; transport errors are re-raised.
+        """
+        retries = self.max_retries if retries is None else retries
+
+        for attempt in range(retries + 1):
+            try:
+                async with self._slots(url):
+                    response = await self._client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                if attempt == retries:
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                return response
+            await asyncio.sleep(self._backoff(attempt, response))
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+# One client per event loop: httpx connections cannot be shared across loops
+# (the Streamlit UI keeps a single long-lived loop for all queries)
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, HttpClient]" = weakref.WeakKeyDictionary()
+
+
+def get_http_client() -> HttpClient:
+    """Get or create the shared HTTP client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = HttpClient()
+    return client
+
+
+async def drain_background_tasks(timeout: float = 5.0):
+    """
+    Wait for the other tasks of the running loop, e.g. search cache
+    revalidations and hedged requests still finishing into the cache.
+    Tasks still running after `timeout` seconds are cancelled.
+    """
+    current = asyncio.current_task()
+    tasks = [task for task in asyncio.all_tasks() if task is not current]
+    if not tasks:
+        return
+    _, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.wait(pending)
+
+
+async def close_http_client(drain_timeout: float = 5.0):
+    """
+    Close the running loop's shared client (call before the loop shuts down).
+    Background tasks that may still use it are drained first.
+    """
+    await drain_background_tasks(drain_timeout)
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
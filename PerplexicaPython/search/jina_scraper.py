@@ -1,8 +1,10 @@
-import httpx
 import os
 import asyncio
 from typing import Optional, List, Dict, Any
 from dotenv import load_dotenv
+from config.settings import get_settings
+from search.http_client import HttpClient, get_http_client
+from search.page_cache import PageCache, get_page_cache
 
 load_dotenv()
 
@@ -11,12 +13,22 @@ class JinaScraper:
     Scraper using the Jina Reader API (r.jina.ai) to extract markdown from URLs.
     """
     
-    def __init__(self, base_url: str = "https://r.jina.ai"):
+    def __init__(
+        self,
+        base_url: str = "https://r.jina.ai",
+        http_client: Optional[HttpClient] = None,
+        cache: Optional[PageCache] = None
+    ):
         self.base_url = base_url.rstrip("/")
+        # None = the shared pooled client of the running event loop
+        self.http_client = http_client
+        self.cache = cache or (get_page_cache() if get_settings().page_cache_enabled else None)
         
     async def scrape(self, url: str, timeout: int = 10) -> str:
         """
         Scrape a single URL to markdown.
+        Cached pages are returned within their TTL, revalidated with a
+        conditional request after it, and served stale if the scrape fails.
         """
         scrape_url = f"{self.base_url}/{url}"
         headers = {
@@ -24,15 +36,44 @@ class JinaScraper:
             "X-Return-Format": "markdown"
         }
         
+        cached = await asyncio.to_thread(self.cache.get, url) if self.cache else None
+        if cached is not None:
+            if cached.fresh:
+                self.cache.metrics["hits"] += 1
+                return cached.markdown
+            headers.update(cached.conditional_headers())
+        elif self.cache:
+            self.cache.metrics["misses"] += 1
+        
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.get(scrape_url, headers=headers)
-                if response.status_code == 200:
-                    return response.text
-                return ""
+            client = self.http_client or get_http_client()
+            response = await client.get(scrape_url, headers=headers, timeout=timeout)
         except Exception as e:
             # Log error if needed: print(f"Error scraping {url}: {e}")
-            return ""
+            response = None
+        
+        if response is not None and response.status_code == 304 and cached is not None:
+            self.cache.metrics["revalidated"] += 1
+            await asyncio.to_thread(self.cache.touch, url)
+            return cached.markdown
+        
+        if response is not None and response.status_code == 200:
+            if self.cache and response.text:
+                if cached is not None:
+                    self.cache.metrics["misses"] += 1
+                await asyncio.to_thread(
+                    self.cache.put,
+                    url,
+                    response.text,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified")
+                )
+            return response.text
+        
+        if cached is not None:
+            self.cache.metrics["stale_served"] += 1
+            return cached.markdown
+        return ""
 
     async def scrape_batch(self, urls: List[str], max_concurrent: int = 5) -> List[Dict[str, str]]:
         """
@@ -0,0 +1,100 @@
+"""
+Per-provider latency histograms for the search clients.
+
+Each provider's real (uncached) requests are recorded into a log-bucketed
+histogram over a sliding window of recent requests. The search orchestrator
+reads its quantiles to decide how long to wait before hedging.
+"""
+
+import bisect
+import threading
+from collections import deque
+from typing import Any, Dict, Optional
+
+from config.settings import get_settings
+
+# Bucket upper bounds in seconds: 1ms .. ~80s, each 20% wider than the last
+BUCKET_BOUNDS = [0.001 * 1.2 ** k for k in range(63)]
+
+
+class LatencyHistogram:
+    """
+    Latency histogram over the last `window` samples.
+    """
+
+    def __init__(self, window: Optional[int] = None):
+        """
+        Initialize the histogram.
+
+        Args:
+            window: Number of recent samples kept (defaults to settings).
+        """
+        self.window = window or get_settings().search_latency_window
+        self._samples: deque[int] = deque()
+        self._counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float):
+        """Add one request latency."""
+        bucket = bisect.bisect_left(BUCKET_BOUNDS, seconds)
+        with self._lock:
+            if len(self._samples) >= self.window:
+                self._counts[self._samples.popleft()] -= 1
+            self._samples.append(bucket)
+            self._counts[bucket] += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a latency quantile.
+
+        Args:
+            q: Quantile in [0, 1], e.g. 0.95.
+
+        Returns:
+            Upper bound (seconds) of the bucket holding the quantile, or None
+            without samples.
+        """
+        with self._lock:
+            total = len(self._samples)
+            if not total:
+                return None
+            rank = q * total
+            seen = 0
+            for bucket, n in enumerate(self._counts):
+                seen += n
+                if n and seen >= rank:
+                    break
+        return BUCKET_BOUNDS[min(bucket, len(BUCKET_BOUNDS) - 1)]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Sample count and p50/p95/p99 in milliseconds."""
+        def ms(q):
+            value = self.quantile(q)
+            return round(value * 1000, 1) if value is not None else None
+
+        return {"count": self.count, "p50_ms": ms(0.5), "p95_ms": ms(0.95), "p99_ms": ms(0.99)}
+
+
+# Global histograms, one per provider
+_histograms: Dict[str, LatencyHistogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def get_latency_histogram(provider: str) -> LatencyHistogram:
+    """Get or create the latency histogram of a provider."""
+    with _histograms_lock:
+        histogram = _histograms.get(provider)
+        if histogram is None:
+            histogram = _histograms[provider] = LatencyHistogram()
+        return histogram
+
+
+def latency_stats() -> Dict[str, Dict[str, Any]]:
+    """Snapshots of all provider histograms."""
+    with _histograms_lock:
+        histograms = dict(_histograms)
+    return {provider: histogram.snapshot() for provider, histogram in histograms.items()}
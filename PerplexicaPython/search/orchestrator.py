@@ -0,0 +1,206 @@
+"""
+Multi-provider search with hedged requests.
+
+The first provider in settings.search_providers is queried first. If it has not
+answered after its recent latency quantile (p95 by default), the same query is
+sent to the next provider, and so on. The first non-empty answer wins; answers
+arriving within a short merge window after it are merged in, deduplicated by
+URL. Slow requests that lose are cancelled (the search cache still completes
+and stores them in the background).
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from config.settings import get_settings
+from search.latency import get_latency_histogram, latency_stats
+from search.searxng_client import SearxngClient
+from search.serper_client import SerperClient
+
+PROVIDERS = {
+    "serper": SerperClient,
+    "searxng": SearxngClient
+}
+
+
+def url_key(url: Optional[str]) -> str:
+    """Key under which two result URLs count as the same page."""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return f"{host}{parts.path.rstrip('/')}?{parts.query}"
+
+
+def merge_results(result_lists: List[List[Dict[str, Any]]], limit: int) -> List[Dict[str, Any]]:
+    """
+    Merge result lists in order, dropping duplicate URLs.
+
+    Args:
+        result_lists: Lists of normalized results, best first.
+        limit: Maximum number of merged results.
+
+    Returns:
+        Up to `limit` unique results.
+    """
+    merged = []
+    seen = set()
+    for results in result_lists:
+        for res in results:
+            key = url_key(res.get("url"))
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            merged.append(res)
+            if len(merged) >= limit:
+                return merged
+    return merged
+
+
+class SearchOrchestrator:
+    """
+    Queries several search providers with latency-based hedging.
+    Has the same search() signature as SerperClient.
+    """
+
+    def __init__(self, providers: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the orchestrator.
+
+        Args:
+            providers: Provider name -> client, in priority order. Defaults to
+                settings.search_providers; providers that cannot be created
+                (e.g. missing API key) are skipped.
+        """
+        if providers is None:
+            providers = {}
+            for name in get_settings().search_providers:
+                try:
+                    providers[name] = PROVIDERS[name]()
+                except (KeyError, ValueError) as e:
+                    print(f"Search provider {name} unavailable: {e}")
+
+        if not providers:
+            raise ValueError("No search provider available.")
+        self.providers = providers
+
+        self.metrics = {
+            "requests": 0,
+            "hedged": 0,
+            "hedge_wins": 0,
+            "merged": 0,
+            "errors": 0
+        }
+
+    def hedge_delay(self, provider: str) -> float:
+        """
+        Seconds to wait for a provider before hedging: its latency quantile,
+        clamped to the configured bounds, or the default until enough samples.
+        """
+        settings = get_settings()
+        histogram = get_latency_histogram(provider)
+        if histogram.count < settings.search_hedge_min_samples:
+            return settings.search_hedge_default_delay
+        delay = histogram.quantile(settings.search_hedge_quantile)
+        return min(max(delay, settings.search_hedge_min_delay), settings.search_hedge_max_delay)
+
+    async def search(self, query: str, search_type: str = "search", limit: int = 6) -> List[Dict[str, Any]]:
+        """
+        Search with hedged requests across providers.
+
+        Args:
+            query: The search query.
+            search_type: "search" (web), "news", or "images".
+            limit: Number of results to return.
+
+        Returns:
+            Merged, deduplicated results in a normalized format.
+        """
+        settings = get_settings()
+        names = list(self.providers)
+        if not settings.search_hedge_enabled:
+            names = names[:1]
+
+        self.metrics["requests"] += 1
+        loop = asyncio.get_running_loop()
+        tasks: Dict[asyncio.Task, str] = {}
+        pending = set()
+        answers: Dict[str, List[Dict[str, Any]]] = {}
+        winner = None
+        merge_until = None
+        hedge_at = 0.0
+        launched = 0
+
+        try:
+            while True:
+                # Launch the next provider when the hedge delay expired or all others failed
+                if merge_until is None and launched < len(names) and (loop.time() >= hedge_at or not pending):
+                    name = names[launched]
+                    task = asyncio.ensure_future(self.providers[name].search(query, search_type=search_type, limit=limit))
+                    tasks[task] = name
+                    pending.add(task)
+                    if launched:
+                        self.metrics["hedged"] += 1
+                    launched += 1
+                    hedge_at = loop.time() + self.hedge_delay(name)
+                    continue
+
+                if not pending:
+                    break
+                if merge_until is not None:
+                    timeout = merge_until - loop.time()
+                    if timeout <= 0:
+                        break
+                elif launched < len(names):
+                    timeout = max(hedge_at - loop.time(), 0)
+                else:
+                    timeout = None
+
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = tasks[task]
+                    if task.exception() is not None:
+                        self.metrics["errors"] += 1
+                        print(f"Search provider {name} error: {task.exception()}")
+                        continue
+                    if task.result():
+                        answers[name] = task.result()
+                        if winner is None:
+                            winner = name
+                            merge_until = loop.time() + settings.search_hedge_merge_window
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if winner is None:
+            return []
+        if winner != names[0]:
+            self.metrics["hedge_wins"] += 1
+        if len(answers) > 1:
+            self.metrics["merged"] += 1
+
+        ordered = [answers[winner]] + [answers[name] for name in names if name in answers and name != winner]
+        return merge_results(ordered, limit)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hedging counters, current hedge delays and provider latency histograms."""
+        return {
+            **self.metrics,
+            "hedge_delay_s": {name: round(self.hedge_delay(name), 3) for name in self.providers},
+            "latency": latency_stats()
+        }
+
+
+# Global orchestrator instance
+_search_orchestrator: SearchOrchestrator | None = None
+
+
+def get_search_orchestrator() -> SearchOrchestrator:
+    """Get or create the global search orchestrator."""
+    global _search_orchestrator
+    if _search_orchestrator is None:
+        _search_orchestrator = SearchOrchestrator()
+    return _search_orchestrator
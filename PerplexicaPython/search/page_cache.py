@@ -0,0 +1,245 @@
+"""
+Persistent cache of scraped page markdown, keyed by URL.
+
+Pages are stored zlib-compressed in the `scraped_pages` table together with
+the ETag / Last-Modified validators of the response. Within the page's TTL
+(per-domain overrides in settings) the cached copy is used directly; after
+that the scraper revalidates with a conditional request. The total size of
+compressed pages is kept under a byte budget by evicting the least recently
+used pages.
+"""
+
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+from sqlalchemy import func, select
+
+from config.settings import get_settings
+
+# Pending recency updates written back in one statement batch
+ACCESS_FLUSH_BATCH = 64
+
+
+@dataclass
+class CachedPage:
+    """A cached page as seen by the scraper."""
+    url: str
+    markdown: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+    ttl: int
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() - self.fetched_at <= self.ttl
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Validators for a conditional revalidation request."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def url_domain(url: str) -> str:
+    host = urlsplit(url).hostname or ""
+    return host[4:] if host.startswith("www.") else host
+
+
+class PageCache:
+    """
+    Database-backed page cache with per-domain TTLs and a byte budget.
+    Methods are synchronous; async callers run them via asyncio.to_thread.
+    All database access holds the process-wide database lock.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Budget for compressed content (defaults to settings).
+        """
+        settings = get_settings()
+        self.max_bytes = settings.page_cache_max_bytes if max_bytes is None else max_bytes
+        self._total_bytes: Optional[int] = None
+        # url -> last access time not yet written to the database
+        self._accessed: Dict[str, float] = {}
+
+        self.metrics = {
+            "hits": 0,
+            "revalidated": 0,
+            "misses": 0,
+            "stale_served": 0,
+            "stores": 0,
+            "evictions": 0,
+            "errors": 0
+        }
+
+    def _ensure_table(self, db):
+        from database.connection import get_engine
+        from database.models import ScrapedPage
+
+        if self._total_bytes is None:
+            ScrapedPage.__table__.create(bind=get_engine(), checkfirst=True)
+            self._total_bytes = db.scalar(select(func.coalesce(func.sum(ScrapedPage.size), 0)))
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """
+        Look up a page (fresh or not) and mark it as recently used.
+        Recency is kept in memory and written back in batches.
+
+        Args:
+            url: Page URL.
+
+        Returns:
+            The cached page, or None.
+        """
+        from database.connection import locked_session
+        from database.models import ScrapedPage
+
+        try:
+            with locked_session() as db:
+                self._ensure_table(db)
+                row = db.get(ScrapedPage, url)
+                if row is None:
+                    return None
+                page = CachedPage(
+                    url=url,
+                    markdown=zlib.decompress(row.content).decode("utf-8"),
+                    etag=row.etag,
+                    last_modified=row.last_modified,
+                    fetched_at=row.fetched_at,
+                    ttl=get_settings().get_page_cache_ttl(row.domain)
+                )
+                self._accessed[url] = time.time()
+                if len(self._accessed) >= ACCESS_FLUSH_BATCH:
+                    self._flush_access(db)
+                    db.commit()
+                return page
+        except Exception as e:
+            self.metrics["errors"] += 1
+            print(f"Page cache read error: {e}")
+            return None
+
+    def put(self, url: str, markdown: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """
+        Store (or replace) a page and evict old pages beyond the byte budget.
+
+        Args:
+            url: Page URL.
+            markdown: Page content.
+            etag: ETag response header, if any.
+            last_modified: Last-Modified response header, if any.
+        """
+        from database.connection import locked_session
+        from database.models import ScrapedPage
+
+        content = zlib.compress(markdown.encode("utf-8"), 6)
+        now = time.time()
+        try:
+            with locked_session() as db:
+                self._ensure_table(db)
+                old = db.get(ScrapedPage, url)
+                if old is not None:
+                    self._total_bytes -= old.size
+                db.merge(ScrapedPage(
+                    url=url,
+                    domain=url_domain(url),
+                    content=content,
+                    size=len(content),
+                    etag=etag,
+                    last_modified=last_modified,
+                    fetched_at=now,
+                    last_access=now
+                ))
+                self._accessed.pop(url, None)
+                self._total_bytes += len(content)
+                # Eviction order needs the recency of recent hits
+                self._flush_access(db)
+                self._evict(db)
+                db.commit()
+                self.metrics["stores"] += 1
+        except Exception as e:
+            self.metrics["errors"] += 1
+            self._total_bytes = None  # Recount on next use
+            print(f"Page cache write error: {e}")
+
+    def touch(self, url: str):
+        """Mark a page as revalidated (304 Not Modified): restarts its TTL."""
+        from database.connection import locked_session
+        from database.models import ScrapedPage
+
+        try:
+            with locked_session() as db:
+                self._ensure_table(db)
+                row = db.get(ScrapedPage, url)
+                if row is not None:
+                    row.fetched_at = row.last_access = time.time()
+                    self._accessed.pop(url, None)
+                    db.commit()
+        except Exception as e:
+            self.metrics["errors"] += 1
+            print(f"Page cache write error: {e}")
+
+    def _flush_access(self, db):
+        """Write pending last_access times (caller holds the database lock)."""
+        from database.models import ScrapedPage
+
+        if not self._accessed:
+            return
+        db.bulk_update_mappings(ScrapedPage, [
+            {"url": url, "last_access": accessed} for url, accessed in self._accessed.items()
+        ])
+        self._accessed.clear()
+
+    def _evict(self, db):
+        """Delete least recently used pages until the budget is met (caller holds the database lock)."""
+        from database.models import ScrapedPage
+
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        db.flush()
+        rows = db.execute(
+            select(ScrapedPage.url, ScrapedPage.size).order_by(ScrapedPage.last_access)
+        )
+        victims = []
+        for url, size in rows:
+            if self._total_bytes <= self.max_bytes:
+                break
+            victims.append(url)
+            self._total_bytes -= size
+
+        if victims:
+            db.query(ScrapedPage).filter(ScrapedPage.url.in_(victims)).delete(synchronize_session=False)
+            self.metrics["evictions"] += len(victims)
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters, stored bytes and hit rate (fresh + revalidated hits over lookups)."""
+        hits = self.metrics["hits"] + self.metrics["revalidated"]
+        total = hits + self.metrics["misses"]
+        return {
+            **self.metrics,
+            "bytes": self._total_bytes or 0,
+            "max_bytes": self.max_bytes,
+            "hit_rate": round(hits / total, 4) if total else 0.0
+        }
+
+
+# Global cache instance
+_page_cache: PageCache | None = None
+
+
+def get_page_cache() -> PageCache:
+    """Get or create the global page cache."""
+    global _page_cache
+    if _page_cache is None:
+        _page_cache = PageCache()
+    return _page_cache
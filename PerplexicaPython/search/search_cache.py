@@ -0,0 +1,267 @@
+"""
+Two-tier cache for search provider results.
+
+Tier 1 is an in-process LRU; tier 2 (optional) is the `search_cache` table in
+the application database, so results survive restarts. Entries are fresh for
+a per-search-type TTL; after that they are still served for a stale window
+while a background task refreshes them (stale-while-revalidate).
+"""
+
+import asyncio
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from config.settings import get_settings
+from core.utils import hash_string
+
+CacheKey = Tuple[str, str, str, int, str]
+Fetch = Callable[[], Awaitable[List[Dict[str, Any]]]]
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace so trivial variants share an entry."""
+    return " ".join(query.lower().split())
+
+
+class SearchCache:
+    """
+    Search result cache keyed on (provider, search_type, normalized query, limit, language).
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, persistent: Optional[bool] = None):
+        """
+        Initialize the cache. Unset arguments come from settings.
+
+        Args:
+            max_entries: Size of the in-process LRU tier.
+            persistent: Also read/write the database tier.
+        """
+        settings = get_settings()
+        self.max_entries = max_entries or settings.search_cache_max_entries
+        self.persistent = settings.search_cache_persistent if persistent is None else persistent
+
+        self._entries: "OrderedDict[CacheKey, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[CacheKey, asyncio.Task] = {}
+        self._table_ready = False
+
+        self.metrics = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "persistent_hits": 0,
+            "revalidations": 0,
+            "errors": 0
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def get_or_fetch(
+        self,
+        provider: str,
+        search_type: str,
+        query: str,
+        limit: int,
+        fetch: Fetch,
+        language: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Return cached results, or fetch, store and return fresh ones.
+
+        Args:
+            provider: Provider name, e.g. "serper" or "searxng".
+            search_type: "search", "news" or "images".
+            query: Raw user query.
+            limit: Requested result count.
+            fetch: Coroutine factory performing the real provider call.
+            language: Search language (defaults to settings.search_language).
+
+        Returns:
+            A copy of the results (callers may mutate them).
+        """
+        settings = get_settings()
+        key = (provider, search_type, normalize_query(query), limit, language or settings.search_language)
+        ttl = settings.get_search_cache_ttl(search_type)
+        stale_window = ttl * settings.search_cache_stale_factor
+
+        entry = await self._lookup(key)
+        if entry is not None:
+            fetched_at, results = entry
+            age = time.time() - fetched_at
+            if age <= ttl:
+                self.metrics["hits"] += 1
+                return copy.deepcopy(results)
+            if age <= ttl + stale_window:
+                self.metrics["stale_hits"] += 1
+                self._revalidate(key, fetch)
+                return copy.deepcopy(results)
+
+        self.metrics["misses"] += 1
+        return copy.deepcopy(await self._fetch(key, fetch))
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters and hit rate (fresh + stale hits over all lookups)."""
+        hits = self.metrics["hits"] + self.metrics["stale_hits"]
+        total = hits + self.metrics["misses"]
+        return {
+            **self.metrics,
+            "entries": len(self._entries),
+            "hit_rate": round(hits / total, 4) if total else 0.0
+        }
+
+    def clear(self):
+        """Drop the in-process tier."""
+        with self._lock:
+            self._entries.clear()
+
+    # ------------------------------------------------------------------
+    # Fetching
+    # ------------------------------------------------------------------
+
+    async def _fetch(self, key: CacheKey, fetch: Fetch) -> List[Dict[str, Any]]:
+        """Single-flight fetch: concurrent misses for one key share a provider call."""
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._fetch_and_store(key, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._inflight.pop(key, None) if self._inflight.get(key) is t else None)
+        return await asyncio.shield(task)
+
+    async def _fetch_and_store(self, key: CacheKey, fetch: Fetch) -> List[Dict[str, Any]]:
+        results = await fetch()
+        # Empty lists are usually swallowed provider errors: never cache them
+        if results:
+            await self._store(key, results)
+        return results
+
+    def _revalidate(self, key: CacheKey, fetch: Fetch):
+        """Refresh a stale entry in the background."""
+        if key in self._inflight:
+            return
+        self.metrics["revalidations"] += 1
+        task = asyncio.ensure_future(self._fetch(key, fetch))
+        task.add_done_callback(self._log_revalidation_error)
+
+    def _log_revalidation_error(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            self.metrics["errors"] += 1
+            print(f"Search cache revalidation error: {task.exception()}")
+
+    # ------------------------------------------------------------------
+    # Tiers
+    # ------------------------------------------------------------------
+
+    async def _lookup(self, key: CacheKey) -> Optional[Tuple[float, List[Dict[str, Any]]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        if not self.persistent:
+            return None
+
+        entry = await asyncio.to_thread(self._db_get, key)
+        if entry is not None:
+            self.metrics["persistent_hits"] += 1
+            self._remember(key, entry)
+        return entry
+
+    async def _store(self, key: CacheKey, results: List[Dict[str, Any]]):
+        entry = (time.time(), copy.deepcopy(results))
+        self._remember(key, entry)
+        if self.persistent:
+            await asyncio.to_thread(self._db_put, key, entry)
+
+    def _remember(self, key: CacheKey, entry: Tuple[float, List[Dict[str, Any]]]):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _db_key(key: CacheKey) -> str:
+        return hash_string(json.dumps(key))
+
+    def _ensure_table(self):
+        from database.connection import get_engine
+        from database.models import SearchCacheEntry
+
+        if not self._table_ready:
+            SearchCacheEntry.__table__.create(bind=get_engine(), checkfirst=True)
+            self._table_ready = True
+
+    def _db_get(self, key: CacheKey) -> Optional[Tuple[float, List[Dict[str, Any]]]]:
+        from database.connection import locked_session
+        from database.models import SearchCacheEntry
+
+        try:
+            with locked_session() as db:
+                self._ensure_table()
+                row = db.get(SearchCacheEntry, self._db_key(key))
+                return (row.fetched_at, row.results) if row is not None else None
+        except Exception as e:
+            self.metrics["errors"] += 1
+            print(f"Search cache read error: {e}")
+            return None
+
+    def _db_put(self, key: CacheKey, entry: Tuple[float, List[Dict[str, Any]]]):
+        from database.connection import locked_session
+        from database.models import SearchCacheEntry
+
+        provider, search_type, query, _, _ = key
+        try:
+            with locked_session() as db:
+                self._ensure_table()
+                db.merge(SearchCacheEntry(
+                    key=self._db_key(key),
+                    provider=provider,
+                    search_type=search_type,
+                    query=query,
+                    results=entry[1],
+                    fetched_at=entry[0]
+                ))
+                self._db_prune(db)
+                db.commit()
+        except Exception as e:
+            self.metrics["errors"] += 1
+            print(f"Search cache write error: {e}")
+
+    def _db_prune(self, db):
+        """Delete rows past their stale window, then the oldest rows beyond the row cap."""
+        from database.models import SearchCacheEntry
+
+        settings = get_settings()
+        max_ttl = max(settings.search_cache_ttl_web, settings.search_cache_ttl_news, settings.search_cache_ttl_images)
+        max_age = max_ttl * (1 + settings.search_cache_stale_factor)
+
+        db.flush()
+        db.query(SearchCacheEntry).filter(
+            SearchCacheEntry.fetched_at < time.time() - max_age
+        ).delete(synchronize_session=False)
+
+        excess = db.query(SearchCacheEntry).count() - settings.search_cache_max_rows
+        if excess > 0:
+            oldest = db.query(SearchCacheEntry.key).order_by(SearchCacheEntry.fetched_at).limit(excess)
+            db.query(SearchCacheEntry).filter(
+                SearchCacheEntry.key.in_(oldest.scalar_subquery())
+            ).delete(synchronize_session=False)
+
+
+# Global cache instance
+_search_cache: SearchCache | None = None
+
+
+def get_search_cache() -> SearchCache:
+    """Get or create the global search cache."""
+    global _search_cache
+    if _search_cache is None:
+        _search_cache = SearchCache()
+    return _search_cache
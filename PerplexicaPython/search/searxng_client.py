@@ -1,53 +1,109 @@
-import httpx
+import time
 from typing import List, Dict, Any, Optional
 from config.settings import get_settings
+from search.http_client import HttpClient, get_http_client
+from search.latency import get_latency_histogram
+from search.search_cache import SearchCache, get_search_cache
+
+# SearXNG category for each search type
+CATEGORIES = {
+    "search": "general",
+    "news": "news",
+    "images": "images"
+}
 
 class SearxngClient:
     """
     Client for SearXNG Search API.
+    Provides web, news, and image search results.
     """
     
-    def __init__(self, url: Optional[str] = None):
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        http_client: Optional[HttpClient] = None,
+        cache: Optional[SearchCache] = None
+    ):
         settings = get_settings()
         self.url = url or settings.searxng_url
+        # None = the shared pooled client of the running event loop
+        self.http_client = http_client
+        self.cache = cache or (get_search_cache() if settings.search_cache_enabled else None)
         
-    async def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+    async def search(self, query: str, limit: int = 5, search_type: str = "search") -> List[Dict[str, Any]]:
         """
         Perform a search using SearXNG.
         
         Args:
             query: The search query.
             limit: Number of results to return.
+            search_type: "search" (web), "news", or "images".
             
         Returns:
             List of search results in a normalized format.
         """
+        if self.cache is None:
+            return await self._search(query, limit, search_type)
+        return await self.cache.get_or_fetch(
+            "searxng", search_type, query, limit,
+            lambda: self._search(query, limit, search_type)
+        )
+            
+    async def _search(self, query: str, limit: int, search_type: str = "search") -> List[Dict[str, Any]]:
+        """Uncached SearXNG request (errors are logged and yield no results)."""
         params = {
             'q': query,
             'format': 'json',
-            'engines': 'google,bing,duckduckgo',
         }
+        if search_type == "search":
+            params['engines'] = 'google,bing,duckduckgo'
+        else:
+            params['categories'] = CATEGORIES[search_type]
         
+        start = time.perf_counter()
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(self.url, params=params, timeout=10.0)
-                response.raise_for_status()
-                data = response.json()
-                results = data.get('results', [])
-                
-                return self._normalize_results(results[:limit])
+            client = self.http_client or get_http_client()
+            response = await client.get(self.url, params=params, timeout=10.0)
+            response.raise_for_status()
+            data = response.json()
+            results = data.get('results', [])
+            
+            return self._normalize_results(results[:limit], search_type)
         except Exception as e:
             print(f"SearXNG search error: {e}")
             return []
+        finally:
+            get_latency_histogram("searxng").record(time.perf_counter() - start)
             
-    def _normalize_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _normalize_results(self, results: List[Dict[str, Any]], search_type: str = "search") -> List[Dict[str, Any]]:
         """Normalize SearXNG results to match our internal schema."""
         normalized = []
         for r in results:
-            normalized.append({
-                "url": r.get("url"),
-                "title": r.get("title"),
-                "content": r.get("content") or r.get("snippet", ""),
-                "favicon": f"https://www.google.com/s2/favicons?domain={r.get('url')}&sz=32"
-            })
+            if search_type == "images":
+                normalized.append({
+                    "url": r.get("url"),
+                    "title": r.get("title"),
+                    "imageUrl": r.get("img_src"),
+                    "source": r.get("source") or r.get("engine"),
+                    "width": None,
+                    "height": None
+                })
+            elif search_type == "news":
+                normalized.append({
+                    "url": r.get("url"),
+                    "title": r.get("title"),
+                    "snippet": r.get("content", ""),
+                    "source": r.get("engine"),
+                    "date": r.get("publishedDate"),
+                    "imageUrl": r.get("thumbnail") or r.get("img_src")
+                })
+            else:
+                content = r.get("content") or r.get("snippet", "")
+                normalized.append({
+                    "url": r.get("url"),
+                    "title": r.get("title"),
+                    "content": content,
+                    "snippet": content,
+                    "favicon": f"https://www.google.com/s2/favicons?domain={r.get('url')}&sz=32"
+                })
         return normalized
@@ -1,7 +1,11 @@
-import httpx
 import os
+import time
 from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
+from config.settings import get_settings
+from search.http_client import HttpClient, get_http_client
+from search.latency import get_latency_histogram
+from search.search_cache import SearchCache, get_search_cache
 
 load_dotenv()
 
@@ -11,9 +15,17 @@ class SerperClient:
     Provides web, news, and image search results.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        http_client: Optional[HttpClient] = None,
+        cache: Optional[SearchCache] = None
+    ):
         self.api_key = api_key or os.getenv("SERPER_API_KEY")
         self.base_url = "https://google.serper.dev"
+        # None = the shared pooled client of the running event loop
+        self.http_client = http_client
+        self.cache = cache or (get_search_cache() if get_settings().search_cache_enabled else None)
         
         if not self.api_key:
             raise ValueError("SERPER_API_KEY not found in environment or provided.")
@@ -30,6 +42,15 @@ class SerperClient:
         Returns:
             List of search results in a normalized format.
         """
+        if self.cache is None:
+            return await self._search(query, search_type, limit)
+        return await self.cache.get_or_fetch(
+            "serper", search_type, query, limit,
+            lambda: self._search(query, search_type, limit)
+        )
+            
+    async def _search(self, query: str, search_type: str, limit: int) -> List[Dict[str, Any]]:
+        """Uncached Serper.dev request."""
         url = f"{self.base_url}/{search_type}"
         payload = {
             "q": query,
@@ -40,12 +61,16 @@ class SerperClient:
             'Content-Type': 'application/json'
         }
         
-        async with httpx.AsyncClient() as client:
+        client = self.http_client or get_http_client()
+        start = time.perf_counter()
+        try:
             response = await client.post(url, json=payload, headers=headers)
             response.raise_for_status()
             data = response.json()
-            
-            return self._normalize_results(data, search_type)
+        finally:
+            get_latency_histogram("serper").record(time.perf_counter() - start)
+        
+        return self._normalize_results(data, search_type)
             
     def _normalize_results(self, data: Dict[str, Any], search_type: str) -> List[Dict[str, Any]]:
         """Normalize Serper.dev results to match our internal schema."""
@@ -58,6 +83,7 @@ class SerperClient:
                     "url": item.get("link"),
                     "title": item.get("title"),
                     "snippet": item.get("snippet"),
+                    "content": item.get("snippet"),
                     "siteName": item.get("source"),
                     "favicon": f"https://www.google.com/s2/favicons?domain={item.get('link')}&sz=32"
                 })
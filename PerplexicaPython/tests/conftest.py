@@ -0,0 +1,28 @@
+"""
+Shared test setup: settings come from the environment and every test gets a
+fresh in-memory SQLite database.
+"""
+
+import os
+
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ["DATABASE_URL"] = "sqlite://"
+
+import pytest
+
+from config.settings import get_settings, reload_settings
+from database.connection import reset_db
+
+reload_settings()
+
+
+@pytest.fixture(autouse=True)
+def fresh_db():
+    reset_db()
+    yield
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    """The global settings (override fields with monkeypatch.setattr)."""
+    return get_settings()
@@ -0,0 +1,139 @@
+import asyncio
+import time
+
+import pytest
+
+from search.latency import BUCKET_BOUNDS, LatencyHistogram
+from search.orchestrator import SearchOrchestrator, merge_results, url_key
+
+
+class FakeProvider:
+    """Answers after `delay` seconds with `results`, or raises `error`."""
+
+    def __init__(self, results=None, delay=0.0, error=None):
+        self.results = results or []
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = False
+
+    async def search(self, query, search_type="search", limit=6):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return list(self.results)
+
+
+def result(url):
+    return {"title": url, "url": url, "snippet": "", "content": ""}
+
+
+@pytest.fixture
+def hedging(settings, monkeypatch):
+    monkeypatch.setattr(settings, "search_hedge_enabled", True)
+    monkeypatch.setattr(settings, "search_hedge_default_delay", 0.05)
+    monkeypatch.setattr(settings, "search_hedge_merge_window", 0.01)
+    return settings
+
+
+def run_search(orchestrator):
+    async def go():
+        t0 = time.perf_counter()
+        results = await orchestrator.search("annual leave policy")
+        # Let cancelled losers observe their cancellation
+        await asyncio.sleep(0)
+        return results, time.perf_counter() - t0
+    return asyncio.run(go())
+
+
+def test_slow_primary_is_hedged(hedging):
+    primary = FakeProvider([result("https://slow.example/a")], delay=2.0)
+    secondary = FakeProvider([result("https://fast.example/b")])
+    orchestrator = SearchOrchestrator({"slow-primary": primary, "fast-secondary": secondary})
+
+    results, elapsed = run_search(orchestrator)
+
+    assert [r["url"] for r in results] == ["https://fast.example/b"]
+    assert elapsed < 1.0
+    assert primary.cancelled
+    assert orchestrator.metrics["hedged"] == 1
+    assert orchestrator.metrics["hedge_wins"] == 1
+
+
+def test_failing_primary_falls_through_at_once(hedging, monkeypatch):
+    # Far longer than the test may take: the fallback must not wait for it
+    monkeypatch.setattr(hedging, "search_hedge_default_delay", 5.0)
+    primary = FakeProvider(error=RuntimeError("quota exceeded"))
+    secondary = FakeProvider([result("https://backup.example/a")])
+    orchestrator = SearchOrchestrator({"failing-primary": primary, "backup": secondary})
+
+    results, elapsed = run_search(orchestrator)
+
+    assert [r["url"] for r in results] == ["https://backup.example/a"]
+    assert elapsed < 1.0
+    assert orchestrator.metrics["errors"] == 1
+
+
+def test_all_providers_empty_returns_empty_list(hedging):
+    orchestrator = SearchOrchestrator({"empty-a": FakeProvider(delay=0.01), "empty-b": FakeProvider()})
+
+    results, _ = run_search(orchestrator)
+
+    assert results == []
+
+
+def test_answers_within_the_merge_window_are_merged(hedging, monkeypatch):
+    monkeypatch.setattr(hedging, "search_hedge_merge_window", 0.5)
+    primary = FakeProvider([result("https://a.example/1"), result("https://www.shared.example/page/")], delay=0.1)
+    secondary = FakeProvider([result("https://shared.example/page"), result("https://b.example/2")], delay=0.1)
+    orchestrator = SearchOrchestrator({"merge-primary": primary, "merge-secondary": secondary})
+
+    results, _ = run_search(orchestrator)
+
+    assert [r["url"] for r in results] == [
+        "https://a.example/1", "https://www.shared.example/page/", "https://b.example/2"
+    ]
+    assert orchestrator.metrics["merged"] == 1
+
+
+def test_url_key_ignores_www_and_trailing_slash():
+    assert url_key("https://www.Example.com/docs/") == url_key("http://example.com/docs")
+    assert url_key("https://example.com/docs?page=2") != url_key("https://example.com/docs?page=3")
+
+    merged = merge_results([
+        [result("https://www.example.com/docs/")],
+        [result("https://example.com/docs"), result("https://example.com/other")]
+    ], limit=5)
+    assert [r["url"] for r in merged] == ["https://www.example.com/docs/", "https://example.com/other"]
+
+
+def test_quantile_bucket_edges():
+    histogram = LatencyHistogram(window=10)
+    assert histogram.quantile(0.5) is None
+
+    # A latency equal to a bound belongs to that bucket, anything above to the next
+    histogram.record(BUCKET_BOUNDS[10])
+    assert histogram.quantile(0.5) == BUCKET_BOUNDS[10]
+    histogram.record(BUCKET_BOUNDS[10] * 1.001)
+    assert histogram.quantile(1.0) == BUCKET_BOUNDS[11]
+    assert histogram.quantile(0.0) == BUCKET_BOUNDS[10]
+
+    # Below the first and above the last bound
+    histogram.record(0.0)
+    assert histogram.quantile(0.0) == BUCKET_BOUNDS[0]
+    histogram.record(10_000.0)
+    assert histogram.quantile(1.0) == BUCKET_BOUNDS[-1]
+
+
+def test_histogram_keeps_a_sliding_window():
+    histogram = LatencyHistogram(window=3)
+    for seconds in (5.0, 5.0, 5.0, 0.01, 0.01, 0.01):
+        histogram.record(seconds)
+
+    assert histogram.count == 3
+    assert histogram.quantile(1.0) < 0.02
@@ -0,0 +1,104 @@
+import asyncio
+import os
+
+import httpx
+import pytest
+
+from search.http_client import HttpClient
+from search.jina_scraper import JinaScraper
+from search.page_cache import PageCache
+
+URL = "https://policies.example.com/leave"
+
+
+class Upstream:
+    """Jina Reader stand-in: serves one page with an ETag, honours If-None-Match, can go down."""
+
+    def __init__(self, markdown="# Leave policy", etag='"v1"'):
+        self.markdown = markdown
+        self.etag = etag
+        self.down = False
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.down:
+            raise httpx.ConnectError("connection refused", request=request)
+        if request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304)
+        return httpx.Response(200, text=self.markdown, headers={"ETag": self.etag})
+
+
+@pytest.fixture
+def upstream():
+    return Upstream()
+
+
+@pytest.fixture
+def scraper(upstream):
+    client = HttpClient(max_retries=0, transport=httpx.MockTransport(upstream))
+    return JinaScraper(http_client=client, cache=PageCache())
+
+
+def test_fresh_page_is_served_from_cache(scraper, upstream):
+    assert asyncio.run(scraper.scrape(URL)) == "# Leave policy"
+    assert asyncio.run(scraper.scrape(URL)) == "# Leave policy"
+
+    assert len(upstream.requests) == 1
+    assert scraper.cache.metrics["hits"] == 1
+
+
+def test_expired_page_is_revalidated_with_304(scraper, upstream, settings, monkeypatch):
+    asyncio.run(scraper.scrape(URL))
+    monkeypatch.setattr(settings, "page_cache_ttl", -1)
+
+    assert asyncio.run(scraper.scrape(URL)) == "# Leave policy"
+
+    assert upstream.requests[-1].headers["If-None-Match"] == '"v1"'
+    assert scraper.cache.metrics["revalidated"] == 1
+    # The 304 restarted the TTL
+    monkeypatch.setattr(settings, "page_cache_ttl", 3600)
+    assert scraper.cache.get(URL).fresh
+
+
+def test_changed_page_replaces_the_cached_copy(scraper, upstream, settings, monkeypatch):
+    asyncio.run(scraper.scrape(URL))
+    monkeypatch.setattr(settings, "page_cache_ttl", -1)
+    upstream.markdown, upstream.etag = "# Leave policy v2", '"v2"'
+
+    assert asyncio.run(scraper.scrape(URL)) == "# Leave policy v2"
+    assert scraper.cache.get(URL).etag == '"v2"'
+
+
+def test_stale_page_is_served_when_the_scrape_fails(scraper, upstream, settings, monkeypatch):
+    asyncio.run(scraper.scrape(URL))
+    monkeypatch.setattr(settings, "page_cache_ttl", -1)
+    upstream.down = True
+
+    assert asyncio.run(scraper.scrape(URL)) == "# Leave policy"
+    assert scraper.cache.metrics["stale_served"] == 1
+
+
+def test_failed_scrape_without_cached_copy_is_empty(scraper, upstream):
+    upstream.down = True
+    assert asyncio.run(scraper.scrape(URL)) == ""
+
+
+def test_least_recently_used_pages_are_evicted_over_the_byte_budget():
+    # Incompressible content, so every page takes about the same budget
+    pages = {f"https://example.com/{name}": os.urandom(3000).hex() for name in "abc"}
+    cache = PageCache(max_bytes=10**9)
+    cache.put("https://example.com/a", pages["https://example.com/a"])
+    page_size = cache.stats()["bytes"]
+    cache.max_bytes = int(page_size * 2.5)
+
+    cache.put("https://example.com/b", pages["https://example.com/b"])
+    # Reading a makes b the least recently used page
+    assert cache.get("https://example.com/a") is not None
+    cache.put("https://example.com/c", pages["https://example.com/c"])
+
+    assert cache.get("https://example.com/b") is None
+    assert cache.get("https://example.com/a").markdown == pages["https://example.com/a"]
+    assert cache.get("https://example.com/c") is not None
+    assert cache.metrics["evictions"] == 1
+    assert cache.stats()["bytes"] <= cache.max_bytes
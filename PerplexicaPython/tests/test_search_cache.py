@@ -0,0 +1,113 @@
+import asyncio
+import time
+
+import pytest
+
+from search.search_cache import SearchCache
+
+
+class Fetcher:
+    """Counts provider calls; each call returns the next result list."""
+
+    def __init__(self, *answers, delay=0.0):
+        self.answers = list(answers)
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.answers[min(self.calls, len(self.answers)) - 1]
+
+
+def results(*urls):
+    return [{"title": url, "url": url} for url in urls]
+
+
+@pytest.fixture
+def cache():
+    return SearchCache(max_entries=100, persistent=False)
+
+
+def test_concurrent_misses_share_one_fetch(cache):
+    fetch = Fetcher(results("https://a.example"), delay=0.05)
+
+    async def go():
+        return await asyncio.gather(*(
+            cache.get_or_fetch("serper", "search", "Annual  Leave", 6, fetch) for _ in range(5)
+        ))
+
+    answers = asyncio.run(go())
+
+    assert fetch.calls == 1
+    assert all(a == results("https://a.example") for a in answers)
+
+
+def test_stale_entry_is_served_and_revalidated(cache, settings):
+    fetch = Fetcher(results("https://old.example"), results("https://new.example"))
+    ttl = settings.get_search_cache_ttl("search")
+
+    async def go():
+        await cache.get_or_fetch("serper", "search", "leave", 6, fetch)
+        # Age the entry past its TTL but within the stale window
+        key, (_, entry) = next(iter(cache._entries.items()))
+        cache._entries[key] = (time.time() - ttl - 1, entry)
+
+        stale = await cache.get_or_fetch("serper", "search", "leave", 6, fetch)
+        # Served without waiting for the provider
+        assert fetch.calls == 1
+        # Background refresh: started after the stale answer was returned
+        while fetch.calls < 2 or cache._inflight:
+            await asyncio.sleep(0.01)
+        fresh = await cache.get_or_fetch("serper", "search", "leave", 6, fetch)
+        return stale, fresh
+
+    stale, fresh = asyncio.run(go())
+
+    assert stale == results("https://old.example")
+    assert fresh == results("https://new.example")
+    assert fetch.calls == 2
+    assert cache.metrics["stale_hits"] == 1
+    assert cache.metrics["revalidations"] == 1
+
+
+def test_empty_results_are_never_cached(cache):
+    fetch = Fetcher([], results("https://a.example"))
+
+    async def go():
+        first = await cache.get_or_fetch("searxng", "news", "leave", 6, fetch)
+        second = await cache.get_or_fetch("searxng", "news", "leave", 6, fetch)
+        return first, second
+
+    first, second = asyncio.run(go())
+
+    assert first == []
+    assert second == results("https://a.example")
+    assert fetch.calls == 2
+
+
+def test_persistent_tier_survives_clear():
+    cache = SearchCache(max_entries=100, persistent=True)
+    fetch = Fetcher(results("https://a.example"))
+
+    async def go():
+        await cache.get_or_fetch("serper", "search", "leave", 6, fetch)
+        cache.clear()
+        return await cache.get_or_fetch("serper", "search", "leave", 6, fetch)
+
+    answer = asyncio.run(go())
+
+    assert answer == results("https://a.example")
+    assert fetch.calls == 1
+    assert cache.metrics["persistent_hits"] == 1
+
+
+def test_results_are_copies(cache):
+    fetch = Fetcher(results("https://a.example"))
+
+    async def go():
+        first = await cache.get_or_fetch("serper", "search", "leave", 6, fetch)
+        first[0]["title"] = "mutated"
+        return await cache.get_or_fetch("serper", "search", "leave", 6, fetch)
+
+    assert asyncio.run(go())[0]["title"] == "https://a.example"
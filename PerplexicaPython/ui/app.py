@@ -1,7 +1,9 @@
 import streamlit as st
 import asyncio
+import atexit
 import sys
 import os
+import threading
 from datetime import datetime
 import re
 
@@ -9,7 +11,8 @@ import re
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 
-from search.searxng_client import SearxngClient
+from search.orchestrator import SearchOrchestrator, get_search_orchestrator
+from search.http_client import close_http_client
 from llm.groq_engine import GroqEngine
 from config.settings import get_settings
 from ui.components.styles import apply_styles
@@ -25,6 +28,29 @@ st.set_page_config(
 # Apply global styles
 apply_styles()
 
+@st.cache_resource
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    One event loop for the whole UI process, running in a background thread.
+    Script reruns share it, so the pooled HTTP client keeps its connections and
+    background tasks (stale-while-revalidate refreshes, hedged requests still
+    finishing into the cache) outlive the query that started them.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="ui-event-loop", daemon=True).start()
+
+    def shutdown():
+        # Drains background tasks, then closes the HTTP client
+        asyncio.run_coroutine_threadsafe(close_http_client(), loop).result(timeout=10)
+        loop.call_soon_threadsafe(loop.stop)
+
+    atexit.register(shutdown)
+    return loop
+
+def run_search(search_client: SearchOrchestrator, query: str):
+    """Runs a search on the UI event loop and waits for the results."""
+    return asyncio.run_coroutine_threadsafe(search_client.search(query), get_event_loop()).result()
+
 def initialize_session_state():
     if "messages" not in st.session_state:
         st.session_state.messages = []
@@ -117,10 +143,10 @@ if st.session_state.messages and st.session_state.messages[-1]["role"] == "user"
     
     with st.chat_message("assistant"):
         with st.status("🔍 Searching...", expanded=True) as status:
-            search_client = SearxngClient()
+            search_client = get_search_orchestrator()
             # Note: We need news and images too if possible.
             # For now, let's treat the returned results.
-            sources = asyncio.run(search_client.search(user_query))
+            sources = run_search(search_client, user_query)
             status.update(label="Analyzing sources...", state="running")
             
             # Context for LLM